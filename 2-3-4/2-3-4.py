@@ -8,16 +8,34 @@ Características:
 - Travessia em-ordem (traverse)
 - Visualização com graphviz
 - Impressão 'pretty' da árvore para visualização
+- Contadores opcionais de operações estruturais (enable_stats/stats)
 
 Exemplo de uso:
     python 2-3-4.py
 """
 
 from __future__ import annotations
-from typing import List, Optional, Any
+from typing import Any, Callable, Iterator, List, Optional
 from collections import deque
 import os
 
+try:
+    from tools.stats import StatsMixin
+except ModuleNotFoundError:
+    # executado como script de dentro da pasta da árvore: a raiz do
+    # repositório (onde fica tools/) não está no sys.path
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from tools.stats import StatsMixin
+
+
+# formato de dump/load: MAGIC, cabeçalho, vetores em pré-ordem
+MAGIC = b'B2341'
+# nós, size, node_count, height
+_CABECALHO = '<QQQQ'
+# byte por nó: número de chaves (bits 0-3) e folha (bit 4)
+_FOLHA = 16
+
 
 class BTreeNode:
     """Nó de B-tree de grau mínimo t. Para 2-3-4 tree usamos t=2 (max 3 chaves).
@@ -50,7 +68,7 @@ class BTreeNode:
         return f"BTreeNode(keys={self.keys}, leaf={self.leaf})"
 
 
-class BTree234:
+class BTree234(StatsMixin):
     """B-tree com t=2 (equivalente a árvore 2-3-4).
 
     Métodos principais:
@@ -58,14 +76,31 @@ class BTree234:
       - search(k) -> (node, index) or (None, None)
       - delete(k) -> bool
       - traverse() -> lista ordenada de chaves
+      - iter_from(k) -> chaves >= k em ordem (varredura ordenada)
       - visualize() -> gera PNG com graphviz
       - pretty_print()
+      - enable_stats() / stats() -> contadores de operações estruturais
+      - dump(fp) / BTree234.load(fp) -> serialização compacta, sem recursão
+
+    Atributos mantidos incrementalmente (consulta O(1)):
+      - size: número de chaves
+      - node_count: número de nós (0 para árvore vazia)
+      - height: número de níveis (0 para árvore vazia)
     """
 
+    # contadores expostos por stats() quando a instrumentação está ativa
+    STATS_KEYS = ('comparisons', 'split_child', 'merge',
+                  'borrow_from_prev', 'borrow_from_next')
+
     def __init__(self) -> None:
         self.t = 2
         self.root = BTreeNode(self.t, leaf=True)
         self.node_counter = 0
+        self.size = 0
+        self.node_count = 0
+        self.height = 0
+        # None = instrumentação desligada (ver StatsMixin)
+        self._stats: Optional[dict] = None
 
     def search(self, k: Any, node: Optional[BTreeNode] = None):
         """Procura pela chave k.
@@ -73,13 +108,19 @@ class BTree234:
         """
         if node is None:
             node = self.root
-
-        i = node.find_key_index(k)
-        if i < len(node.keys) and node.keys[i] == k:
-            return node, i
-        if node.leaf:
-            return None, None
-        return self.search(k, node.children[i])
+        return self._search(k, node)
+
+    def _search(self, k: Any, node: BTreeNode):
+        stats = self._stats
+        while True:
+            i = node.find_key_index(k)
+            if stats is not None:
+                stats['comparisons'] += min(i + 1, len(node.keys))
+            if i < len(node.keys) and node.keys[i] == k:
+                return node, i
+            if node.leaf:
+                return None, None
+            node = node.children[i]
 
     def traverse(self) -> List[Any]:
         """Retorna a lista ordenada de chaves da árvore."""
@@ -96,6 +137,36 @@ class BTree234:
         _traverse(self.root)
         return res
 
+    def iter_from(self, k: Any = None) -> Iterator[Any]:
+        """Gera, em ordem, as chaves >= k (todas, se k for None).
+
+        A descida até a primeira chave custa O(log n) e cada chave seguinte
+        O(1) amortizado (pilha explícita, sem recursão). A árvore não deve
+        ser modificada enquanto o gerador estiver em uso.
+        """
+        # (nó interno, índice da próxima chave a emitir nesse nó)
+        stack = []
+        node = self.root
+        while not node.leaf:
+            i = 0 if k is None else node.find_key_index(k)
+            stack.append((node, i))
+            node = node.children[i]
+        i = 0 if k is None else node.find_key_index(k)
+        yield from node.keys[i:]
+
+        while stack:
+            node, i = stack.pop()
+            if i >= len(node.keys):
+                continue
+            yield node.keys[i]
+            stack.append((node, i + 1))
+            # a próxima chave é a menor da subárvore à direita
+            child = node.children[i + 1]
+            while not child.leaf:
+                stack.append((child, 0))
+                child = child.children[0]
+            yield from child.keys
+
     def split_child(self, parent: BTreeNode, index: int) -> None:
         """Divide o filho full em dois e promove a chave mediana para o pai.
 
@@ -127,6 +198,8 @@ class BTree234:
 
     def split_child(self, parent: BTreeNode, index: int) -> None:
         # Implementação correta e clara do split
+        if self._stats is not None:
+            self._stats['split_child'] += 1
         t = self.t
         y = parent.children[index]
         assert y.is_full(), "split_child chamado em nó que não está cheio"
@@ -152,63 +225,117 @@ class BTree234:
         # inserir z no parent
         parent.children.insert(index + 1, z)
         parent.keys.insert(index, median)
+        self.node_count += 1
 
     def insert(self, k: Any) -> bool:
         """Insere a chave k na árvore. Retorna True se inserido, False se duplicata."""
         # checar duplicata
-        node, idx = self.search(k)
+        node, idx = self._search(k, self.root)
         if node is not None:
             # já existe — não inserir novamente
             return False
 
         r = self.root
+        if self.size == 0:
+            # a folha raiz vazia passa a contar como nó
+            self.node_count = 1
+            self.height = 1
         if r.is_full():
             s = BTreeNode(self.t, leaf=False)
             s.children.append(r)
             self.root = s
+            self.node_count += 1
+            self.height += 1
             self.split_child(s, 0)
             self._insert_non_full(s, k)
         else:
             self._insert_non_full(r, k)
+        self.size += 1
         return True
 
     def _insert_non_full(self, node: BTreeNode, k: Any) -> None:
+        stats = self._stats
         i = len(node.keys) - 1
         if node.leaf:
             # inserir em posição correta na lista de chaves
             node.keys.append(None)  # espaço para expandir
-            while i >= 0 and node.keys[i] > k:
+            while i >= 0:
+                if stats is not None:
+                    stats['comparisons'] += 1
+                if not node.keys[i] > k:
+                    break
                 node.keys[i + 1] = node.keys[i]
                 i -= 1
             node.keys[i + 1] = k
         else:
             # localizar o filho que deve receber a nova chave
-            while i >= 0 and node.keys[i] > k:
+            while i >= 0:
+                if stats is not None:
+                    stats['comparisons'] += 1
+                if not node.keys[i] > k:
+                    break
                 i -= 1
             i += 1
             # se o filho está cheio, split primeiro
             if node.children[i].is_full():
                 self.split_child(node, i)
                 # após split, a chave mediana sobe para node.keys[i]
+                if stats is not None:
+                    stats['comparisons'] += 1
                 if node.keys[i] < k:
                     i += 1
             self._insert_non_full(node.children[i], k)
 
     def delete(self, k: Any) -> bool:
         """Remove a chave k da árvore. Retorna True se removido, False caso contrário."""
-        node, idx = self.search(k)
+        node, idx = self._search(k, self.root)
         if node is None:
             return False
         
-        self._delete_from_node(node, k, idx)
+        self._delete(self.root, k)
+        self.size -= 1
         
         # Se a raiz ficou vazia e tem um filho, o filho vira a nova raiz
         if len(self.root.keys) == 0:
             if not self.root.leaf and len(self.root.children) > 0:
                 self.root = self.root.children[0]
+                self.node_count -= 1
+                self.height -= 1
+            else:
+                # árvore vazia: resta apenas a folha raiz sem chaves
+                self.node_count = 0
+                self.height = 0
         
         return True
 
+    def _delete(self, node: BTreeNode, k: Any) -> None:
+        """Remove k da subárvore de node, descendo de cima para baixo.
+
+        Antes de descer para um filho com apenas t-1 chaves, garante que ele
+        tenha pelo menos t chaves (_fill_child), de modo que a remoção na
+        folha nunca deixe um nó vazio.
+        """
+        t = self.t
+        idx = node.find_key_index(k)
+
+        if idx < len(node.keys) and node.keys[idx] == k:
+            self._delete_from_node(node, k, idx)
+            return
+
+        if node.leaf:
+            return
+
+        # a chave está na subárvore de children[idx]
+        is_last = idx == len(node.keys)
+        if len(node.children[idx].keys) < t:
+            self._fill_child(node, idx)
+
+        # se o último filho foi mesclado com o anterior, descer no anterior
+        if is_last and idx > len(node.keys):
+            self._delete(node.children[idx - 1], k)
+        else:
+            self._delete(node.children[idx], k)
+
     def _delete_from_node(self, node: BTreeNode, k: Any, k_index: int) -> None:
         """Remove a chave k do nó especificado (que já foi encontrado)."""
         t = self.t
@@ -225,18 +352,16 @@ class BTree234:
                 # Caso 1: filho esquerdo tem pelo menos t chaves
                 predecessor = self._get_predecessor(node, k_index)
                 node.keys[k_index] = predecessor
-                self._delete_from_node(left_child, predecessor, 
-                                      left_child.find_key_index(predecessor))
+                self._delete(left_child, predecessor)
             elif len(right_child.keys) >= t:
                 # Caso 2: filho direito tem pelo menos t chaves
                 successor = self._get_successor(node, k_index)
                 node.keys[k_index] = successor
-                self._delete_from_node(right_child, successor,
-                                      right_child.find_key_index(successor))
+                self._delete(right_child, successor)
             else:
                 # Caso 3: ambos filhos têm t-1 chaves, mesclar
                 self._merge(node, k_index)
-                self._delete_from_node(left_child, k, left_child.find_key_index(k))
+                self._delete(left_child, k)
 
     def _get_predecessor(self, node: BTreeNode, k_index: int) -> Any:
         """Obtém o maior valor na subárvore enraizada no filho esquerdo."""
@@ -254,6 +379,8 @@ class BTree234:
 
     def _merge(self, node: BTreeNode, k_index: int) -> None:
         """Mescla o filho direito com o filho esquerdo e move a chave do nó."""
+        if self._stats is not None:
+            self._stats['merge'] += 1
         t = self.t
         left_child = node.children[k_index]
         right_child = node.children[k_index + 1]
@@ -271,6 +398,7 @@ class BTree234:
         # Remover chave do nó e remover referência ao right_child
         node.keys.pop(k_index)
         node.children.pop(k_index + 1)
+        self.node_count -= 1
 
     def _fill_child(self, node: BTreeNode, k_index: int) -> None:
         """Garante que o filho tenha pelo menos t chaves."""
@@ -291,6 +419,8 @@ class BTree234:
 
     def _borrow_from_prev(self, node: BTreeNode, child_index: int) -> None:
         """Empresta uma chave do irmão anterior."""
+        if self._stats is not None:
+            self._stats['borrow_from_prev'] += 1
         child = node.children[child_index]
         sibling = node.children[child_index - 1]
         
@@ -306,6 +436,8 @@ class BTree234:
 
     def _borrow_from_next(self, node: BTreeNode, child_index: int) -> None:
         """Empresta uma chave do irmão posterior."""
+        if self._stats is not None:
+            self._stats['borrow_from_next'] += 1
         child = node.children[child_index]
         sibling = node.children[child_index + 1]
         
@@ -319,8 +451,109 @@ class BTree234:
         if not child.leaf:
             child.children.append(sibling.children.pop(0))
 
+    def dump(self, fp) -> None:
+        """Grava a árvore em fp (binário) sem recursão.
+
+        Formato: cabeçalho, um byte por nó (quantidade de chaves e folha) e
+        todas as chaves, ambos em pré-ordem, cada vetor numa escrita só.
+        """
+        formatos = bytearray()
+        chaves: List[Any] = []
+        if self.size:
+            # uma só passada em pré-ordem monta os dois vetores
+            stack = [self.root]
+            pop, push = stack.pop, stack.extend
+            while stack:
+                node = pop()
+                keys = node.keys
+                chaves.extend(keys)
+                if node.leaf:
+                    formatos.append(len(keys) | _FOLHA)
+                else:
+                    formatos.append(len(keys))
+                    push(node.children[::-1])
+
+        # importado só aqui: array/pickle/struct pesariam no import da árvore
+        from tools.serial import gravar_cabecalho, gravar_valores
+        gravar_cabecalho(fp, MAGIC, _CABECALHO, len(formatos), self.size, self.node_count,
+                         self.height)
+        fp.write(formatos)
+        gravar_valores(fp, chaves)
+
+    @classmethod
+    def load(cls, fp) -> "BTree234":
+        """Reconstrói uma árvore gravada por dump em tempo linear, sem inserções."""
+        from tools.serial import coletor_pausado, ler_cabecalho, ler_valores
+        n, size, node_count, height = ler_cabecalho(fp, MAGIC, _CABECALHO, 'BTree234')
+        formatos = fp.read(n)
+        chaves = ler_valores(fp)
+
+        tree = cls()
+        tree.size, tree.node_count, tree.height = size, node_count, height
+        if not n:
+            return tree
+        t = tree.t
+        # muitos nós novos: o coletor cíclico só atrasaria a construção
+        with coletor_pausado():
+            # nós internos com filhos ainda por ligar (completo com chaves + 1)
+            pendentes = []
+            inicio = 0
+            for formato in formatos:
+                folha = formato >= _FOLHA
+                node = BTreeNode(t, folha)
+                fim = inicio + (formato & 15)
+                node.keys = chaves[inicio:fim]
+                inicio = fim
+                if pendentes:
+                    pai = pendentes[-1]
+                    filhos = pai.children
+                    filhos.append(node)
+                    if len(filhos) > len(pai.keys):
+                        pendentes.pop()
+                else:
+                    tree.root = node
+                if not folha:
+                    pendentes.append(node)
+        return tree
+
     def visualize(self, filename="tree", view=False) -> str:
         """Gera visualização com graphviz e retorna o caminho do arquivo."""
+        dot = self._build_graph(self._copiar_estrutura())
+
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        files_dir = os.path.join(current_dir, 'files')
+        os.makedirs(files_dir, exist_ok=True)
+        
+        output_path = os.path.join(files_dir, filename)
+        
+        # Renderiza o grafo
+        rendered_path = dot.render(output_path, format='png', cleanup=True, view=view)
+        return rendered_path
+
+    def to_dot(self) -> str:
+        """Retorna o código DOT do estado atual."""
+        return self.dot_snapshot()()
+
+    def dot_snapshot(self) -> Callable[[], str]:
+        """Copia só as chaves dos nós e retorna uma função que gera o DOT da cópia.
+
+        A cópia é barata; o Digraph é montado por quem chamar a função (por
+        exemplo, a thread do BackgroundRenderer), fora da operação na árvore.
+        """
+        copia = self._copiar_estrutura()
+        return lambda: self._build_graph(copia).source
+
+    def _copiar_estrutura(self):
+        """Cópia da árvore como (chaves, filhos); filhos é None nas folhas."""
+        def copiar(node: BTreeNode):
+            if node.leaf:
+                return tuple(node.keys), None
+            return tuple(node.keys), [copiar(child) for child in node.children]
+
+        return copiar(self.root)
+
+    def _build_graph(self, copia):
+        """Monta o Digraph a partir de uma cópia de _copiar_estrutura, sem renderizá-lo."""
         try:
             from graphviz import Digraph
         except ImportError:
@@ -333,41 +566,36 @@ class BTree234:
                 "- Mac: brew install graphviz"
             )
         
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        files_dir = os.path.join(current_dir, 'files')
-        os.makedirs(files_dir, exist_ok=True)
-        
-        output_path = os.path.join(files_dir, filename)
-        
         dot = Digraph(comment='BTree 2-3-4')
         dot.attr(rankdir='TB')
         dot.attr('node', shape='box', style='filled', fontsize='10', fontname='Arial')
         
-        self.node_counter = 0
+        # contador local: a função pode rodar em outra thread
+        contador = [0]
         
         def add_nodes(node):
-            node_id = f"node_{self.node_counter}"
-            self.node_counter += 1
+            keys, children = node
+            node_id = f"node_{contador[0]}"
+            contador[0] += 1
             
             # Label do nó com as chaves
-            keys_str = " | ".join(map(str, node.keys)) if node.keys else "∅"
+            keys_str = " | ".join(map(str, keys)) if keys else "∅"
             dot.node(node_id, keys_str, fillcolor='lightblue', fontcolor='black')
             
-            if not node.leaf:
-                for child in node.children:
+            if children is not None:
+                for child in children:
                     child_id = add_nodes(child)
                     dot.edge(node_id, child_id)
             
             return node_id
         
-        if self.root.keys or not self.root.leaf:
-            add_nodes(self.root)
+        keys, children = copia
+        if keys or children is not None:
+            add_nodes(copia)
         else:
             dot.node('empty', 'Árvore Vazia', shape='plaintext')
-        
-        # Renderiza o grafo
-        rendered_path = dot.render(output_path, format='png', cleanup=True, view=view)
-        return rendered_path
+
+        return dot
 
     def pretty_print(self) -> None:
         """Imprime a árvore por níveis (BFS), mostrando chaves de cada nó."""
@@ -4,22 +4,28 @@ Pacote Árvore 2-3-4 - Implementação de B-tree com grau mínimo t=2
 Este pacote contém:
 - 2-3-4.py: Implementação da estrutura de dados Árvore 2-3-4
 - implementation_234.py: Interface interativa com menu e visualizações
+- sfc_index.py: Índice espacial por curva Z-order/Hilbert sobre a BTree234
+- sharded.py: BTree234 particionada por intervalos de chaves entre processos
+- buffered.py: Modo otimizado para escrita, com buffers de mensagens nos nós internos (Bε-tree)
+
+O módulo 2-3-4.py só é carregado no primeiro acesso a BTree234/BTreeNode e
+fica registrado em sys.modules como '<pacote>.2-3-4', de modo que todos os
+usuários (inclusive implementation_234.py) compartilham as mesmas classes.
 """
 
 # Importar usando importlib para contornar o nome com hífen
-import importlib.util
-import os
+import importlib
+
+__all__ = ['BTree234', 'BTreeNode', 'SFCIndex', 'ShardedBTree234',
+           'BufferedBTree234']
 
-# Carregar o módulo 2-3-4.py
-spec = importlib.util.spec_from_file_location(
-    "btree234", 
-    os.path.join(os.path.dirname(__file__), "2-3-4.py")
-)
-btree234_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(btree234_module)
+# módulo de cada nome exportado, importado só no primeiro acesso
+_MODULOS = {'BTree234': '2-3-4', 'BTreeNode': '2-3-4', 'SFCIndex': 'sfc_index',
+             'ShardedBTree234': 'sharded', 'BufferedBTree234': 'buffered'}
 
-# Expor as classes principais
-BTree234 = btree234_module.BTree234
-BTreeNode = btree234_module.BTreeNode
 
-__all__ = ['BTree234', 'BTreeNode']
+def __getattr__(name):
+    if name in _MODULOS:
+        module = importlib.import_module(f"{__name__}.{_MODULOS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,365 @@
+"""
+Modo otimizado para escrita da Árvore 2-3-4 (buffers de mensagens à la Bε-tree).
+
+Na BTree234, cada inserção desce da raiz até uma folha (_insert_non_full),
+dividindo nós cheios pelo caminho. Aqui cada nó interno tem um buffer de
+mensagens {chave: True (inserir) | False (remover)}: insert/delete só
+gravam a mensagem no buffer da raiz. Quando um buffer passa de
+`capacidade` mensagens, elas descem um nível de uma vez, agrupadas por
+filho; nas folhas, o lote é intercalado às chaves de uma só vez e os nós
+que estouram (ou esvaziam) são divididos (ou juntados) de baixo para cima,
+um nível por vez. Assim as divisões e a reescrita dos nós são pagas por
+lote, e não por chave.
+
+Invariantes:
+- mensagens só descem, então as mais altas são as mais novas, e as
+  mensagens de uma chave ficam sempre no caminho entre a raiz e o nó que
+  a guarda (na divisão de um nó, a mensagem de uma chave promovida sobe
+  junto com ela);
+- a busca consulta, em cada nível, o buffer antes das chaves do nó.
+
+Remover uma chave de um nó interno não usa predecessor (que subiria
+acima de mensagens mais antigas): os dois filhos vizinhos são juntados ao
+longo da "costura" entre eles até as folhas, e os nós que estouram são
+redivididos.
+
+As operações são cegas: insert/delete não dizem se a chave existia, e
+size conta só as chaves já aplicadas. flush() aplica todas as mensagens;
+traverse, iter_from, dump, pretty_print e a visualização (visualize,
+to_dot, dot_snapshot) chamam flush() antes.
+
+Por isso a classe não substitui a BTree234 onde o retorno importa:
+insert/delete retornam None (não bool) e search retorna a chave, não
+(nó, índice). tools/replay e tools/tree_server usam a BTree234.
+
+Exemplo de uso:
+    tree = BufferedBTree234(capacidade=64)
+    for k in chaves:
+        tree.insert(k)
+    tree.search(10)
+    tree.flush()
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Tuple
+
+from . import BTree234, BTreeNode
+
+# chaves por nó na 2-3-4 (2*t - 1)
+_MAX_CHAVES = 3
+
+
+class BufferedBTree234(BTree234):
+    """BTree234 com buffers de mensagens nos nós internos.
+
+    Métodos principais (insert/delete/search com retornos diferentes dos
+    da BTree234; ver o docstring do módulo):
+      - insert(k) / delete(k): gravam a mensagem (sem retorno)
+      - search(k) -> chave ou None (consulta os buffers na descida)
+      - flush(): aplica todas as mensagens pendentes
+      - pendentes() -> número de mensagens nos buffers
+
+    Atributos:
+      - capacidade: mensagens por buffer antes de descarregá-lo
+      - size / node_count / height: como na BTree234, contando só o que
+        já foi aplicado
+    """
+
+    def __init__(self, capacidade: int = 64) -> None:
+        super().__init__()
+        if capacidade < 1:
+            raise ValueError("capacidade deve ser positiva")
+        self.capacidade = capacidade
+
+    def _novo_interno(self) -> BTreeNode:
+        node = BTreeNode(self.t, leaf=False)
+        node.buffer = {}
+        return node
+
+    # --- operações públicas -------------------------------------------------
+
+    def insert(self, k: Any) -> None:
+        """Grava a inserção de k (aplicada quando o buffer descer)."""
+        self._mensagem(k, True)
+
+    def delete(self, k: Any) -> None:
+        """Grava a remoção de k (aplicada quando o buffer descer)."""
+        self._mensagem(k, False)
+
+    def _mensagem(self, k: Any, op: bool) -> None:
+        root = self.root
+        if root.leaf:
+            self._aplicar_folha(root, {k: op})
+        else:
+            # uma mensagem mais nova para a mesma chave substitui a anterior
+            root.buffer[k] = op
+            if len(root.buffer) <= self.capacidade:
+                return
+            self._descarregar(root)
+        self._ajustar_raiz()
+
+    def search(self, k: Any) -> Any:
+        """Retorna a chave igual a k, ou None se ausente (ou com remoção pendente)."""
+        node = self.root
+        while not node.leaf:
+            op = node.buffer.get(k)
+            if op is not None:
+                return k if op else None
+            i = bisect_left(node.keys, k)
+            if i < len(node.keys) and node.keys[i] == k:
+                return node.keys[i]
+            node = node.children[i]
+        i = bisect_left(node.keys, k)
+        if i < len(node.keys) and node.keys[i] == k:
+            return node.keys[i]
+        return None
+
+    def flush(self) -> None:
+        """Aplica todas as mensagens pendentes, da raiz até as folhas."""
+        while not self.root.leaf and self.pendentes():
+            self._descarregar(self.root, tudo=True)
+            self._ajustar_raiz()
+
+    def pendentes(self) -> int:
+        """Mensagens ainda nos buffers (percorre os nós internos)."""
+        total = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not node.leaf:
+                total += len(node.buffer)
+                stack.extend(node.children)
+        return total
+
+    def traverse(self) -> List[Any]:
+        self.flush()
+        return super().traverse()
+
+    def iter_from(self, k: Any = None) -> Iterator[Any]:
+        self.flush()
+        return super().iter_from(k)
+
+    def dump(self, fp) -> None:
+        self.flush()
+        super().dump(fp)
+
+    def pretty_print(self) -> None:
+        self.flush()
+        super().pretty_print()
+
+    def _copiar_estrutura(self):
+        # visualize, to_dot e dot_snapshot partem desta cópia
+        self.flush()
+        return super()._copiar_estrutura()
+
+    @classmethod
+    def load(cls, fp) -> "BufferedBTree234":
+        tree = super().load(fp)
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            if not node.leaf:
+                node.buffer = {}
+                stack.extend(node.children)
+        return tree
+
+    # --- descarga dos buffers -----------------------------------------------
+
+    def _descarregar(self, node: BTreeNode, tudo: bool = False) -> None:
+        """Desce as mensagens do buffer de node um nível e arruma os filhos.
+
+        Com tudo=True desce também os buffers dos filhos internos, mesmo
+        abaixo da capacidade (usado por flush). node pode ficar com chaves
+        demais ou de menos: quem arruma é o pai (ou _ajustar_raiz).
+        """
+        mensagens, node.buffer = node.buffer, {}
+        grupos: Dict[int, Dict[Any, bool]] = {}
+        remocoes = []
+        keys = node.keys
+        for k, op in mensagens.items():
+            i = bisect_left(keys, k)
+            if i < len(keys) and keys[i] == k:
+                # chave deste nó: inserir não muda nada; remover, sim
+                if not op:
+                    remocoes.append(k)
+            else:
+                grupos.setdefault(i, {})[k] = op
+
+        for k in remocoes:
+            self._remover_interna(node, bisect_left(node.keys, k))
+        if remocoes:
+            # os índices dos filhos mudaram: reagrupa
+            restantes = [item for grupo in grupos.values() for item in grupo.items()]
+            grupos = {}
+            for k, op in restantes:
+                grupos.setdefault(bisect_left(node.keys, k), {})[k] = op
+
+        for i, grupo in grupos.items():
+            child = node.children[i]
+            if child.leaf:
+                self._aplicar_folha(child, grupo)
+                continue
+            # as mensagens do pai são mais novas que as do filho
+            child.buffer.update(grupo)
+            if not tudo and len(child.buffer) > self.capacidade:
+                self._descarregar(child)
+
+        if tudo:
+            # mensagens podem estar em qualquer nível abaixo, mesmo sob buffers vazios
+            for child in node.children:
+                if not child.leaf:
+                    self._descarregar(child, tudo)
+        self._rearrumar(node)
+
+    def _aplicar_folha(self, leaf: BTreeNode, grupo: Dict[Any, bool]) -> None:
+        """Intercala um lote de mensagens às chaves da folha (pode estourá-la)."""
+        remover = {k for k, op in grupo.items() if not op}
+        keys = leaf.keys
+        if remover:
+            keys = [k for k in keys if k not in remover]
+        presentes = set(keys)
+        novas = [k for k, op in grupo.items() if op and k not in presentes]
+        if novas:
+            keys = sorted(keys + novas)
+        self.size += len(keys) - len(leaf.keys)
+        leaf.keys = keys
+
+    def _remover_interna(self, node: BTreeNode, i: int) -> None:
+        """Remove node.keys[i] juntando os filhos vizinhos ao longo da costura."""
+        esquerda = node.children[i]
+        direita = node.children.pop(i + 1)
+        node.keys.pop(i)
+        self.size -= 1
+        costura = []
+        while True:
+            esquerda.keys.extend(direita.keys)
+            self.node_count -= 1
+            if esquerda.leaf:
+                break
+            # intervalos disjuntos: a união dos buffers não perde mensagens
+            esquerda.buffer.update(direita.buffer)
+            costura.append(esquerda)
+            # o último filho da esquerda e o primeiro da direita também se juntam
+            ultimo = esquerda.children[-1]
+            esquerda.children.extend(direita.children[1:])
+            esquerda, direita = ultimo, direita.children[0]
+        # de baixo para cima: cada nó da costura arruma o filho juntado
+        for merged in reversed(costura):
+            self._rearrumar(merged)
+
+    # --- rebalanceamento de baixo para cima ---------------------------------
+
+    def _rearrumar(self, node: BTreeNode) -> None:
+        """Deixa todos os filhos de node com 1 a 3 chaves.
+
+        Filhos vazios são juntados a um vizinho (com a chave separadora) e
+        filhos com chaves demais são divididos, promovendo separadores.
+        """
+        filhos: List[BTreeNode] = []
+        chaves: List[Any] = []
+        # primeiro filho vazio: espera o próximo para se juntar a ele
+        vazio = None
+        for i, child in enumerate(node.children):
+            if i == 0:
+                if not child.keys:
+                    vazio = child
+                    continue
+            else:
+                separador = node.keys[i - 1]
+                if vazio is not None:
+                    child = self._juntar(vazio, separador, child)
+                    vazio = None
+                elif not child.keys:
+                    child = self._juntar(filhos.pop(), separador, child)
+                else:
+                    chaves.append(separador)
+            if len(child.keys) > _MAX_CHAVES:
+                pecas, separadores = self._partir(child, node)
+                filhos.append(pecas[0])
+                for separador, peca in zip(separadores, pecas[1:]):
+                    chaves.append(separador)
+                    filhos.append(peca)
+            else:
+                filhos.append(child)
+        if vazio is not None:
+            filhos.append(vazio)
+        node.keys = chaves
+        node.children = filhos
+
+    def _juntar(self, a: BTreeNode, separador: Any, b: BTreeNode) -> BTreeNode:
+        """Junta b em a com o separador entre eles (resultado pode estourar)."""
+        a.keys.append(separador)
+        a.keys.extend(b.keys)
+        self.node_count -= 1
+        if not a.leaf:
+            a.children.extend(b.children)
+            a.buffer.update(b.buffer)
+            # um filho vazio que veio junto é arrumado agora
+            if not a.children[0].keys or not a.children[-1].keys:
+                self._rearrumar(a)
+        return a
+
+    def _partir(self, node: BTreeNode, pai: BTreeNode) -> Tuple[List[BTreeNode], List[Any]]:
+        """Divide um nó com chaves demais em peças de ~2 chaves.
+
+        As mensagens do buffer vão para a peça que cobre a chave; a remoção
+        pendente de um separador sobe com ele para o buffer do pai.
+        """
+        keys, filhos = node.keys, node.children
+        m = len(keys)
+        quantidade = (m + 3) // 3
+        livres = m - (quantidade - 1)
+        pecas = [node]
+        separadores = []
+        inicio = 0
+        for j in range(quantidade):
+            tamanho = livres // quantidade + (j < livres % quantidade)
+            fim = inicio + tamanho
+            if j == 0:
+                peca = node
+            else:
+                separadores.append(keys[inicio - 1])
+                peca = BTreeNode(self.t, leaf=True) if node.leaf else self._novo_interno()
+                pecas.append(peca)
+            peca.keys = keys[inicio:fim]
+            if not node.leaf:
+                peca.children = filhos[inicio:fim + 1]
+            inicio = fim + 1
+        self.node_count += quantidade - 1
+
+        if not node.leaf:
+            mensagens, node.buffer = node.buffer, {}
+            for k, op in mensagens.items():
+                j = bisect_left(separadores, k)
+                if j < len(separadores) and separadores[j] == k:
+                    if not op:
+                        pai.buffer.setdefault(k, op)
+                else:
+                    pecas[j].buffer[k] = op
+        return pecas, separadores
+
+    def _ajustar_raiz(self) -> None:
+        """Divide a raiz que estourou ou desce a raiz interna sem chaves."""
+        while True:
+            root = self.root
+            if root.leaf:
+                self.node_count = self.height = 1 if root.keys else 0
+            if len(root.keys) > _MAX_CHAVES:
+                # nova raiz acima; _rearrumar divide a antiga como filho
+                nova = self._novo_interno()
+                nova.children = [root]
+                self.root = nova
+                self.node_count += 1
+                self.height += 1
+                self._rearrumar(nova)
+            elif not root.leaf and not root.keys:
+                if root.buffer:
+                    self._descarregar(root)
+                    continue
+                self.root = root.children[0]
+                self.node_count -= 1
+                self.height -= 1
+            else:
+                return
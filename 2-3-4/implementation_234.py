@@ -10,13 +10,19 @@ from datetime import datetime
 from collections import deque
 
 # Importar a classe BTree234 do módulo 2-3-4
-# Usando importlib para importar nome com hífen
-import importlib.util
-spec = importlib.util.spec_from_file_location("btree234", os.path.join(os.path.dirname(__file__), "2-3-4.py"))
-btree_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(btree_module)
+# Usando importlib para importar nome com hífen; dentro do pacote reutiliza o
+# mesmo módulo carregado por 2-3-4/__init__.py (uma única classe BTree234)
+import importlib
+if __package__:
+    btree_module = importlib.import_module(f"{__package__}.2-3-4")
+else:
+    btree_module = importlib.import_module("2-3-4")
 BTree234 = btree_module.BTree234
 
+# raiz do repositório, para o pacote tools quando executado como script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.render_worker import BackgroundRenderer
+
 
 class BTree234Session:
     """Gerencia uma sessão interativa da Árvore 2-3-4 com visualizações."""
@@ -25,6 +31,10 @@ class BTree234Session:
         self.tree = BTree234()
         self.session_name = self._create_session_name()
         self.base_path = self._create_directory_structure()
+        # renderização em segundo plano: as operações não esperam o graphviz
+        self.renderer = BackgroundRenderer()
+        # arquivo de log aberto uma única vez, com escrita em buffer
+        self._log_file = None
         
     def _create_session_name(self):
         """Cria um nome único para a sessão com timestamp."""
@@ -41,7 +51,11 @@ class BTree234Session:
         return base_path
     
     def _save_visualization(self, filename, subfolder=None):
-        """Salva a visualização da árvore em arquivo PNG com graphviz."""
+        """Agenda a visualização da árvore em PNG e retorna a Renderizacao.
+
+        Aqui só a estrutura da árvore é copiada; o DOT e o graphviz rodam em
+        segundo plano. O arquivo existe quando a Renderizacao termina.
+        """
         if not filename.endswith('.png'):
             filename = f"{filename}.png"
         if subfolder:
@@ -54,12 +68,18 @@ class BTree234Session:
             # Remove extensão duplicada se houver
             if output_path.endswith('.png.png'):
                 output_path = output_path[:-4]
-            rendered_path = self.tree.visualize(output_path[:-4], view=False)
-            return rendered_path
+            return self.renderer.submit(self.tree.dot_snapshot(), output_path[:-4])
         except Exception as e:
             print(f"❌ Erro ao gerar visualização: {e}")
             return None
     
+    def _finalizar_visualizacoes(self):
+        """Aguarda as renderizações pendentes e reporta falhas."""
+        print("\n⏳ Aguardando visualizações pendentes...")
+        self.renderer.close()
+        for erro in self.renderer.erros:
+            print(f"❌ Erro ao gerar visualização: {erro}")
+    
     def _get_tree_structure(self) -> str:
         """Retorna a estrutura da árvore em formato de texto."""
         from collections import deque
@@ -86,64 +106,53 @@ class BTree234Session:
         return "\n".join(lines)
     
     def _get_info_arvore(self):
-        """Retorna informações sobre a árvore."""
-        def contar_nos_e_chaves(node):
-            if not node or (node.leaf and len(node.keys) == 0 and len(node.children) == 0):
-                return 0, 0
-            total_nos = 1
-            total_chaves = len(node.keys)
-            if not node.leaf:
-                for child in node.children:
-                    nos, chaves = contar_nos_e_chaves(child)
-                    total_nos += nos
-                    total_chaves += chaves
-            return total_nos, total_chaves
-        
-        total_nos, total_chaves = contar_nos_e_chaves(self.tree.root)
+        """Retorna informações sobre a árvore (O(1), mantidas pela própria árvore)."""
         return {
-            'total_nos': total_nos,
-            'total_chaves': total_chaves,
+            'total_nos': self.tree.node_count,
+            'total_chaves': self.tree.size,
             'raiz': self.tree.root.keys if self.tree.root.keys else [],
             'profundidade': self._calcular_profundidade()
         }
     
     def _calcular_profundidade(self):
-        """Calcula a profundidade da árvore."""
-        def depth(node):
-            if node.leaf:
-                return 1
-            if len(node.children) == 0:
-                return 1
-            return 1 + depth(node.children[0])
-        return depth(self.tree.root)
+        """Retorna a profundidade da árvore."""
+        return self.tree.height
     
     def _log_operacao(self, operacao, detalhes):
         """Registra uma operação no arquivo de log."""
         if not self.base_path:
             return
         
-        log_file = os.path.join(self.base_path, "operacoes.log")
-        
         try:
+            if self._log_file is None:
+                log_file = os.path.join(self.base_path, "operacoes.log")
+                self._log_file = open(log_file, 'a', encoding='utf-8', buffering=64 * 1024)
+            
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             info = self._get_info_arvore()
             
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write("\n" + "=" * 70 + "\n")
-                f.write(f"OPERAÇÃO: {operacao}\n")
-                f.write(f"Timestamp: {timestamp}\n")
-                f.write("=" * 70 + "\n")
-                f.write(f"Detalhes: {detalhes}\n")
-                f.write(f"\nEstado da Árvore após operação:\n")
-                f.write(f"  • Nós: {info['total_nos']}\n")
-                f.write(f"  • Chaves: {info['total_chaves']}\n")
-                f.write(f"  • Raiz: {info['raiz'] if info['raiz'] else 'Vazia'}\n")
-                f.write(f"  • Profundidade: {info['profundidade']}\n")
-                f.write(f"  • Chaves em ordem: {self.tree.traverse()}\n")
-                f.write("-" * 70 + "\n")
+            self._log_file.write(
+                "\n" + "=" * 70 + "\n"
+                f"OPERAÇÃO: {operacao}\n"
+                f"Timestamp: {timestamp}\n"
+                + "=" * 70 + "\n"
+                f"Detalhes: {detalhes}\n"
+                f"\nEstado da Árvore após operação:\n"
+                f"  • Nós: {info['total_nos']}\n"
+                f"  • Chaves: {info['total_chaves']}\n"
+                f"  • Raiz: {info['raiz'] if info['raiz'] else 'Vazia'}\n"
+                f"  • Profundidade: {info['profundidade']}\n"
+                + "-" * 70 + "\n"
+            )
         except Exception as e:
             print(f"❌ Erro ao registrar operação: {e}")
     
+    def _fechar_log(self):
+        """Grava o que estiver em buffer e fecha o arquivo de log."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+    
     def inserir_no(self):
         """Menu para inserir um nó interativamente."""
         print("\n" + "=" * 60)
@@ -156,19 +165,20 @@ class BTree234Session:
             print("❌ Erro: Digite um número inteiro válido!")
             return
         print(f"\n📊 Salvando estado ANTES da inserção...")
-        antes_path = self._save_visualization(f"valor_{valor}_antes.png", "insercoes")
+        antes = self._save_visualization(f"valor_{valor}_antes.png", "insercoes")
         inserido = self.tree.insert(valor)
+        self._log_operacao("INSERÇÃO", f"valor {valor} {'inserido' if inserido else 'duplicado (ignorado)'}")
         print(f"📊 Salvando estado DEPOIS da inserção...")
-        depois_path = self._save_visualization(f"valor_{valor}_depois.png", "insercoes")
+        depois = self._save_visualization(f"valor_{valor}_depois.png", "insercoes")
         if inserido:
             print(f"\n✅ Valor {valor} inserido com sucesso!")
         else:
             print(f"\n⚠️  Valor {valor} já existe na árvore (duplicata ignorada)!")
-        print(f"\n📁 Arquivos salvos em:")
-        if antes_path:
-            print(f"   • Antes:  {os.path.basename(antes_path)}")
-        if depois_path:
-            print(f"   • Depois: {os.path.basename(depois_path)}")
+        print(f"\n📁 Arquivos (gerados em segundo plano):")
+        if antes:
+            print(f"   • Antes:  {os.path.basename(antes.caminho)}")
+        if depois:
+            print(f"   • Depois: {os.path.basename(depois.caminho)}")
         self._exibir_estado_arvore()
     
     def remover_no(self):
@@ -187,19 +197,20 @@ class BTree234Session:
             print(f"\n❌ Valor {valor} não encontrado na árvore!")
             return
         print(f"\n📊 Salvando estado ANTES da remoção...")
-        antes_path = self._save_visualization(f"valor_{valor}_antes.png", "remocoes")
+        antes = self._save_visualization(f"valor_{valor}_antes.png", "remocoes")
         removido = self.tree.delete(valor)
+        self._log_operacao("REMOÇÃO", f"valor {valor} {'removido' if removido else 'não removido'}")
         print(f"📊 Salvando estado DEPOIS da remoção...")
-        depois_path = self._save_visualization(f"valor_{valor}_depois.png", "remocoes")
+        depois = self._save_visualization(f"valor_{valor}_depois.png", "remocoes")
         if removido:
             print(f"\n✅ Valor {valor} removido com sucesso da árvore!")
         else:
             print(f"\n❌ Erro ao remover o valor {valor}!")
-        print(f"\n📁 Arquivos salvos em:")
-        if antes_path:
-            print(f"   • Antes:  {os.path.basename(antes_path)}")
-        if depois_path:
-            print(f"   • Depois: {os.path.basename(depois_path)}")
+        print(f"\n📁 Arquivos (gerados em segundo plano):")
+        if antes:
+            print(f"   • Antes:  {os.path.basename(antes.caminho)}")
+        if depois:
+            print(f"   • Depois: {os.path.basename(depois.caminho)}")
         self._exibir_estado_arvore()
     
     def buscar_no(self):
@@ -215,7 +226,7 @@ class BTree234Session:
             return
         print(f"\n📊 Gerando visualização do estado atual...")
         # Sempre sobrescreve o mesmo arquivo na raiz da sessão
-        estado_path = self._save_visualization("estado_atual.png")
+        estado = self._save_visualization("estado_atual.png")
         node, idx = self.tree.search(valor)
         print(f"\n{'='*60}")
         if node:
@@ -231,8 +242,8 @@ class BTree234Session:
             print(f"❌ VALOR NÃO ENCONTRADO!")
             print(f"{'='*60}")
             print(f"\n   O valor {valor} não existe na árvore.")
-        if estado_path:
-            print(f"\n📁 Visualização salva em: {os.path.basename(estado_path)}")
+        if estado:
+            print(f"\n📁 Visualização (gerada em segundo plano): {os.path.basename(estado.caminho)}")
         self._exibir_estado_arvore()
     
     def _exibir_estado_arvore(self):
@@ -321,6 +332,8 @@ class BTree234Session:
                 print("\n" + "=" * 60)
                 print("👋 Encerrando sessão...")
                 print("=" * 60)
+                self._finalizar_visualizacoes()
+                self._fechar_log()
                 print(f"\n📁 Todos os arquivos foram salvos em:")
                 print(f"   {os.path.relpath(self.base_path)}")
                 print("\n✅ Sessão encerrada com sucesso!")
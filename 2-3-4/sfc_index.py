@@ -0,0 +1,300 @@
+"""
+Índice espacial por curva de preenchimento (Z-order/Morton ou Hilbert)
+sobre a Árvore 2-3-4.
+
+Cada ponto é quantizado numa grade de 2**bits células por dimensão dentro
+de [low, high] e a célula é codificada numa única chave inteira, que vai
+para uma BTree234. Pontos na mesma célula compartilham a chave (um balde
+por célula). Como a B-tree se mantém balanceada a cada inserção, não há
+reconstruções de subárvores como no reequilíbrio da KDTree: o custo de
+inserir é O(log n) sempre, o que favorece cargas com muitas escritas.
+
+Consultas por caixa viram varreduras ordenadas (BTree234.iter_from):
+- morton: varre [Z(low), Z(high)] e, ao sair da caixa, salta para a
+  próxima chave dentro dela (BIGMIN, Tropf & Herzog);
+- hilbert: a caixa é decomposta em células alinhadas, cada uma um
+  intervalo contíguo de chaves; as células da borda são filtradas.
+
+Exemplo de uso:
+    index = SFCIndex(2, low=[0, 0], high=[1, 1], curve='hilbert')
+    index.insert([0.25, 0.5], 'a')
+    index.range_search([0, 0], [0.5, 0.5])
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from . import BTree234
+
+CURVES = ('morton', 'hilbert')
+
+
+def _espalhar(byte: int, k: int) -> int:
+    """Espalha os 8 bits de byte com passo k (bit i vai para a posição i*k)."""
+    resultado = 0
+    for i in range(8):
+        if byte >> i & 1:
+            resultado |= 1 << (i * k)
+    return resultado
+
+
+class SFCIndex:
+    """Índice espacial de pontos k-dimensionais com chaves de curva em BTree234.
+
+    Métodos principais (mesmos nomes da KDTree):
+      - insert(point, value) -> bool (False se o ponto já existia)
+      - delete(point) -> bool
+      - search(point) / get(point, default)
+      - range_search(low, high) / range_count(low, high)
+      - points() / items() -> na ordem da curva
+
+    Atributos:
+      - size: número de pontos
+      - cells: número de células ocupadas (chaves na BTree234)
+    """
+
+    def __init__(self, k: int, low: Sequence[float], high: Sequence[float],
+                 bits: int = 16, curve: str = 'morton', max_intervalos: int = 16) -> None:
+        if curve not in CURVES:
+            raise ValueError(f"curve deve ser um de {CURVES}")
+        if len(low) != k or len(high) != k or any(h <= lo for lo, h in zip(low, high)):
+            raise ValueError("low e high devem ter k coordenadas com low[i] < high[i]")
+        self.k = k
+        self.low = list(low)
+        self.high = list(high)
+        self.bits = bits
+        self.curve = curve
+        # hilbert: limite de intervalos de chaves por consulta por caixa
+        self.max_intervalos = max_intervalos
+        self.size = 0
+        self._tree = BTree234()
+        # chave -> {tuple(ponto): (ponto, carga)}
+        self._celulas: Dict[int, Dict[Tuple, Tuple[Any, Any]]] = {}
+
+        lado = 1 << bits
+        self._escala = [lado / (h - lo) for lo, h in zip(self.low, self.high)]
+        self._espalhado = [_espalhar(byte, k) for byte in range(256)]
+        # bits de cada dimensão dentro da chave (a dimensão 0 é a mais significativa)
+        self._mascaras = [sum(1 << (b * k + k - 1 - d) for b in range(bits))
+                          for d in range(k)]
+
+    @property
+    def cells(self) -> int:
+        return len(self._celulas)
+
+    def _celula(self, point: Sequence[float]) -> List[int]:
+        """Coordenadas inteiras da célula do ponto (ValueError fora de [low, high])."""
+        ultima = (1 << self.bits) - 1
+        celula = []
+        for c, lo, h, e in zip(point, self.low, self.high, self._escala):
+            if not lo <= c <= h:
+                raise ValueError(f"Ponto {point} fora dos limites do índice")
+            celula.append(min(int((c - lo) * e), ultima))
+        return celula
+
+    def _intercalar(self, coords: Sequence[int]) -> int:
+        """Intercala os bits das coordenadas (Morton), 8 bits por vez."""
+        k, espalhado = self.k, self._espalhado
+        chave = 0
+        for d, x in enumerate(coords):
+            deslocamento = k - 1 - d
+            while x:
+                chave |= espalhado[x & 255] << deslocamento
+                x >>= 8
+                deslocamento += 8 * k
+        return chave
+
+    def _hilbert(self, coords: Sequence[int]) -> int:
+        """Índice de Hilbert da célula (transposição de Skilling, 2004)."""
+        x = list(coords)
+        k = self.k
+        m = 1 << (self.bits - 1)
+        q = m
+        while q > 1:
+            p = q - 1
+            for i in range(k):
+                if x[i] & q:
+                    x[0] ^= p
+                else:
+                    t = (x[0] ^ x[i]) & p
+                    x[0] ^= t
+                    x[i] ^= t
+            q >>= 1
+        for i in range(1, k):
+            x[i] ^= x[i - 1]
+        t = 0
+        q = m
+        while q > 1:
+            if x[k - 1] & q:
+                t ^= q - 1
+            q >>= 1
+        return self._intercalar([c ^ t for c in x])
+
+    def _chave(self, celula: Sequence[int]) -> int:
+        if self.curve == 'morton':
+            return self._intercalar(celula)
+        return self._hilbert(celula)
+
+    def insert(self, point: Sequence[float], value: Any = None) -> bool:
+        """Insere o ponto; se ele já existir, só atualiza a carga e retorna False."""
+        chave = self._chave(self._celula(point))
+        balde = self._celulas.get(chave)
+        if balde is None:
+            balde = self._celulas[chave] = {}
+            self._tree.insert(chave)
+        ponto = tuple(point)
+        novo = ponto not in balde
+        balde[ponto] = (point, value)
+        if novo:
+            self.size += 1
+        return novo
+
+    def _balde(self, point: Sequence[float]) -> Optional[Dict[Tuple, Tuple[Any, Any]]]:
+        try:
+            chave = self._chave(self._celula(point))
+        except ValueError:
+            return None
+        return self._celulas.get(chave)
+
+    def delete(self, point: Sequence[float]) -> bool:
+        balde = self._balde(point)
+        if balde is None or tuple(point) not in balde:
+            return False
+        del balde[tuple(point)]
+        self.size -= 1
+        if not balde:
+            chave = self._chave(self._celula(point))
+            del self._celulas[chave]
+            self._tree.delete(chave)
+        return True
+
+    def search(self, point: Sequence[float]):
+        balde = self._balde(point)
+        if balde is None or tuple(point) not in balde:
+            return None
+        return balde[tuple(point)][0]
+
+    def get(self, point: Sequence[float], default: Any = None) -> Any:
+        balde = self._balde(point)
+        if balde is None or tuple(point) not in balde:
+            return default
+        return balde[tuple(point)][1]
+
+    def items(self) -> List[Tuple[Any, Any]]:
+        """Pares (ponto, carga) na ordem da curva."""
+        return [item for chave in self._tree.iter_from() for item in self._celulas[chave].values()]
+
+    def points(self) -> List[Any]:
+        return [point for point, _ in self.items()]
+
+    def _caixa_celulas(self, low: Sequence[float], high: Sequence[float]):
+        """Células extremas da caixa, recortada aos limites; None se disjunta."""
+        if any(h < lo or l > hi for l, h, lo, hi in zip(low, high, self.low, self.high)):
+            return None
+        return (self._celula([max(l, lo) for l, lo in zip(low, self.low)]),
+                self._celula([min(h, hi) for h, hi in zip(high, self.high)]))
+
+    def _chaves_na_caixa(self, low: Sequence[float], high: Sequence[float]) -> Iterator[int]:
+        """Chaves ocupadas cujas células cortam a caixa (hilbert: pode incluir vizinhas)."""
+        caixa = self._caixa_celulas(low, high)
+        if caixa is None:
+            return
+        if self.curve == 'morton':
+            yield from self._varrer_morton(self._intercalar(caixa[0]), self._intercalar(caixa[1]))
+        else:
+            for inicio, fim in self._intervalos_hilbert(*caixa):
+                for chave in self._tree.iter_from(inicio):
+                    if chave > fim:
+                        break
+                    yield chave
+
+    def _varrer_morton(self, zmin: int, zmax: int) -> Iterator[int]:
+        # com as máscaras por dimensão, os bits de uma dimensão preservam a
+        # ordem da coordenada, então "dentro da caixa" é uma comparação por dimensão
+        limites = [(zmin & m, zmax & m, m) for m in self._mascaras]
+        proxima = zmin
+        while proxima is not None:
+            for chave in self._tree.iter_from(proxima):
+                if chave > zmax:
+                    return
+                if all(lo <= chave & m <= hi for lo, hi, m in limites):
+                    yield chave
+                else:
+                    # saiu da caixa: recomeça a varredura na próxima chave dentro dela
+                    proxima = self._bigmin(chave, zmin, zmax)
+                    break
+            else:
+                return
+
+    def _bigmin(self, z: int, zmin: int, zmax: int) -> Optional[int]:
+        """Menor chave > z dentro da caixa [zmin, zmax] (None se não houver)."""
+        k = self.k
+        bigmin = None
+        for pos in range(self.bits * k - 1, -1, -1):
+            bit = 1 << pos
+            # bits da mesma dimensão abaixo de pos
+            abaixo = self._mascaras[k - 1 - pos % k] & (bit - 1)
+            caso = (z & bit != 0, zmin & bit != 0, zmax & bit != 0)
+            if caso == (False, False, True):
+                bigmin = (zmin & ~abaixo) | bit
+                zmax = (zmax & ~bit) | abaixo
+            elif caso == (False, True, True):
+                return zmin
+            elif caso == (True, False, False):
+                return bigmin
+            elif caso == (True, False, True):
+                zmin = (zmin & ~abaixo) | bit
+        return bigmin
+
+    def _intervalos_hilbert(self, lo: List[int], hi: List[int]) -> List[Tuple[int, int]]:
+        """Cobre a caixa de células [lo, hi] com intervalos de chaves de Hilbert.
+
+        Toda célula alinhada de lado 2**j é um intervalo contíguo da curva.
+        As células que cortam a borda da caixa são subdivididas nível a nível
+        enquanto o total não passar de max_intervalos; as que sobram entram
+        inteiras (a consulta filtra os pontos de fora).
+        """
+        k, bits = self.k, self.bits
+        intervalos = []
+        parciais = [[0] * k]
+        for nivel in range(bits + 1):
+            lado = 1 << (bits - nivel)
+            baixos = lado ** k - 1
+            subdividir = nivel < bits and len(intervalos) + len(parciais) * 2 ** k <= self.max_intervalos
+            proximas = []
+            for origem in parciais:
+                dentro = all(l <= o and o + lado - 1 <= h for o, l, h in zip(origem, lo, hi))
+                if dentro or not subdividir:
+                    chave = self._hilbert(origem) & ~baixos
+                    intervalos.append((chave, chave | baixos))
+                    continue
+                metade = lado >> 1
+                for filho in range(2 ** k):
+                    canto = [o + metade * (filho >> d & 1) for d, o in enumerate(origem)]
+                    if all(c <= h and c + metade - 1 >= l for c, l, h in zip(canto, lo, hi)):
+                        proximas.append(canto)
+            parciais = proximas
+            if not parciais:
+                break
+
+        # junta intervalos adjacentes
+        intervalos.sort()
+        unidos = []
+        for inicio, fim in intervalos:
+            if unidos and inicio <= unidos[-1][1] + 1:
+                unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fim))
+            else:
+                unidos.append((inicio, fim))
+        return unidos
+
+    def range_search(self, low: Sequence[float], high: Sequence[float]) -> List[Any]:
+        """Pontos p com low[i] <= p[i] <= high[i] em todas as coordenadas."""
+        result = []
+        for chave in self._chaves_na_caixa(low, high):
+            for point, _ in self._celulas[chave].values():
+                if all(l <= c <= h for l, c, h in zip(low, point, high)):
+                    result.append(point)
+        return result
+
+    def range_count(self, low: Sequence[float], high: Sequence[float]) -> int:
+        return len(self.range_search(low, high))
@@ -0,0 +1,321 @@
+"""
+Árvore 2-3-4 particionada por intervalos de chaves entre processos.
+
+Uma BTree234 usa um único núcleo e a memória de um único processo. Aqui o
+espaço de chaves é dividido em intervalos contíguos (shards), cada um
+mantido por um processo worker com sua própria BTree234; o processo
+principal só guarda os limites entre os shards e encaminha as operações:
+- insert/delete/search vão para o shard que contém a chave (bisect);
+- insert_many agrupa as chaves por shard e envia todos os lotes antes de
+  esperar as respostas, então os workers inserem em paralelo;
+- range_search consulta só os shards que cortam [lo, hi], também em
+  paralelo; como os intervalos são disjuntos e ordenados, juntar as
+  respostas na ordem dos shards já dá o resultado ordenado;
+- split(i) divide um shard quente: as chaves >= corte são copiadas do
+  worker por varredura ordenada (BTree234.iter_from) para um worker novo,
+  e só saem do antigo depois que o novo confirma a inserção;
+- um erro num worker é levantado só depois de todas as respostas do lote
+  serem lidas, então nenhum pipe fica com respostas atrasadas.
+
+Exemplo de uso:
+    with ShardedBTree234(limites=[250, 500, 750]) as tree:  # 4 shards
+        tree.insert_many(range(1000))
+        tree.range_search(240, 260)
+        tree.split_hot()
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from bisect import bisect_right
+from itertools import islice
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from . import BTree234
+
+
+def _intervalo(tree: BTree234, lo: Any, hi: Any) -> List[Any]:
+    chaves = []
+    for chave in tree.iter_from(lo):
+        if hi is not None and chave > hi:
+            break
+        chaves.append(chave)
+    return chaves
+
+
+def _cortar(tree: BTree234, corte: Any) -> int:
+    """Remove as chaves >= corte; retorna quantas saíram."""
+    chaves = list(tree.iter_from(corte))
+    for chave in chaves:
+        tree.delete(chave)
+    return len(chaves)
+
+
+def _a_partir_de(tree: BTree234, posicao: int) -> List[Any]:
+    """Chaves da posição dada em diante, em ordem (a primeira é o corte).
+
+    Uma só varredura acha a mediana e copia a metade de cima; islice
+    descarta a metade de baixo sem um laço Python por chave.
+    """
+    chaves = tree.iter_from()
+    next(islice(chaves, posicao, posicao), None)
+    return list(chaves)
+
+
+def _buscar(tree: BTree234, k: Any) -> Any:
+    node, i = tree.search(k)
+    return None if node is None else node.keys[i]
+
+
+# operação -> função(árvore, *args) executada no worker
+_OPERACOES = {
+    'insert': BTree234.insert,
+    'insert_many': lambda tree, chaves: sum(tree.insert(k) for k in chaves),
+    'delete': BTree234.delete,
+    'search': _buscar,
+    'range': _intervalo,
+    'cortar': _cortar,
+    'a_partir_de': _a_partir_de,
+    'size': lambda tree: tree.size,
+}
+
+
+def _servir_shard(conexao) -> None:
+    """Laço do worker: recebe (op, args) e responde (ok, resultado ou exceção)."""
+    tree = BTree234()
+    while True:
+        op, args = conexao.recv()
+        if op is None:
+            break
+        try:
+            conexao.send((True, _OPERACOES[op](tree, *args)))
+        except Exception as erro:
+            conexao.send((False, erro))
+    conexao.close()
+
+
+class _Shard:
+    """Processo worker de um shard e a ponta local do seu pipe."""
+
+    def __init__(self, contexto) -> None:
+        self.conexao, remota = contexto.Pipe()
+        self.processo = contexto.Process(target=_servir_shard, args=(remota,), daemon=True)
+        self.processo.start()
+        remota.close()
+        # chaves no shard e chaves tocadas (inseridas, removidas, buscadas
+        # ou devolvidas) desde o último split: um lote pesa o seu tamanho
+        self.size = 0
+        self.carga = 0
+
+    def enviar(self, op: str, *args: Any) -> None:
+        self.conexao.send((op, args))
+
+    def receber(self) -> Any:
+        ok, resultado = self.conexao.recv()
+        if not ok:
+            raise resultado
+        return resultado
+
+    def chamar(self, op: str, *args: Any) -> Any:
+        self.enviar(op, *args)
+        return self.receber()
+
+    def ressincronizar(self) -> None:
+        """Relê o tamanho do worker (após um lote que falhou no meio)."""
+        self.size = self.chamar('size')
+
+    def encerrar(self) -> None:
+        try:
+            self.conexao.send((None, ()))
+        except (BrokenPipeError, OSError):
+            pass
+        self.processo.join()
+        self.conexao.close()
+
+
+def _respostas(shards: Sequence[_Shard]) -> List[Tuple[bool, Any]]:
+    """(ok, resultado ou exceção) de cada shard, lendo todas as respostas
+    antes que alguém levante um erro."""
+    return [shard.conexao.recv() for shard in shards]
+
+
+class ShardedBTree234:
+    """BTree234 particionada por intervalos de chaves entre processos.
+
+    limites: chaves de corte em ordem crescente; com m limites há m + 1
+    shards e o shard i guarda as chaves em [limites[i-1], limites[i]).
+
+    Métodos principais:
+      - insert(k) / delete(k) -> bool;  search(k) -> chave ou None
+      - insert_many(chaves) -> número de chaves novas (lotes em paralelo)
+      - range_search(lo, hi) -> chaves em [lo, hi] em ordem
+      - traverse() -> todas as chaves em ordem
+      - split(i, corte=None) / split_hot() -> divide um shard num worker novo
+      - close() (ou uso como gerenciador de contexto)
+
+    Atributos:
+      - size: número de chaves
+      - limites: cortes atuais entre os shards
+    """
+
+    def __init__(self, limites: Sequence[Any] = (), contexto=None) -> None:
+        limites = list(limites)
+        if any(a >= b for a, b in zip(limites, limites[1:])):
+            raise ValueError("limites devem ser estritamente crescentes")
+        self._contexto = contexto or multiprocessing.get_context()
+        self.limites = limites
+        self._shards: List[_Shard] = []
+        try:
+            for _ in range(len(limites) + 1):
+                self._shards.append(_Shard(self._contexto))
+        except BaseException:
+            self.close()
+            raise
+        self.size = 0
+
+    @property
+    def shards(self) -> int:
+        return len(self._shards)
+
+    def shard_sizes(self) -> List[int]:
+        return [shard.size for shard in self._shards]
+
+    def _indice(self, k: Any) -> int:
+        return bisect_right(self.limites, k)
+
+    def insert(self, k: Any) -> bool:
+        """Insere a chave k. Retorna True se inserida, False se duplicata."""
+        shard = self._shards[self._indice(k)]
+        shard.carga += 1
+        novo = shard.chamar('insert', k)
+        if novo:
+            shard.size += 1
+            self.size += 1
+        return novo
+
+    def insert_many(self, chaves: Iterable[Any]) -> int:
+        """Insere as chaves em lote; retorna quantas eram novas."""
+        lotes: List[List[Any]] = [[] for _ in self._shards]
+        for k in chaves:
+            lotes[self._indice(k)].append(k)
+        ativos = [(shard, lote) for shard, lote in zip(self._shards, lotes) if lote]
+        # envia todos os lotes antes de esperar: os workers inserem em paralelo
+        for shard, lote in ativos:
+            shard.carga += len(lote)
+            shard.enviar('insert_many', lote)
+        respostas = _respostas([shard for shard, _ in ativos])
+        novas = 0
+        erro = None
+        for (shard, _), (ok, resultado) in zip(ativos, respostas):
+            if ok:
+                shard.size += resultado
+                novas += resultado
+                continue
+            erro = erro or resultado
+            # parte do lote pode ter entrado antes do erro
+            antes = shard.size
+            shard.ressincronizar()
+            novas += shard.size - antes
+        self.size += novas
+        if erro is not None:
+            raise erro
+        return novas
+
+    def delete(self, k: Any) -> bool:
+        """Remove a chave k. Retorna True se removida, False caso contrário."""
+        shard = self._shards[self._indice(k)]
+        shard.carga += 1
+        removida = shard.chamar('delete', k)
+        if removida:
+            shard.size -= 1
+            self.size -= 1
+        return removida
+
+    def search(self, k: Any) -> Any:
+        """Retorna a chave armazenada igual a k, ou None se ausente."""
+        shard = self._shards[self._indice(k)]
+        shard.carga += 1
+        return shard.chamar('search', k)
+
+    def range_search(self, lo: Any, hi: Any) -> List[Any]:
+        """Chaves em [lo, hi], em ordem, consultando só os shards envolvidos."""
+        if hi < lo:
+            return []
+        return self._intervalo(self._shards[self._indice(lo):self._indice(hi) + 1], lo, hi)
+
+    def traverse(self) -> List[Any]:
+        """Retorna a lista ordenada de todas as chaves."""
+        return self._intervalo(self._shards, None, None)
+
+    def _intervalo(self, ativos: Sequence[_Shard], lo: Any, hi: Any) -> List[Any]:
+        for shard in ativos:
+            shard.enviar('range', lo, hi)
+        resultado: List[Any] = []
+        for shard, (ok, chaves) in zip(ativos, _respostas(ativos)):
+            if not ok:
+                raise chaves
+            shard.carga += len(chaves)
+            resultado.extend(chaves)
+        return resultado
+
+    def split(self, i: int, corte: Any = None) -> Any:
+        """Divide o shard i: as chaves >= corte passam para um worker novo.
+
+        Sem corte, usa a chave mediana do shard. Retorna o corte usado.
+        As chaves são copiadas para o worker novo e só então removidas do
+        antigo: se algo falhar antes, o shard i continua com todas elas.
+        """
+        shard = self._shards[i]
+        if corte is None:
+            if shard.size < 2:
+                raise ValueError(f"Shard {i} tem menos de duas chaves")
+            # a mediana sai da mesma varredura que copia a metade de cima
+            chaves = shard.chamar('a_partir_de', shard.size // 2)
+            corte = chaves[0]
+        else:
+            chaves = None
+        inferior = self.limites[i - 1] if i > 0 else None
+        superior = self.limites[i] if i < len(self.limites) else None
+        if (inferior is not None and corte <= inferior) or (superior is not None and corte >= superior):
+            raise ValueError(f"Corte {corte!r} fora do intervalo do shard {i}")
+
+        novo = _Shard(self._contexto)
+        try:
+            if chaves is None:
+                chaves = shard.chamar('range', corte, None)
+            # as chaves chegam em ordem, então o worker novo só faz inserções à direita
+            novo.size = novo.chamar('insert_many', chaves)
+            if novo.size != len(chaves):
+                raise RuntimeError(f"Worker novo confirmou {novo.size} de {len(chaves)} chaves")
+            removidas = shard.chamar('cortar', corte)
+        except BaseException:
+            novo.encerrar()
+            raise
+        shard.size -= removidas
+        shard.carga = 0
+        self._shards.insert(i + 1, novo)
+        self.limites.insert(i, corte)
+        return corte
+
+    def split_hot(self) -> int:
+        """Divide o shard que mais chaves tocou desde o último split.
+
+        Retorna o índice do shard dividido.
+        """
+        i = max(range(len(self._shards)), key=lambda j: (self._shards[j].carga, self._shards[j].size))
+        self.split(i)
+        for shard in self._shards:
+            shard.carga = 0
+        return i
+
+    def close(self) -> None:
+        """Encerra os workers (o conteúdo dos shards é descartado)."""
+        for shard in self._shards:
+            shard.encerrar()
+        self._shards = []
+
+    def __enter__(self) -> "ShardedBTree234":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,24 @@
+"""
+Benchmarks das árvores (executar a partir da raiz do repositório).
+
+Este pacote contém:
+- import_time.py: Tempo de importação dos núcleos das árvores (python -X importtime)
+- kd_dynamic.py: KDTree vs DynamicKDTree (Bentley–Saxe) sob carga mista
+- kd_approx.py: Recall vs. latência da busca aproximada da KDTree
+- kd_split_policy.py: Políticas de eixo de corte da KDTree em dados anisotrópicos
+- kd_join.py: Junção espacial por ponto vs travessia dupla (pares no raio e grafo k-NN)
+- kd_vs_vp.py: KDTree vs VPTree (vantage-point tree) para k = 2..64
+- kd_bbox.py: Nós visitados em consultas por caixa com e sem caixas envolventes
+- kd_index.py: Busca exata na KDTree com e sem o índice de coordenadas
+- kd_compact.py: Memória e latência da KDTree vs CompactKDTree (float32 e quantizada)
+- kd_window.py: Janela deslizante de tempo: remoção ponto a ponto vs expiração em lote
+- kd_parallel_build.py: Speedup da construção paralela da k-D tree por número de workers
+- sfc_vs_kd.py: Ingestão e consultas por caixa: KDTree vs índice Z-order/Hilbert na BTree234
+- rb_interval.py: Consultas de sobreposição: varredura completa vs IntervalTree (rubro-negra aumentada)
+- tree_convert.py: Conversão BTree234 <-> RedBlackTree: reinserção vs conversão estrutural
+- rb_array.py: RedBlackTree vs ArrayRedBlackTree: memória, GC, pickle e latência
+- serialize.py: Serialização das árvores: pickle vs dump/load em formato plano
+- server_load.py: Vazão e latência (p50/p99/p99.9) do servidor de árvores por clientes e profundidade de pipeline
+- sharded_insert.py: Vazão de inserção da BTree234 particionada entre processos por número de shards
+- buffered_insert.py: Ingestão na BTree234: _insert_non_full vs buffers de mensagens (Bε-tree) por capacidade
+"""
@@ -0,0 +1,94 @@
+"""
+Ingestão na BTree234: caminho atual (_insert_non_full) vs buffers de mensagens.
+
+Insere as mesmas chaves aleatórias numa BTree234 (descida com divisões a
+cada chave) e numa BufferedBTree234 para cada capacidade de buffer, com uma
+fração de remoções misturada. Mede a vazão da ingestão, o tempo do flush()
+final e o custo das buscas raras feitas antes do flush (que consultam os
+buffers na descida), e confere que o conteúdo final é o mesmo.
+
+Exemplo de uso:
+    python -m benchmarks.buffered_insert
+    python -m benchmarks.buffered_insert --chaves 1000000 --capacidades 16 64 256 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import random
+import sys
+from time import perf_counter
+
+_pacote = importlib.import_module('2-3-4')
+
+
+def _ingerir(tree, operacoes) -> float:
+    inicio = perf_counter()
+    insert, delete = tree.insert, tree.delete
+    for inserir, k in operacoes:
+        if inserir:
+            insert(k)
+        else:
+            delete(k)
+    return perf_counter() - inicio
+
+
+def _buscar(tree, consultas) -> float:
+    inicio = perf_counter()
+    for k in consultas:
+        tree.search(k)
+    return perf_counter() - inicio
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de ingestão com buffers de mensagens na BTree234")
+    parser.add_argument('--chaves', type=int, default=200000, help="operações de escrita")
+    parser.add_argument('--remocoes', type=float, default=0.1, help="fração de remoções")
+    parser.add_argument('--capacidades', type=int, nargs='+', default=[16, 64, 256, 1024])
+    parser.add_argument('--buscas', type=int, default=1000)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    universo = args.chaves * 4
+    inseridas = []
+    operacoes = []
+    for _ in range(args.chaves):
+        if inseridas and rng.random() < args.remocoes:
+            operacoes.append((False, inseridas[rng.randrange(len(inseridas))]))
+        else:
+            k = rng.randrange(universo)
+            inseridas.append(k)
+            operacoes.append((True, k))
+    consultas = [rng.randrange(universo) for _ in range(args.buscas)]
+
+    tree = _pacote.BTree234()
+    ingestao = _ingerir(tree, operacoes)
+    buscas = _buscar(tree, consultas)
+    esperado = tree.traverse()
+
+    print(f"{args.chaves} escritas ({args.remocoes:.0%} remoções), {args.buscas} buscas, "
+          f"{len(esperado)} chaves ao final")
+    print(f"{'árvore':>16} {'ingestão (s)':>12} {'escritas/s':>11} {'speedup':>8} "
+          f"{'flush (s)':>9} {'busca (us)':>10}")
+    print(f"{'BTree234':>16} {ingestao:>12.3f} {args.chaves / ingestao:>11.0f} {1.0:>8.2f} "
+          f"{'-':>9} {buscas / args.buscas * 1e6:>10.2f}")
+    for capacidade in args.capacidades:
+        buffered = _pacote.BufferedBTree234(capacidade)
+        segundos = _ingerir(buffered, operacoes)
+        buscas = _buscar(buffered, consultas)
+        inicio = perf_counter()
+        buffered.flush()
+        flush = perf_counter() - inicio
+        nome = f"buffer {capacidade}"
+        if buffered.traverse() != esperado:
+            print(f"{nome:>16} conteúdo diferente da BTree234")
+            return 1
+        print(f"{nome:>16} {segundos:>12.3f} {args.chaves / segundos:>11.0f} "
+              f"{ingestao / segundos:>8.2f} {flush:>9.3f} {buscas / args.buscas * 1e6:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
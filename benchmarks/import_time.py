@@ -0,0 +1,90 @@
+"""
+Guarda de tempo de importação dos núcleos das árvores.
+
+Cada alvo é importado em um interpretador novo com `python -X importtime`;
+o tempo cumulativo dos módulos do repositório é comparado com o limite e
+nenhuma dependência de visualização (graphviz) pode ser carregada.
+Retorna código de saída 1 se algum alvo violar a guarda, para uso em CI.
+
+Exemplo de uso:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --limite-ms 20 --repeticoes 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# nome do alvo -> (código executado, módulos do repositório medidos)
+ALVOS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'red_black_tree': (
+        "import red_black_tree.red_black_tree",
+        ('red_black_tree', 'red_black_tree.red_black_tree'),
+    ),
+    'k_d_tree': (
+        "import k_d_tree",
+        ('k_d_tree',),
+    ),
+    '2-3-4': (
+        "__import__('2-3-4.2-3-4')",
+        ('2-3-4', '2-3-4.2-3-4'),
+    ),
+}
+
+PROIBIDOS = ('graphviz',)
+
+
+def medir(codigo: str, modulos: Tuple[str, ...]) -> Tuple[int, List[str]]:
+    """Retorna (microssegundos cumulativos dos módulos, módulos proibidos vistos)."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    total = 0
+    proibidos = []
+    for linha in proc.stderr.splitlines():
+        if not linha.startswith('import time:') or '|' not in linha:
+            continue
+        _, cumulativo, nome = linha[len('import time:'):].split('|')
+        nome = nome.strip()
+        if nome in modulos:
+            total += int(cumulativo)
+        if nome.split('.')[0] in PROIBIDOS:
+            proibidos.append(nome)
+    return total, proibidos
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Guarda de tempo de importação")
+    parser.add_argument('--limite-ms', type=float, default=30.0,
+                        help="limite de tempo cumulativo por alvo (ms)")
+    parser.add_argument('--repeticoes', type=int, default=5,
+                        help="execuções por alvo (usa o menor tempo)")
+    args = parser.parse_args(argv)
+
+    falhou = False
+    for alvo, (codigo, modulos) in ALVOS.items():
+        medidas = [medir(codigo, modulos) for _ in range(args.repeticoes)]
+        melhor = min(us for us, _ in medidas) / 1000
+        proibidos = sorted({nome for _, vistos in medidas for nome in vistos})
+
+        status = 'OK'
+        if melhor > args.limite_ms:
+            status = f'LENTO (> {args.limite_ms:.1f} ms)'
+            falhou = True
+        if proibidos:
+            status = f'IMPORTA {", ".join(proibidos)}'
+            falhou = True
+        print(f"{alvo:<16} {melhor:8.2f} ms   {status}")
+
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
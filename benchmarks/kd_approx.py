@@ -0,0 +1,65 @@
+"""
+Recall vs. latência da busca aproximada (approximate_nearest) da KDTree.
+
+Para cada combinação de eps e max_checks, executa consultas aleatórias e
+compara com a busca exata (nearest), reportando recall, nós visitados e
+latências p50/p99.
+
+Exemplo de uso:
+    python -m benchmarks.kd_approx
+    python -m benchmarks.kd_approx --pontos 50000 -k 8 --vizinhos 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from time import perf_counter
+
+from k_d_tree import KDTree
+
+EPS = (0.0, 0.1, 0.5, 1.0)
+MAX_CHECKS = (None, 200, 50)
+
+
+def percentil(valores, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da busca aproximada da KDTree")
+    parser.add_argument('--pontos', type=int, default=20000)
+    parser.add_argument('-k', type=int, default=4)
+    parser.add_argument('--vizinhos', type=int, default=1)
+    parser.add_argument('--consultas', type=int, default=500)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    tree = KDTree.build([[rng.random() for _ in range(args.k)] for _ in range(args.pontos)], args.k)
+    alvos = [[rng.random() for _ in range(args.k)] for _ in range(args.consultas)]
+    exatos = [{tuple(p) for _, p in tree.nearest(alvo, args.vizinhos)} for alvo in alvos]
+
+    print(f"{args.pontos} pontos, k={args.k}, {args.vizinhos} vizinho(s), {args.consultas} consultas")
+    print(f"{'eps':>5} {'max_checks':>10} {'recall':>8} {'visitados':>10} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for eps in EPS:
+        for max_checks in MAX_CHECKS:
+            acertos = 0
+            visitados = 0
+            latencias = []
+            for alvo, exato in zip(alvos, exatos):
+                inicio = perf_counter()
+                resultado, nos = tree.approximate_nearest(alvo, args.vizinhos, eps, max_checks)
+                latencias.append((perf_counter() - inicio) * 1000)
+                visitados += nos
+                acertos += len(exato & {tuple(p) for _, p in resultado})
+            recall = acertos / (len(alvos) * args.vizinhos)
+            print(f"{eps:>5} {str(max_checks):>10} {recall:>8.3f} {visitados / len(alvos):>10.1f} "
+                  f"{percentil(latencias, 0.5):>9.3f} {percentil(latencias, 0.99):>9.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Poda por caixas envolventes na KDTree: nós visitados em consultas por caixa.
+
+Compara a travessia que poda apenas pelo plano de corte de cada nó (como a
+KDTree fazia antes de guardar caixas) com range_search e range_count, que
+usam a caixa envolvente e a contagem de cada subárvore. O número de nós
+visitados vem do contador 'nodes_visited' de stats().
+
+Exemplo de uso:
+    python -m benchmarks.kd_bbox
+    python -m benchmarks.kd_bbox --pontos 100000 -k 3 --lado 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from time import perf_counter
+
+from k_d_tree import KDTree
+
+
+def contar_por_plano(tree, low, high):
+    """Contagem podando só pelo plano de corte. Retorna (total, visitados)."""
+    total = visitados = 0
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        visitados += 1
+        point = node.point
+        if not node.deleted and all(lo <= c <= hi for lo, c, hi in zip(low, point, high)):
+            total += 1
+        axis = node.axis()
+        if low[axis] < point[axis]:
+            stack.append(node.left)
+        if high[axis] >= point[axis]:
+            stack.append(node.right)
+    return total, visitados
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da poda por caixas envolventes")
+    parser.add_argument('--pontos', type=int, default=20000)
+    parser.add_argument('-k', type=int, default=2)
+    parser.add_argument('--lado', type=float, default=0.1,
+                        help="lado das caixas de consulta (no cubo unitário)")
+    parser.add_argument('--consultas', type=int, default=300)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    tree = KDTree.build([[rng.random() for _ in range(args.k)] for _ in range(args.pontos)], args.k)
+    caixas = []
+    for _ in range(args.consultas):
+        low = [rng.random() * (1 - args.lado) for _ in range(args.k)]
+        caixas.append((low, [c + args.lado for c in low]))
+
+    print(f"{args.pontos} pontos, k={args.k}, lado={args.lado}, {args.consultas} consultas")
+    print(f"{'consulta':<14} {'visitados':>10} {'ms/consulta':>12}")
+
+    inicio = perf_counter()
+    visitados = sum(contar_por_plano(tree, low, high)[1] for low, high in caixas)
+    ms = (perf_counter() - inicio) * 1000 / len(caixas)
+    print(f"{'plano de corte':<14} {visitados / len(caixas):>10.1f} {ms:>12.3f}")
+
+    for nome in ('range_search', 'range_count'):
+        consulta = getattr(tree, nome)
+        tree.enable_stats()
+        inicio = perf_counter()
+        for low, high in caixas:
+            consulta(low, high)
+        ms = (perf_counter() - inicio) * 1000 / len(caixas)
+        visitados = tree.stats()['nodes_visited']
+        tree.disable_stats()
+        print(f"{nome:<14} {visitados / len(caixas):>10.1f} {ms:>12.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
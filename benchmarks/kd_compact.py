@@ -0,0 +1,76 @@
+"""
+Memória e latência da KDTree vs CompactKDTree (float64, float32, int32, int16).
+
+A memória de cada estrutura é medida com tracemalloc durante a construção
+(a lista de pontos de entrada não entra na conta). Também são reportados a
+latência média do vizinho mais próximo e o maior erro de coordenada
+introduzido pelo armazenamento compacto.
+
+Exemplo de uso:
+    python -m benchmarks.kd_compact
+    python -m benchmarks.kd_compact --pontos 500000 --consultas 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+
+from k_d_tree import CompactKDTree, KDTree
+from k_d_tree.compact_kd_tree import STORAGE
+
+
+def construir_medindo(construtor):
+    """Retorna (estrutura, bytes alocados que continuam vivos)."""
+    gc.collect()
+    tracemalloc.start()
+    estrutura = construtor()
+    gc.collect()
+    usado, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return estrutura, usado
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de armazenamento compacto da k-D tree")
+    parser.add_argument('--pontos', type=int, default=100000)
+    parser.add_argument('--consultas', type=int, default=500)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    # coordenadas GPS (latitude, longitude) de uma região metropolitana
+    pontos = [[-23.9 + rng.random() * 0.6, -46.9 + rng.random() * 0.6] for _ in range(args.pontos)]
+    alvos = [[-23.9 + rng.random() * 0.6, -46.9 + rng.random() * 0.6] for _ in range(args.consultas)]
+
+    estruturas = [('KDTree', lambda: KDTree.build(pontos, 2))]
+    for storage in STORAGE:
+        estruturas.append((f"Compact {storage}",
+                           lambda storage=storage: CompactKDTree.build(pontos, 2, storage=storage)))
+
+    print(f"{args.pontos} pontos GPS, {args.consultas} consultas")
+    print(f"{'estrutura':<17} {'bytes/ponto':>11} {'NN (ms)':>9} {'erro máx':>10}")
+    for nome, construtor in estruturas:
+        tree, usado = construir_medindo(construtor)
+
+        inicio = perf_counter()
+        for alvo in alvos:
+            tree.nearest(alvo)
+        ms = (perf_counter() - inicio) * 1000 / len(alvos)
+
+        erro = 0.0
+        for ponto in pontos[:1000]:
+            _, achado = tree.nearest(ponto)[0]
+            erro = max(erro, max(abs(a - b) for a, b in zip(ponto, achado)))
+
+        print(f"{nome:<17} {usado / args.pontos:>11.1f} {ms:>9.3f} {erro:>10.2e}")
+        del tree
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
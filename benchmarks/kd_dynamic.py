@@ -0,0 +1,59 @@
+"""
+KDTree (reconstrução de subárvores desbalanceadas) vs DynamicKDTree (Bentley–Saxe)
+sob carga mista de inserções e consultas.
+
+Cada rodada insere pontos aleatórios e intercala consultas de vizinho mais
+próximo e de busca por intervalo, medindo a vazão de cada estrutura.
+
+Exemplo de uso:
+    python -m benchmarks.kd_dynamic
+    python -m benchmarks.kd_dynamic --pontos 5000 --consultas-por-insercao 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from time import perf_counter
+
+from k_d_tree import KDTree
+from k_d_tree.dynamic_kd_tree import DynamicKDTree
+
+
+def carga_mista(tree, pontos, consultas, k: int, rng: random.Random) -> float:
+    """Executa a carga e retorna o tempo total em segundos."""
+    inicio = perf_counter()
+    for ponto in pontos:
+        tree.insert(ponto)
+        for _ in range(consultas):
+            alvo = [rng.random() for _ in range(k)]
+            if rng.random() < 0.5:
+                tree.nearest(alvo, 5)
+            else:
+                tree.range_search([c - 0.05 for c in alvo], [c + 0.05 for c in alvo])
+    return perf_counter() - inicio
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark KDTree vs DynamicKDTree")
+    parser.add_argument('--pontos', type=int, default=2000)
+    parser.add_argument('-k', type=int, default=2)
+    parser.add_argument('--consultas-por-insercao', type=int, default=1)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    pontos = [[rng.random() for _ in range(args.k)] for _ in range(args.pontos)]
+    total_ops = args.pontos * (1 + args.consultas_por_insercao)
+
+    print(f"{args.pontos} inserções, {args.consultas_por_insercao} consulta(s) por inserção, k={args.k}")
+    for nome, tree in (('KDTree', KDTree(args.k)), ('DynamicKDTree', DynamicKDTree(args.k))):
+        segundos = carga_mista(tree, pontos, args.consultas_por_insercao, args.k,
+                               random.Random(args.semente + 1))
+        print(f"{nome:<14} {segundos:8.3f}s   {total_ops / segundos:12,.0f} ops/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Busca exata na KDTree com e sem o índice tuple(ponto) -> nó.
+
+Constrói a mesma árvore com index=False e index=True e mede a vazão de
+get/search para pontos presentes e ausentes.
+
+Exemplo de uso:
+    python -m benchmarks.kd_index
+    python -m benchmarks.kd_index --pontos 200000 -k 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from time import perf_counter
+
+from k_d_tree import KDTree
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do índice exato da KDTree")
+    parser.add_argument('--pontos', type=int, default=50000)
+    parser.add_argument('-k', type=int, default=2)
+    parser.add_argument('--consultas', type=int, default=50000)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    pontos = [[rng.random() for _ in range(args.k)] for _ in range(args.pontos)]
+    ids = list(range(args.pontos))
+    # metade das consultas acerta, metade procura pontos ausentes
+    consultas = [rng.choice(pontos) if i % 2 else [rng.random() for _ in range(args.k)]
+                 for i in range(args.consultas)]
+
+    print(f"{args.pontos} pontos, k={args.k}, {args.consultas} consultas (50% ausentes)")
+    for index in (False, True):
+        tree = KDTree.build(pontos, args.k, values=ids, index=index)
+        for nome in ('search', 'get'):
+            consulta = getattr(tree, nome)
+            inicio = perf_counter()
+            for ponto in consultas:
+                consulta(ponto)
+            segundos = perf_counter() - inicio
+            print(f"index={str(index):<5} {nome:<6} {args.consultas / segundos:12,.0f} ops/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
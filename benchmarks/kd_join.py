@@ -0,0 +1,81 @@
+"""
+Junção espacial entre dois conjuntos de pontos: uma consulta por ponto vs
+travessia dupla (pairs_within / all_knn).
+
+"Por ponto" faz, para cada ponto de A, uma range_search na caixa de lado 2r
+em B e filtra pela distância; o k-NN por ponto chama nearest(n + 1) para
+cada ponto. A travessia dupla visita pares de subárvores e poda pelas
+caixas envolventes.
+
+Exemplo de uso:
+    python -m benchmarks.kd_join
+    python -m benchmarks.kd_join --pontos-a 20000 --pontos-b 5000 --raio 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from time import perf_counter
+
+from k_d_tree import KDTree, all_knn, pairs_within
+
+
+def pares_por_ponto(tree_a, tree_b, r: float) -> int:
+    total = 0
+    r2 = r * r
+    for ponto in tree_a.points():
+        low = [c - r for c in ponto]
+        high = [c + r for c in ponto]
+        for outro in tree_b.range_search(low, high):
+            if sum((x - y) * (x - y) for x, y in zip(ponto, outro)) <= r2:
+                total += 1
+    return total
+
+
+def knn_por_ponto(tree, n: int) -> int:
+    total = 0
+    for ponto in tree.points():
+        total += len([p for _, p in tree.nearest(ponto, n + 1) if p != ponto][:n])
+    return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da junção espacial entre KDTrees")
+    parser.add_argument('--pontos-a', type=int, default=10000)
+    parser.add_argument('--pontos-b', type=int, default=10000)
+    parser.add_argument('-k', type=int, default=2)
+    parser.add_argument('--raio', type=float, default=0.01)
+    parser.add_argument('--vizinhos', type=int, default=5)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    tree_a = KDTree.build([[rng.random() for _ in range(args.k)] for _ in range(args.pontos_a)], args.k)
+    tree_b = KDTree.build([[rng.random() for _ in range(args.k)] for _ in range(args.pontos_b)], args.k)
+
+    print(f"A={args.pontos_a}, B={args.pontos_b}, k={args.k}, raio={args.raio}, vizinhos={args.vizinhos}")
+
+    inicio = perf_counter()
+    esperado = pares_por_ponto(tree_a, tree_b, args.raio)
+    por_ponto = perf_counter() - inicio
+    inicio = perf_counter()
+    obtido = sum(1 for _ in pairs_within(tree_a, tree_b, args.raio))
+    dupla = perf_counter() - inicio
+    print(f"pares no raio  por ponto {por_ponto:8.3f}s   dupla {dupla:8.3f}s   "
+          f"({obtido} pares{'' if obtido == esperado else f', esperado {esperado}'})")
+
+    inicio = perf_counter()
+    esperado = knn_por_ponto(tree_a, args.vizinhos)
+    por_ponto = perf_counter() - inicio
+    inicio = perf_counter()
+    obtido = sum(len(v) for v in all_knn(tree_a, args.vizinhos).values())
+    dupla = perf_counter() - inicio
+    print(f"grafo k-NN     por ponto {por_ponto:8.3f}s   dupla {dupla:8.3f}s   "
+          f"({obtido} arestas{'' if obtido == esperado else f', esperado {esperado}'})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
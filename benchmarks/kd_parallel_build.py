@@ -0,0 +1,58 @@
+"""
+Speedup da construção paralela (k_d_tree.parallel_build) por número de workers.
+
+Compara a construção sequencial da CompactKDTree com build_parallel para
+cada quantidade de processos e confere que o layout gerado é idêntico.
+O speedup é limitado pelos níveis resolvidos no coordenador e pelos
+núcleos disponíveis (os.cpu_count()).
+
+Exemplo de uso:
+    python -m benchmarks.kd_parallel_build
+    python -m benchmarks.kd_parallel_build --pontos 2000000 --workers 1 2 4 8 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+from time import perf_counter
+
+from k_d_tree import CompactKDTree
+from k_d_tree.parallel_build import build_parallel
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da construção paralela da k-D tree")
+    parser.add_argument('--pontos', type=int, default=200000)
+    parser.add_argument('-k', type=int, default=2)
+    parser.add_argument('--storage', default='float64')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    pontos = [[rng.random() for _ in range(args.k)] for _ in range(args.pontos)]
+
+    inicio = perf_counter()
+    referencia = CompactKDTree.build(pontos, args.k, storage=args.storage)
+    sequencial = perf_counter() - inicio
+
+    print(f"{args.pontos} pontos, k={args.k}, storage={args.storage}, "
+          f"{os.cpu_count()} núcleo(s) disponível(is)")
+    print(f"{'workers':>7} {'tempo (s)':>10} {'speedup':>8}")
+    print(f"{'seq':>7} {sequencial:>10.3f} {1.0:>8.2f}")
+    for workers in args.workers:
+        inicio = perf_counter()
+        tree = build_parallel(pontos, args.k, workers=workers, storage=args.storage)
+        segundos = perf_counter() - inicio
+        if tree.coords != referencia.coords or tree.axes != referencia.axes:
+            print(f"{workers:>7} layout diferente da construção sequencial")
+            return 1
+        print(f"{workers:>7} {segundos:>10.3f} {sequencial / segundos:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Políticas de escolha do eixo de corte da KDTree em dados anisotrópicos.
+
+Os pontos têm uma dimensão com extensão muito maior que as demais (fator
+configurável). Para cada política (round_robin, max_spread, max_variance,
+sliding_midpoint) mede o tempo de construção em lote, os nós visitados por
+consulta de vizinho mais próximo exata e o tempo das buscas por intervalo.
+
+Exemplo de uso:
+    python -m benchmarks.kd_split_policy
+    python -m benchmarks.kd_split_policy --pontos 50000 -k 4 --fator 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from time import perf_counter
+
+from k_d_tree import KDTree
+from k_d_tree.k_d_tree import SPLIT_POLICIES
+
+
+def gerar_pontos(n: int, k: int, fator: float, rng: random.Random):
+    # a dimensão 0 tem extensão `fator` vezes maior que as outras
+    return [[rng.random() * (fator if eixo == 0 else 1.0) for eixo in range(k)]
+            for _ in range(n)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark das políticas de corte da KDTree")
+    parser.add_argument('--pontos', type=int, default=20000)
+    parser.add_argument('-k', type=int, default=3)
+    parser.add_argument('--fator', type=float, default=100.0,
+                        help="razão entre a extensão da dimensão 0 e a das demais")
+    parser.add_argument('--consultas', type=int, default=500)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    pontos = gerar_pontos(args.pontos, args.k, args.fator, rng)
+    alvos = gerar_pontos(args.consultas, args.k, args.fator, rng)
+    # caixas com ~1% da extensão de cada dimensão
+    lado = [0.01 * (args.fator if eixo == 0 else 1.0) for eixo in range(args.k)]
+    caixas = [([c - l for c, l in zip(alvo, lado)], [c + l for c, l in zip(alvo, lado)])
+              for alvo in alvos]
+
+    print(f"{args.pontos} pontos, k={args.k}, fator={args.fator:g}, {args.consultas} consultas")
+    print(f"{'política':<17} {'build (s)':>9} {'visitados/NN':>12} {'range (ms)':>10}")
+    for politica in SPLIT_POLICIES:
+        inicio = perf_counter()
+        tree = KDTree.build(pontos, args.k, split_policy=politica)
+        construcao = perf_counter() - inicio
+
+        visitados = 0
+        for alvo in alvos:
+            _, nos = tree.approximate_nearest(alvo)
+            visitados += nos
+
+        inicio = perf_counter()
+        for low, high in caixas:
+            tree.range_search(low, high)
+        intervalo = (perf_counter() - inicio) * 1000 / len(caixas)
+
+        print(f"{politica:<17} {construcao:>9.3f} {visitados / len(alvos):>12.1f} {intervalo:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
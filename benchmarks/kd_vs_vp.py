@@ -0,0 +1,91 @@
+"""
+KDTree vs VPTree (vantage-point tree) em função da dimensão k.
+
+Para cada k, constrói as duas árvores em lote com os mesmos pontos e mede o
+tempo de construção e a latência média da busca dos n vizinhos mais
+próximos, comparando com a força bruta (percorrer todos os pontos).
+
+Distribuições:
+- uniforme: pontos uniformes no cubo unitário (pior caso para ambas)
+- latente: pontos de baixa dimensão intrínseca (--dim-latente) projetados
+  linearmente em k dimensões com ruído, como embeddings reais
+
+Exemplo de uso:
+    python -m benchmarks.kd_vs_vp
+    python -m benchmarks.kd_vs_vp --pontos 20000 --dimensoes 8 32 64 --distribuicao uniforme
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+import sys
+from math import dist
+from time import perf_counter
+
+from k_d_tree import KDTree, VPTree
+
+DIMENSOES = (2, 4, 8, 16, 32, 64)
+
+
+def gerar_pontos(n: int, k: int, distribuicao: str, dim_latente: int, rng: random.Random):
+    if distribuicao == 'uniforme':
+        return [[rng.random() for _ in range(k)] for _ in range(n)]
+    base = [[rng.gauss(0, 1) for _ in range(k)] for _ in range(dim_latente)]
+    pontos = []
+    for _ in range(n):
+        latente = [rng.gauss(0, 1) for _ in range(dim_latente)]
+        pontos.append([sum(z * b[i] for z, b in zip(latente, base)) + rng.gauss(0, 0.05)
+                       for i in range(k)])
+    return pontos
+
+
+def medir(funcao, alvos) -> float:
+    """Latência média por consulta, em milissegundos."""
+    inicio = perf_counter()
+    for alvo in alvos:
+        funcao(alvo)
+    return (perf_counter() - inicio) * 1000 / len(alvos)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark KDTree vs VPTree por dimensão")
+    parser.add_argument('--pontos', type=int, default=5000)
+    parser.add_argument('--dimensoes', type=int, nargs='+', default=list(DIMENSOES))
+    parser.add_argument('--distribuicao', choices=('uniforme', 'latente'), default='latente')
+    parser.add_argument('--dim-latente', type=int, default=4)
+    parser.add_argument('--vizinhos', type=int, default=10)
+    parser.add_argument('--consultas', type=int, default=100)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{args.pontos} pontos ({args.distribuicao}), {args.vizinhos} vizinhos, "
+          f"{args.consultas} consultas")
+    print(f"{'k':>3} {'build KD (s)':>12} {'build VP (s)':>12} "
+          f"{'KD (ms)':>9} {'VP (ms)':>9} {'bruta (ms)':>10}")
+    for k in args.dimensoes:
+        rng = random.Random(args.semente)
+        pontos = gerar_pontos(args.pontos + args.consultas, k, args.distribuicao,
+                              args.dim_latente, rng)
+        pontos, alvos = pontos[:args.pontos], pontos[args.pontos:]
+
+        inicio = perf_counter()
+        kd = KDTree.build(pontos, k)
+        build_kd = perf_counter() - inicio
+        inicio = perf_counter()
+        vp = VPTree.build(pontos, k)
+        build_vp = perf_counter() - inicio
+
+        n = args.vizinhos
+        ms_kd = medir(lambda alvo: kd.nearest(alvo, n), alvos)
+        ms_vp = medir(lambda alvo: vp.nearest(alvo, n), alvos)
+        ms_bruta = medir(lambda alvo: heapq.nsmallest(n, pontos, key=lambda p: dist(alvo, p)), alvos)
+
+        print(f"{k:>3} {build_kd:>12.3f} {build_vp:>12.3f} "
+              f"{ms_kd:>9.3f} {ms_vp:>9.3f} {ms_bruta:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Janela deslizante de posições: KDTree com remoção ponto a ponto vs
+WindowedKDTree com expiração por baldes de tempo.
+
+Simula veículos enviando posições a cada tick; só as posições dos últimos
+--horizonte ticks interessam. Na KDTree cada posição vencida é removida com
+delete (que reequilibra a árvore inteira); na WindowedKDTree os pontos
+expiram em lote. Consultas de vizinho mais próximo são intercaladas.
+
+Exemplo de uso:
+    python -m benchmarks.kd_window
+    python -m benchmarks.kd_window --veiculos 200 --ticks 100 --horizonte 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from collections import deque
+from time import perf_counter
+
+from k_d_tree import KDTree, WindowedKDTree
+
+
+def gerar_eventos(veiculos: int, ticks: int, rng: random.Random):
+    posicoes = [[rng.random(), rng.random()] for _ in range(veiculos)]
+    for tick in range(ticks):
+        for pos in posicoes:
+            pos[0] = min(1.0, max(0.0, pos[0] + rng.gauss(0, 0.01)))
+            pos[1] = min(1.0, max(0.0, pos[1] + rng.gauss(0, 0.01)))
+            yield tick, list(pos)
+
+
+def com_kdtree(eventos, horizonte: int, consultas: int, rng: random.Random) -> float:
+    tree = KDTree(2)
+    fila = deque()
+    inicio = perf_counter()
+    tick_atual = None
+    for tick, ponto in eventos:
+        if tick != tick_atual:
+            tick_atual = tick
+            while fila and fila[0][0] < tick - horizonte:
+                tree.delete(fila.popleft()[1])
+            for _ in range(consultas):
+                tree.nearest([rng.random(), rng.random()], 5)
+        tree.insert(ponto)
+        fila.append((tick, ponto))
+    return perf_counter() - inicio
+
+
+def com_janela(eventos, horizonte: int, consultas: int, rng: random.Random) -> float:
+    tree = WindowedKDTree(2, horizonte, clock=None)
+    inicio = perf_counter()
+    tick_atual = None
+    for tick, ponto in eventos:
+        if tick != tick_atual:
+            tick_atual = tick
+            tree.expire(tick)
+            for _ in range(consultas):
+                tree.nearest([rng.random(), rng.random()], 5)
+        tree.insert(ponto, timestamp=tick)
+    return perf_counter() - inicio
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da janela deslizante de tempo")
+    parser.add_argument('--veiculos', type=int, default=50)
+    parser.add_argument('--ticks', type=int, default=60)
+    parser.add_argument('--horizonte', type=int, default=10)
+    parser.add_argument('--consultas-por-tick', type=int, default=20)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    eventos = list(gerar_eventos(args.veiculos, args.ticks, random.Random(args.semente)))
+    print(f"{len(eventos)} posições ({args.veiculos} veículos x {args.ticks} ticks), "
+          f"horizonte {args.horizonte} ticks, {args.consultas_por_tick} consultas/tick")
+    for nome, funcao in (('KDTree', com_kdtree), ('WindowedKDTree', com_janela)):
+        segundos = funcao(eventos, args.horizonte, args.consultas_por_tick,
+                          random.Random(args.semente + 1))
+        print(f"{nome:<15} {segundos:8.3f}s   {len(eventos) / segundos:12,.0f} posições/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+RedBlackTree (um objeto por nó) vs ArrayRedBlackTree (vetores paralelos).
+
+Para as mesmas chaves, mede a memória por chave (tracemalloc), o tempo de
+inserção e de remoção, os objetos acompanhados pelo coletor de lixo e a
+duração de uma coleta completa, e o tempo de pickle/unpickle da árvore.
+A memória é medida numa construção separada, porque o tracemalloc
+distorce o tempo de inserção. A árvore baseada em objetos pode estourar o
+limite de recursão do pickle (cadeias de parent/left/right); nesse caso o
+tempo não é reportado.
+
+Exemplo de uso:
+    python -m benchmarks.rb_array
+    python -m benchmarks.rb_array --chaves 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import pickle
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+
+from red_black_tree.array_rb_tree import ArrayRedBlackTree
+from red_black_tree.red_black_tree import RedBlackTree
+
+
+def inserir(classe, chaves):
+    tree = classe()
+    for chave in chaves:
+        tree.insert(chave)
+    return tree
+
+
+def memoria(classe, chaves) -> int:
+    """Bytes alocados que continuam vivos após construir a árvore."""
+    gc.collect()
+    tracemalloc.start()
+    tree = inserir(classe, chaves)
+    gc.collect()
+    usado, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return usado
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark RedBlackTree vs ArrayRedBlackTree")
+    parser.add_argument('--chaves', type=int, default=200000)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    chaves = rng.sample(range(args.chaves * 10), args.chaves)
+    remover = chaves[::2]
+
+    print(f"{args.chaves} chaves")
+    print(f"{'estrutura':<18} {'bytes/chave':>11} {'inserção':>9} {'objetos gc':>11} "
+          f"{'gc.collect':>10} {'pickle':>8} {'remoção':>8}")
+    for classe in (RedBlackTree, ArrayRedBlackTree):
+        # chaves pequenas são compartilhadas: a memória medida é só a da árvore
+        usado = memoria(classe, chaves)
+
+        gc.collect()
+        objetos_antes = len(gc.get_objects())
+        inicio = perf_counter()
+        tree = inserir(classe, chaves)
+        t_insercao = perf_counter() - inicio
+        objetos = len(gc.get_objects()) - objetos_antes
+
+        inicio = perf_counter()
+        gc.collect()
+        t_gc = perf_counter() - inicio
+
+        try:
+            inicio = perf_counter()
+            pickle.loads(pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL))
+            t_pickle = f"{perf_counter() - inicio:7.3f}s"
+        except RecursionError:
+            t_pickle = "recursão"
+
+        inicio = perf_counter()
+        for chave in remover:
+            tree.delete(chave)
+        t_remocao = perf_counter() - inicio
+
+        print(f"{classe.__name__:<18} {usado / args.chaves:>11.1f} {t_insercao:>8.3f}s {objetos:>11,} "
+              f"{t_gc:>9.3f}s {t_pickle:>8} {t_remocao:>7.3f}s")
+        del tree
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Consultas de sobreposição: varredura completa vs IntervalTree.
+
+Gera intervalos de tempo (reservas) e responde "quais intervalos cortam
+[a, b]" e "quais contêm x" percorrendo todos os intervalos e com a
+IntervalTree (RedBlackTree com o maior extremo por subárvore), conferindo
+que os resultados coincidem.
+
+Exemplo de uso:
+    python -m benchmarks.rb_interval
+    python -m benchmarks.rb_interval --intervalos 200000 --duracao 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from time import perf_counter
+
+from red_black_tree.interval_tree import IntervalTree
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de consultas por sobreposição de intervalos")
+    parser.add_argument('--intervalos', type=int, default=50000)
+    parser.add_argument('--horizonte', type=float, default=1_000_000.0,
+                        help='extensão da linha do tempo')
+    parser.add_argument('--duracao', type=float, default=100.0,
+                        help='duração máxima de cada intervalo')
+    parser.add_argument('--consultas', type=int, default=500)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    intervalos = []
+    for _ in range(args.intervalos):
+        inicio = rng.uniform(0, args.horizonte)
+        intervalos.append((inicio, inicio + rng.uniform(0, args.duracao)))
+    janelas = []
+    for _ in range(args.consultas):
+        a = rng.uniform(0, args.horizonte)
+        janelas.append((a, a + rng.uniform(0, args.duracao)))
+
+    inicio = perf_counter()
+    tree = IntervalTree()
+    for intervalo in intervalos:
+        tree.insert(intervalo)
+    construcao = perf_counter() - inicio
+
+    print(f"{args.intervalos} intervalos (construção da árvore: {construcao:.3f}s), "
+          f"{args.consultas} consultas")
+    for nome, varredura, arvore in (
+        ('sobreposição', lambda a, b: [iv for iv in intervalos if iv[0] <= b and iv[1] >= a],
+         lambda a, b: list(tree.overlapping(a, b))),
+        ('stab', lambda a, b: [iv for iv in intervalos if iv[0] <= a <= iv[1]],
+         lambda a, b: list(tree.stab(a))),
+    ):
+        tempos = []
+        resultados = []
+        for consulta in (varredura, arvore):
+            inicio = perf_counter()
+            resultados.append([sorted(set(consulta(a, b))) for a, b in janelas])
+            tempos.append(perf_counter() - inicio)
+        if resultados[0] != resultados[1]:
+            print(f"{nome}: resultados diferentes entre varredura e árvore")
+            return 1
+        print(f"{nome:<13} varredura {tempos[0]:8.3f}s   árvore {tempos[1]:8.3f}s   "
+              f"({tempos[0] / tempos[1]:.0f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
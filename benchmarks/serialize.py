@@ -0,0 +1,90 @@
+"""
+Serialização das árvores: pickle vs dump/load (formato plano em pré-ordem).
+
+Para RedBlackTree, BTree234 e KDTree com as mesmas chaves, mede o tempo de
+gravação e de leitura num arquivo temporário e o tamanho gerado. O pickle
+percorre os nós recursivamente e pode estourar o limite de recursão; nesse
+caso a linha mostra "recursão".
+
+Exemplo de uso:
+    python -m benchmarks.serialize
+    python -m benchmarks.serialize --chaves 10000000 --arvores rb 234
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import pickle
+import random
+import sys
+import tempfile
+from time import perf_counter
+
+from k_d_tree import KDTree
+from red_black_tree.red_black_tree import RedBlackTree
+
+
+def construir(nome: str, chaves, k: int):
+    if nome == 'rb':
+        tree = RedBlackTree()
+        for chave in chaves:
+            tree.insert(chave)
+        return tree
+    if nome == '234':
+        tree = importlib.import_module('2-3-4').BTree234()
+        for chave in chaves:
+            tree.insert(chave)
+        return tree
+    rng = random.Random(len(chaves))
+    return KDTree.build([[rng.random() for _ in range(k)] for _ in chaves], k)
+
+
+def medir(gravar, ler):
+    """Retorna (segundos gravando, segundos lendo, bytes) ou None se recursão."""
+    with tempfile.TemporaryFile() as fp:
+        try:
+            inicio = perf_counter()
+            gravar(fp)
+            t_gravar = perf_counter() - inicio
+            tamanho = fp.tell()
+            fp.seek(0)
+            inicio = perf_counter()
+            ler(fp)
+            t_ler = perf_counter() - inicio
+        except RecursionError:
+            return None
+    return t_gravar, t_ler, tamanho
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de serialização das árvores")
+    parser.add_argument('--chaves', type=int, default=200000)
+    parser.add_argument('-k', type=int, default=2)
+    parser.add_argument('--arvores', nargs='+', default=['rb', '234', 'kd'],
+                        choices=['rb', '234', 'kd'])
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    chaves = random.Random(args.semente).sample(range(args.chaves * 10), args.chaves)
+    print(f"{args.chaves} chaves")
+    print(f"{'árvore':<7} {'formato':<10} {'gravação':>9} {'leitura':>9} {'MB':>8}")
+    for nome in args.arvores:
+        tree = construir(nome, chaves, args.k)
+        classe = type(tree)
+        for formato, gravar, ler in (
+            ('pickle', lambda fp: pickle.dump(tree, fp, protocol=pickle.HIGHEST_PROTOCOL), pickle.load),
+            ('dump/load', tree.dump, classe.load),
+        ):
+            resultado = medir(gravar, ler)
+            if resultado is None:
+                print(f"{nome:<7} {formato:<10} {'recursão':>9}")
+                continue
+            t_gravar, t_ler, tamanho = resultado
+            print(f"{nome:<7} {formato:<10} {t_gravar:>8.3f}s {t_ler:>8.3f}s {tamanho / 2 ** 20:>8.1f}")
+        del tree
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
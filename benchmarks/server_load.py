@@ -0,0 +1,120 @@
+"""
+Carga no servidor de árvores (tools.tree_server): vazão e latência.
+
+Sobe o servidor num subprocesso (socket Unix), cria uma árvore e abre C
+clientes concorrentes. Cada cliente mantém até P requisições em voo
+(profundidade do pipeline) e mede a latência de cada uma, do envio à
+resposta. Com P = 1 cada requisição paga uma ida e volta inteira; com P
+maior as requisições se acumulam no servidor, são drenadas na mesma volta
+do event loop e as inserções viram lotes (na KDTree, um único reequilíbrio
+por lote).
+
+Exemplo de uso:
+    python -m benchmarks.server_load
+    python -m benchmarks.server_load --tipo kd --clientes 1 4 16 --pipeline 1 8 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+from tools.tree_server import TreeClient
+
+
+def _percentil(ordenadas, p: float) -> float:
+    return ordenadas[min(len(ordenadas) - 1, int(p * len(ordenadas)))]
+
+
+async def _cliente(path: str, arvore: str, tipo: str, k: int, ops: int,
+                   profundidade: int, rng: random.Random, latencias) -> None:
+    cliente = await TreeClient.connect(path=path)
+    vagas = asyncio.Semaphore(profundidade)
+
+    async def uma(futuro, inicio):
+        try:
+            await futuro
+        finally:
+            latencias.append(perf_counter() - inicio)
+            vagas.release()
+
+    tarefas = []
+    for _ in range(ops):
+        await vagas.acquire()
+        if tipo == 'kd':
+            args = ([rng.random() for _ in range(k)],)
+        else:
+            args = (rng.randrange(1 << 30),)
+        # 80% inserções, 20% buscas
+        op = 'insert' if rng.random() < 0.8 else 'search'
+        inicio = perf_counter()
+        tarefas.append(asyncio.ensure_future(uma(cliente.call(arvore, op, *args), inicio)))
+    await asyncio.gather(*tarefas)
+    await cliente.close()
+
+
+async def _rodada(path: str, tipo: str, k: int, clientes: int, profundidade: int,
+                  ops: int, semente: int):
+    arvore = f"{tipo}-{clientes}-{profundidade}"
+    controle = await TreeClient.connect(path=path)
+    await controle.create(arvore, tipo, k)
+    latencias = []
+    inicio = perf_counter()
+    await asyncio.gather(*(
+        _cliente(path, arvore, tipo, k, ops, profundidade,
+                 random.Random(semente * 1000 + c), latencias)
+        for c in range(clientes)))
+    segundos = perf_counter() - inicio
+    tamanho = await controle.size(arvore)
+    await controle.close()
+    return segundos, sorted(latencias), tamanho
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de carga do servidor de árvores")
+    parser.add_argument('--tipo', choices=('rb', '234', 'kd'), default='rb')
+    parser.add_argument('-k', type=int, default=2)
+    parser.add_argument('--clientes', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--pipeline', type=int, nargs='+', default=[1, 16, 128])
+    parser.add_argument('--ops', type=int, default=5000, help="requisições por cliente")
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pasta = tempfile.mkdtemp()
+    path = os.path.join(pasta, 'arvores.sock')
+    servidor = subprocess.Popen([sys.executable, '-m', 'tools.tree_server', '--socket', path],
+                                stdout=subprocess.PIPE, text=True)
+    try:
+        # espera a linha "ouvindo em ..."
+        if not servidor.stdout.readline():
+            print("O servidor não iniciou")
+            return 1
+        print(f"árvore {args.tipo}, {args.ops} requisições por cliente (80% insert), "
+              f"{os.cpu_count()} núcleo(s) disponível(is)")
+        print(f"{'clientes':>8} {'pipeline':>8} {'ops/s':>10} {'p50 (ms)':>9} "
+              f"{'p99 (ms)':>9} {'p99.9 (ms)':>10}")
+        for clientes in args.clientes:
+            for profundidade in args.pipeline:
+                segundos, latencias, _ = asyncio.run(_rodada(
+                    path, args.tipo, args.k, clientes, profundidade, args.ops, args.semente))
+                vazao = len(latencias) / segundos
+                p50, p99, p999 = (_percentil(latencias, p) * 1000 for p in (0.5, 0.99, 0.999))
+                print(f"{clientes:>8} {profundidade:>8} {vazao:>10.0f} {p50:>9.3f} "
+                      f"{p99:>9.3f} {p999:>10.3f}")
+    finally:
+        servidor.terminate()
+        servidor.wait()
+        if os.path.exists(path):
+            os.unlink(path)
+        os.rmdir(pasta)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
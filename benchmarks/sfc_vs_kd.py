@@ -0,0 +1,77 @@
+"""
+Ingestão e consultas por caixa: KDTree vs índice por curva (SFCIndex).
+
+Os mesmos pontos são inseridos um a um na KDTree (reequilíbrio global),
+na DynamicKDTree (Bentley–Saxe) e no SFCIndex sobre a BTree234 com chaves
+Morton e Hilbert; em seguida todas respondem às mesmas consultas por caixa,
+e as contagens são conferidas entre as estruturas.
+
+Exemplo de uso:
+    python -m benchmarks.sfc_vs_kd
+    python -m benchmarks.sfc_vs_kd --pontos 20000 -k 3 --lado 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import random
+import sys
+from time import perf_counter
+
+from k_d_tree import KDTree
+from k_d_tree.dynamic_kd_tree import DynamicKDTree
+
+SFCIndex = importlib.import_module('2-3-4').SFCIndex
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark KDTree vs SFCIndex (BTree234)")
+    parser.add_argument('--pontos', type=int, default=5000)
+    parser.add_argument('-k', type=int, default=2)
+    parser.add_argument('--consultas', type=int, default=500)
+    parser.add_argument('--lado', type=float, default=0.05,
+                        help='lado das caixas de consulta (domínio [0, 1]^k)')
+    parser.add_argument('--bits', type=int, default=16)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    k = args.k
+    pontos = [[rng.random() for _ in range(k)] for _ in range(args.pontos)]
+    caixas = []
+    for _ in range(args.consultas):
+        low = [rng.uniform(0, 1 - args.lado) for _ in range(k)]
+        caixas.append((low, [c + args.lado for c in low]))
+
+    estruturas = [
+        ('KDTree', KDTree(k)),
+        ('DynamicKDTree', DynamicKDTree(k)),
+        ('SFC morton', SFCIndex(k, [0.0] * k, [1.0] * k, bits=args.bits, curve='morton')),
+        ('SFC hilbert', SFCIndex(k, [0.0] * k, [1.0] * k, bits=args.bits, curve='hilbert')),
+    ]
+
+    print(f"{args.pontos} pontos, k={k}, {args.consultas} caixas de lado {args.lado}")
+    print(f"{'estrutura':<14} {'inserções/s':>12} {'consultas/s':>12} {'resultados':>11}")
+    referencia = None
+    for nome, tree in estruturas:
+        inicio = perf_counter()
+        for ponto in pontos:
+            tree.insert(ponto)
+        ingestao = perf_counter() - inicio
+
+        inicio = perf_counter()
+        total = sum(len(tree.range_search(low, high)) for low, high in caixas)
+        consultas = perf_counter() - inicio
+
+        if referencia is None:
+            referencia = total
+        elif total != referencia:
+            print(f"{nome}: {total} resultados, esperado {referencia}")
+            return 1
+        print(f"{nome:<14} {args.pontos / ingestao:>12,.0f} {args.consultas / consultas:>12,.0f} {total:>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
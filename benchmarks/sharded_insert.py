@@ -0,0 +1,71 @@
+"""
+Vazão de inserção da BTree234 particionada (2-3-4/sharded.py) por número de shards.
+
+Insere as mesmas chaves aleatórias numa BTree234 local (referência) e numa
+ShardedBTree234 com 1, 2, 4, ... workers, em lotes de insert_many com
+cortes uniformes no espaço de chaves. Ao final, divide o shard mais quente
+(split_hot) e mede o tempo de mover metade das chaves para o worker novo.
+O ganho é limitado pelos núcleos disponíveis (os.cpu_count()) e pelo custo
+de serializar os lotes entre processos.
+
+Exemplo de uso:
+    python -m benchmarks.sharded_insert
+    python -m benchmarks.sharded_insert --chaves 2000000 --shards 1 2 4 8 16 --lote 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import random
+import sys
+from time import perf_counter
+
+_pacote = importlib.import_module('2-3-4')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de inserção na BTree234 particionada")
+    parser.add_argument('--chaves', type=int, default=200000)
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--lote', type=int, default=10000, help="chaves por insert_many")
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    universo = 1 << 40
+    rng = random.Random(args.semente)
+    chaves = [rng.randrange(universo) for _ in range(args.chaves)]
+    lotes = [chaves[i:i + args.lote] for i in range(0, len(chaves), args.lote)]
+
+    tree = _pacote.BTree234()
+    inicio = perf_counter()
+    for k in chaves:
+        tree.insert(k)
+    local = perf_counter() - inicio
+    esperado = tree.traverse()
+
+    print(f"{args.chaves} chaves, lotes de {args.lote}, {os.cpu_count()} núcleo(s) disponível(is)")
+    print(f"{'shards':>6} {'tempo (s)':>10} {'chaves/s':>10} {'speedup':>8} {'split (s)':>10}")
+    print(f"{'local':>6} {local:>10.3f} {args.chaves / local:>10.0f} {1.0:>8.2f} {'-':>10}")
+    for shards in args.shards:
+        limites = [universo * i // shards for i in range(1, shards)]
+        with _pacote.ShardedBTree234(limites) as sharded:
+            inicio = perf_counter()
+            for lote in lotes:
+                sharded.insert_many(lote)
+            segundos = perf_counter() - inicio
+
+            inicio = perf_counter()
+            sharded.split_hot()
+            split = perf_counter() - inicio
+            if sharded.traverse() != esperado:
+                print(f"{shards:>6} conteúdo diferente da BTree234 local")
+                return 1
+        print(f"{shards:>6} {segundos:>10.3f} {args.chaves / segundos:>10.0f} "
+              f"{local / segundos:>8.2f} {split:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
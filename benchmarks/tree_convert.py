@@ -0,0 +1,63 @@
+"""
+Conversão entre BTree234 e RedBlackTree: reinserção chave a chave vs
+conversão estrutural em O(n) (tools.convert).
+
+Exemplo de uso:
+    python -m benchmarks.tree_convert
+    python -m benchmarks.tree_convert --chaves 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import random
+import sys
+from time import perf_counter
+
+from red_black_tree.red_black_tree import RedBlackTree
+from tools.convert import b234_para_rb, rb_para_234
+
+BTree234 = importlib.import_module('2-3-4').BTree234
+
+
+def _reinserir(destino, chaves):
+    for chave in chaves:
+        destino.insert(chave)
+    return destino
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da conversão BTree234 <-> RedBlackTree")
+    parser.add_argument('--chaves', type=int, default=100000)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.semente)
+    chaves = rng.sample(range(args.chaves * 10), args.chaves)
+    btree = BTree234()
+    rb = RedBlackTree()
+    for chave in chaves:
+        btree.insert(chave)
+        rb.insert(chave)
+
+    print(f"{args.chaves} chaves")
+    for nome, reinsercao, conversao in (
+        ('234 -> RB', lambda: _reinserir(RedBlackTree(), btree.traverse()),
+         lambda: b234_para_rb(btree)),
+        ('RB -> 234', lambda: _reinserir(BTree234(), btree.traverse()),
+         lambda: rb_para_234(rb)[0]),
+    ):
+        inicio = perf_counter()
+        reinsercao()
+        t_reinsercao = perf_counter() - inicio
+        inicio = perf_counter()
+        conversao()
+        t_conversao = perf_counter() - inicio
+        print(f"{nome:<10} reinserção {t_reinsercao:8.3f}s   conversão {t_conversao:8.3f}s   "
+              f"({t_reinsercao / t_conversao:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,20 @@
+import importlib
+
 from .k_d_tree import KDTree, Node
 
-__all__ = ['KDTree', 'Node']
+__all__ = ['KDTree', 'Node', 'DynamicKDTree', 'CompactKDTree', 'WindowedKDTree',
+           'VPTree', 'VPNode', 'pairs_within', 'knn_join', 'all_knn']
+
+# as demais estruturas (e suas dependências, como random na VPTree) só são
+# importadas no primeiro acesso, para não pesar em `import k_d_tree`
+_MODULOS = {'DynamicKDTree': 'dynamic_kd_tree', 'CompactKDTree': 'compact_kd_tree',
+            'WindowedKDTree': 'windowed_kd_tree', 'VPTree': 'vp_tree', 'VPNode': 'vp_tree',
+            'pairs_within': 'spatial_join', 'knn_join': 'spatial_join',
+            'all_knn': 'spatial_join'}
+
+
+def __getattr__(name):
+    if name in _MODULOS:
+        module = importlib.import_module(f"{__name__}.{_MODULOS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,275 @@
+import heapq
+from array import array
+from math import sqrt
+
+# typecode do array e, para os modos quantizados, faixa de inteiros usada
+STORAGE = {
+    'float64': ('d', None),
+    'float32': ('f', None),
+    'int32': ('i', (-2 ** 31, 2 ** 31 - 1)),
+    'int16': ('h', (-2 ** 15, 2 ** 15 - 1)),
+}
+
+
+def _ordenar(codificados, ordem, eixos, start, end, depth, k, ate=None):
+    # Monta a árvore implícita da fatia [start, end): permuta ordem (índices
+    # em codificados) para que a mediana de cada subfatia fique no meio e
+    # grava o eixo de corte de cada posição em eixos. Com ate, as fatias
+    # que chegam a essa profundidade não são processadas e sim devolvidas
+    # como (start, end, depth), para serem construídas em outro lugar.
+    pendentes = []
+    stack = [(start, end, depth)]
+    while stack:
+        start, end, depth = stack.pop()
+        if start >= end:
+            continue
+        if ate is not None and depth >= ate:
+            pendentes.append((start, end, depth))
+            continue
+        axis = depth % k
+        mid = (start + end) // 2
+        ordem[start:end] = sorted(ordem[start:end], key=lambda i: codificados[i][axis])
+        eixos[mid] = axis
+        stack.append((mid + 1, end, depth + 1))
+        stack.append((start, mid, depth + 1))
+    return pendentes
+
+
+class CompactKDTree:
+    # k-D tree estática em layout plano, para conjuntos grandes de pontos.
+    # Em vez de um objeto Node e uma lista de floats por ponto, todas as
+    # coordenadas ficam num único array contíguo (float64, float32 ou
+    # inteiros int32/int16 com escala e deslocamento por dimensão).
+    # A árvore é implícita: o nó da fatia [start, end) é o ponto da posição
+    # (start + end) // 2 e os filhos são as fatias à esquerda e à direita,
+    # então não há ponteiros; só o eixo de corte de cada posição é guardado.
+    # As consultas calculam direto sobre a representação compacta e só os
+    # resultados são convertidos de volta para floats. Remoções marcam
+    # lápides; para inserções frequentes, use DynamicKDTree.
+
+    def __init__(self, k, storage='float64', scale=None, offset=None):
+        if storage not in STORAGE:
+            raise ValueError(f"storage deve ser um de {tuple(STORAGE)}")
+        self.k = k
+        self.storage = storage
+        self.size = 0
+        self.coords = array(STORAGE[storage][0])
+        self.axes = array('B')
+        # 1 = vivo, 0 = lápide
+        self.alive = bytearray()
+        self.values = None
+        # quantização: x = (q - qmin) * scale + offset
+        self.scale = scale
+        self.offset = offset
+
+    @classmethod
+    def build(cls, points, k, values=None, storage='float64', scale=None, offset=None):
+        tree = cls(k, storage, scale, offset)
+        if values is None:
+            unicos = list({tuple(p): None for p in points}.items())
+        else:
+            unicos = list({tuple(p): v for p, v in zip(points, values)}.items())
+        tree._build([p for p, _ in unicos], [v for _, v in unicos] if values is not None else None)
+        return tree
+
+    def _quantizado(self):
+        return STORAGE[self.storage][1] is not None
+
+    def _ajustar_escala(self, points):
+        # escala e deslocamento cobrindo exatamente a extensão dos dados
+        qmin, qmax = STORAGE[self.storage][1]
+        niveis = qmax - qmin
+        if self.offset is None:
+            self.offset = [min(p[i] for p in points) for i in range(self.k)]
+        if self.scale is None:
+            self.scale = []
+            for i in range(self.k):
+                extensao = max(p[i] for p in points) - self.offset[i]
+                self.scale.append(extensao / niveis if extensao > 0 else 1.0)
+
+    def _codificar(self, point):
+        # coordenadas na unidade do armazenamento (sem arredondar)
+        if not self._quantizado():
+            return list(point)
+        qmin = STORAGE[self.storage][1][0]
+        return [(c - o) / s + qmin for c, o, s in zip(point, self.offset, self.scale)]
+
+    def _como_armazenado(self, point):
+        # coordenadas arredondadas como as do array (float32 ou inteiros):
+        # buscas exatas e limites de range_search comparam valores iguais
+        # aos armazenados. O arredondamento é monótono, então um ponto
+        # dentro de [low, high] continua dentro após arredondar os três.
+        alvo = self._codificar(point)
+        if self._quantizado():
+            return [round(c) for c in alvo]
+        if self.storage == 'float32':
+            return array('f', alvo).tolist()
+        return alvo
+
+    def _decodificar(self, pos):
+        k = self.k
+        coords = self.coords[pos * k:(pos + 1) * k]
+        if not self._quantizado():
+            return list(coords)
+        qmin = STORAGE[self.storage][1][0]
+        return [(q - qmin) * s + o for q, s, o in zip(coords, self.scale, self.offset)]
+
+    def _build(self, points, values):
+        codificados = self._codificar_todos(points)
+        n = len(codificados)
+        ordem = list(range(n))
+        eixos = [0] * n
+        _ordenar(codificados, ordem, eixos, 0, n, 0, self.k)
+        self._montar((c for i in ordem for c in codificados[i]), eixos,
+                     [values[i] for i in ordem] if values is not None else None)
+
+    def _codificar_todos(self, points):
+        # coordenadas de cada ponto já na unidade do armazenamento
+        if points and self._quantizado():
+            self._ajustar_escala(points)
+            qmin, qmax = STORAGE[self.storage][1]
+            codificados = []
+            for p in points:
+                q = [round(c) for c in self._codificar(p)]
+                if any(c < qmin or c > qmax for c in q):
+                    raise ValueError(f"Ponto {p} fora da faixa representável em {self.storage}")
+                codificados.append(q)
+            return codificados
+        return [list(p) for p in points]
+
+    def _montar(self, coords, eixos, values):
+        # instala os buffers já no layout final
+        self.coords = array(STORAGE[self.storage][0], coords)
+        self.axes = array('B', eixos)
+        self.alive = bytearray(b'\x01') * len(self.axes)
+        self.values = values
+        self.size = len(self.axes)
+
+    def nbytes(self):
+        # memória dos buffers (sem contar as cargas)
+        return (len(self.coords) * self.coords.itemsize + len(self.axes) * self.axes.itemsize
+                + len(self.alive))
+
+    def _pesos(self):
+        # distância² real = soma de peso_i * (diferença na unidade armazenada)²
+        if not self._quantizado():
+            return [1.0] * self.k
+        return [s * s for s in self.scale]
+
+    def _find(self, point):
+        # posição do ponto (na representação armazenada) ou -1
+        alvo = self._como_armazenado(point)
+        coords, axes, k = self.coords, self.axes, self.k
+        stack = [(0, len(self.axes))]
+        while stack:
+            start, end = stack.pop()
+            if start >= end:
+                continue
+            mid = (start + end) // 2
+            base = mid * k
+            if all(coords[base + i] == alvo[i] for i in range(k)):
+                return mid
+            axis = axes[mid]
+            c = coords[base + axis]
+            # empates no eixo podem estar dos dois lados da mediana
+            if alvo[axis] <= c:
+                stack.append((start, mid))
+            if alvo[axis] >= c:
+                stack.append((mid + 1, end))
+        return -1
+
+    def search(self, point):
+        # com quantização, encontra o ponto armazenado na mesma célula
+        pos = self._find(point)
+        if pos < 0 or not self.alive[pos]:
+            return None
+        return self._decodificar(pos)
+
+    def get(self, point, default=None):
+        pos = self._find(point)
+        if pos < 0 or not self.alive[pos] or self.values is None:
+            return default
+        return self.values[pos]
+
+    def delete(self, point):
+        pos = self._find(point)
+        if pos < 0 or not self.alive[pos]:
+            return False
+        self.alive[pos] = 0
+        self.size -= 1
+        return True
+
+    def points(self):
+        return [self._decodificar(pos) for pos in range(len(self.axes)) if self.alive[pos]]
+
+    def items(self):
+        valores = self.values if self.values is not None else [None] * len(self.axes)
+        return [(self._decodificar(pos), valores[pos])
+                for pos in range(len(self.axes)) if self.alive[pos]]
+
+    def nearest(self, target, n=1):
+        # n vizinhos mais próximos: lista de (distância, ponto) em ordem crescente
+        if n < 1:
+            return []
+        alvo = self._codificar(target)
+        pesos = self._pesos()
+        coords, axes, alive, k = self.coords, self.axes, self.alive, self.k
+        heap = []  # max-heap por (-distância², posição)
+        stack = [(0, len(axes), 0.0)]
+
+        while stack:
+            start, end, plane_d2 = stack.pop()
+            if start >= end:
+                continue
+            if len(heap) == n and plane_d2 >= -heap[0][0]:
+                continue
+
+            mid = (start + end) // 2
+            base = mid * k
+            if alive[mid]:
+                d2 = 0.0
+                for i in range(k):
+                    diff = alvo[i] - coords[base + i]
+                    d2 += pesos[i] * diff * diff
+                if len(heap) < n:
+                    heapq.heappush(heap, (-d2, mid))
+                elif d2 < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d2, mid))
+
+            axis = axes[mid]
+            diff = alvo[axis] - coords[base + axis]
+            far_d2 = max(plane_d2, pesos[axis] * diff * diff)
+            if diff < 0:
+                stack.append((mid + 1, end, far_d2))
+                stack.append((start, mid, plane_d2))
+            else:
+                stack.append((start, mid, far_d2))
+                stack.append((mid + 1, end, plane_d2))
+
+        # só os resultados voltam para floats
+        return [(sqrt(-d2), self._decodificar(pos)) for d2, pos in sorted(heap, reverse=True)]
+
+    def range_search(self, low, high):
+        # pontos p com low[i] <= p[i] <= high[i] em todas as coordenadas
+        low_c, high_c = self._como_armazenado(low), self._como_armazenado(high)
+        coords, axes, alive, k = self.coords, self.axes, self.alive, self.k
+        posicoes = []
+        stack = [(0, len(axes))]
+
+        while stack:
+            start, end = stack.pop()
+            if start >= end:
+                continue
+            mid = (start + end) // 2
+            base = mid * k
+            if alive[mid] and all(low_c[i] <= coords[base + i] <= high_c[i] for i in range(k)):
+                posicoes.append(mid)
+
+            axis = axes[mid]
+            c = coords[base + axis]
+            if low_c[axis] <= c:
+                stack.append((start, mid))
+            if high_c[axis] >= c:
+                stack.append((mid + 1, end))
+
+        return [self._decodificar(pos) for pos in posicoes]
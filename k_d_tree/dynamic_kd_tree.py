@@ -0,0 +1,102 @@
+import heapq
+
+from .k_d_tree import _SEM_VALOR, KDTree
+
+
+class DynamicKDTree:
+    # Método logarítmico (Bentley–Saxe): o conjunto é dividido em k-D trees
+    # estáticas de tamanhos 2^i, construídas em lote. Uma inserção funciona
+    # como o "vai um" de um contador binário: os componentes ocupados dos
+    # níveis mais baixos são fundidos com o novo ponto em um único componente.
+    # Inserção amortizada O(log² n); consultas visitam os O(log n) componentes.
+
+    def __init__(self, k, split_policy='round_robin', index=False):
+        self.k = k
+        self.split_policy = split_policy
+        # índice exato (tuple -> nó) em cada componente
+        self.index = index
+        # components[i] é None ou uma KDTree construída com ~2^i pontos
+        self.components = []
+        self.size = 0
+
+    def insert(self, point, value=_SEM_VALOR):
+        # valida antes da fusão: um erro no meio dela descartaria os
+        # componentes já esvaziados
+        if len(point) != self.k:
+            raise ValueError(f"Ponto {point} deve ter {self.k} coordenadas")
+        for tree in self.components:
+            if tree is not None and tree.search(point) is not None:
+                # ponto já presente: atualiza a carga (se informada)
+                tree.insert(point, value)
+                return False
+
+        carry = [(point, None if value is _SEM_VALOR else value)]
+        i = 0
+        while i < len(self.components) and self.components[i] is not None:
+            carry.extend(self.components[i].items())
+            self.components[i] = None
+            i += 1
+
+        if i == len(self.components):
+            self.components.append(None)
+        # remoções são lápides; a compactação acontece nas fusões
+        self.components[i] = KDTree.build([p for p, _ in carry], self.k,
+                                          values=[v for _, v in carry],
+                                          lazy_delete=True, compact_threshold=0.5,
+                                          split_policy=self.split_policy,
+                                          index=self.index)
+        self.size += 1
+        return True
+
+    def delete(self, point):
+        for tree in self.components:
+            if tree is not None and tree.delete(point):
+                self.size -= 1
+                return True
+        return False
+
+    def search(self, point):
+        for tree in self.components:
+            if tree is not None:
+                found = tree.search(point)
+                if found is not None:
+                    return found
+        return None
+
+    def get(self, point, default=None):
+        for tree in self.components:
+            if tree is not None and tree.search(point) is not None:
+                return tree.get(point)
+        return default
+
+    def nearest(self, target, n=1):
+        # funde os n melhores de cada componente
+        candidatos = []
+        for tree in self.components:
+            if tree is not None:
+                candidatos.extend(tree.nearest(target, n))
+        return heapq.nsmallest(n, candidatos, key=lambda item: item[0])
+
+    def range_search(self, low, high):
+        result = []
+        for tree in self.components:
+            if tree is not None:
+                result.extend(tree.range_search(low, high))
+        return result
+
+    def range_count(self, low, high):
+        return sum(tree.range_count(low, high) for tree in self.components if tree is not None)
+
+    def points(self):
+        result = []
+        for tree in self.components:
+            if tree is not None:
+                result.extend(tree.points())
+        return result
+
+    def items(self):
+        result = []
+        for tree in self.components:
+            if tree is not None:
+                result.extend(tree.items())
+        return result
@@ -1,7 +1,19 @@
 from k_d_tree import KDTree
 import os
+import sys
+
+# raiz do repositório, para o pacote tools quando executado como script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.render_worker import BackgroundRenderer
+
+# renderização em segundo plano (criado em main): as operações não esperam o graphviz
+renderizador = None
 
 def remover_arquivo_se_existir(caminho):
+    # cancela a renderização pendente e faz a que estiver em andamento
+    # apagar o que gerar, sem esperar o graphviz
+    if renderizador is not None:
+        renderizador.descartar(os.path.splitext(caminho)[0])
     if os.path.exists(caminho):
         os.remove(caminho)
 
@@ -9,6 +21,12 @@ def caminho_kd_tree(nome):
     pasta = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(pasta, nome)
 
+def agendar_visualizacao(tree, nome):
+    # mesmo comportamento de print_tree: árvore vazia não gera arquivo
+    if tree.root is None:
+        return None
+    return renderizador.submit(tree.dot_snapshot(), caminho_kd_tree(nome))
+
 def inserir_ponto(tree, contador_insercoes):
     print("Inserindo ponto:")
     
@@ -25,10 +43,10 @@ def inserir_ponto(tree, contador_insercoes):
     
     remover_arquivo_se_existir(caminho_kd_tree("estado_atual_antes.png"))
     remover_arquivo_se_existir(caminho_kd_tree("estado_atual_depois.png"))
-    tree.print_tree(caminho_kd_tree("estado_atual_antes"), silent=True)
+    agendar_visualizacao(tree, "estado_atual_antes")
     
     if tree.insert(ponto):
-        tree.print_tree(caminho_kd_tree("estado_atual_depois"), silent=True)
+        agendar_visualizacao(tree, "estado_atual_depois")
         
         print(f"\nPonto {ponto} inserido com sucesso!")
         print(f"Árvore agora tem {tree.size} pontos")
@@ -58,10 +76,10 @@ def remover_ponto(tree, contador_remocoes):
     
     remover_arquivo_se_existir(caminho_kd_tree("estado_atual_antes.png"))
     remover_arquivo_se_existir(caminho_kd_tree("estado_atual_depois.png"))
-    tree.print_tree(caminho_kd_tree("estado_atual_antes"), silent=True)
+    agendar_visualizacao(tree, "estado_atual_antes")
     
     if tree.delete(ponto):
-        tree.print_tree(caminho_kd_tree("estado_atual_depois"), silent=True)
+        agendar_visualizacao(tree, "estado_atual_depois")
         
         print(f"\nPonto {ponto} removido com sucesso!")
         print(f"Árvore agora tem {tree.size} pontos")
@@ -101,7 +119,7 @@ def visualizar_arvore(tree):
         return
     
     remover_arquivo_se_existir(caminho_kd_tree("estado_atual.png"))
-    tree.print_tree(caminho_kd_tree("estado_atual"), True)
+    agendar_visualizacao(tree, "estado_atual")
     print("Arquivo para visualizar a árvore gerado em k_d_tree/estado_atual.png!")
 
 def mostrar_info_arvore(tree):
@@ -110,6 +128,11 @@ def mostrar_info_arvore(tree):
     print(f"\nDimensões: {tree.k}")
     print(f"Total de pontos: {tree.size}")
     
+    if tree.lazy_delete:
+        print(f"Pontos removidos aguardando compactação: {tree.dead}")
+        print(f"Fração de removidos: {tree.dead_ratio():.1%} "
+              f"(compacta acima de {tree.compact_threshold:.0%})")
+    
     if tree.root:
         print(f"Raiz: {tree.root.point}")
     else:
@@ -138,7 +161,12 @@ def main():
         print("Erro: Digite um número válido!")
         return
     
-    tree = KDTree(k=k)
+    lazy = input("Usar remoção preguiçosa (lápides)? (s/N): ").strip().lower() == 's'
+    
+    global renderizador
+    renderizador = BackgroundRenderer()
+    
+    tree = KDTree(k=k, lazy_delete=lazy)
     contador_insercoes = 1
     contador_remocoes = 1
     
@@ -161,6 +189,9 @@ def main():
             print("Encerrando...")
             print(f"\nNumero de inserções: {contador_insercoes - 1}")
             print(f"Numero de remoções: {contador_remocoes - 1}")
+            renderizador.close()
+            for erro in renderizador.erros:
+                print(f"Erro ao gerar visualização: {erro}")
             break
         else:
             print("\nOpção invalida! Digite um número de 1 a 6.")
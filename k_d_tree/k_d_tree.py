@@ -1,183 +1,536 @@
-from graphviz import Digraph
+import bisect
+import heapq
+from math import sqrt
+
+try:
+    from tools.stats import StatsMixin
+except ModuleNotFoundError:
+    # executado como script de dentro da pasta da árvore: a raiz do
+    # repositório (onde fica tools/) não está no sys.path
+    import os as _os
+    import sys as _sys
+    _sys.path.append(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+    from tools.stats import StatsMixin
+
+
+# valor padrão de insert/insert_many: "sem carga" (None é uma carga válida);
+# um ponto já presente só tem a carga trocada quando uma é informada
+_SEM_VALOR = object()
+
+
+def _dist2(a, b):
+    return sum((x - y) * (x - y) for x, y in zip(a, b))
+
+def _dist2_box(target, low, high):
+    # distância² de target à caixa [low, high] (0 se estiver dentro)
+    total = 0.0
+    for c, lo, hi in zip(target, low, high):
+        if c < lo:
+            total += (lo - c) * (lo - c)
+        elif c > hi:
+            total += (c - hi) * (c - hi)
+    return total
+
+def _box_relation(low, high, q_low, q_high):
+    # 0: caixas disjuntas, 1: interseção parcial, 2: [low, high] contida na consulta
+    contida = True
+    for lo, hi, q_lo, q_hi in zip(low, high, q_low, q_high):
+        if hi < q_lo or lo > q_hi:
+            return 0
+        if lo < q_lo or hi > q_hi:
+            contida = False
+    return 2 if contida else 1
+
+SPLIT_POLICIES = ('round_robin', 'max_spread', 'max_variance', 'sliding_midpoint')
+
+# formato de dump/load: MAGIC, cabeçalho, vetores em pré-ordem
+MAGIC = b'KDT1'
+# nós, k, size, dead, compact_threshold, lazy_delete, index, política
+_CABECALHO = '<QQQQd??B'
+# flags por nó: filho esquerdo, filho direito, lápide
+_ESQ, _DIR, _LAPIDE = 1, 2, 4
 
 class Node:
-    def __init__(self, point, depth, k):
+    def __init__(self, point, depth, k, axis=None, value=None):
         self.point = point
+        # carga associada ao ponto (ex.: id de um registro)
+        self.value = value
         self.depth = depth
         self.k = k
+        # eixo de corte escolhido na construção (padrão: depth % k)
+        self.split_axis = depth % k if axis is None else axis
         
         self.left = None
         self.right = None
         self.parent = None
+        # lápide: ponto removido no modo lazy_delete, ignorado nas consultas
+        self.deleted = False
+        # caixa envolvente da subárvore (inclui lápides) e pontos vivos nela
+        self.low = list(point)
+        self.high = list(point)
+        self.count = 1
+        # nós da subárvore (incluindo lápides), usado no reequilíbrio
+        self.tamanho = 1
 
     def axis(self):
-        return self.depth % self.k
+        return self.split_axis
 
-class KDTree:
-    def __init__(self, k):
+class KDTree(StatsMixin):
+    # O equilíbrio segue a ideia da scapegoat tree (como na VPTree): após
+    # inserir ou remover, só a subárvore mais alta do caminho com um filho
+    # grande demais é reconstruída. As lápides da remoção preguiçosa são
+    # compactadas por subárvore, quando passam de compact_threshold nela.
+
+    # contadores expostos por stats() quando a instrumentação está ativa
+    STATS_KEYS = ('comparisons', 'rebalance', 'nodes_rebuilt', 'nodes_visited')
+    # fração máxima do tamanho de um nó que um filho pode ter
+    ALPHA = 0.75
+    # subárvores menores que isso só são compactadas junto com a árvore
+    # toda, para que a remoção preguiçosa não vire remoção imediata
+    COMPACT_MIN_NODES = 32
+
+    def __init__(self, k, lazy_delete=False, compact_threshold=0.25,
+                 split_policy='round_robin', index=False):
+        if split_policy not in SPLIT_POLICIES:
+            raise ValueError(f"split_policy deve ser um de {SPLIT_POLICIES}")
         self.k = k
+        # como o eixo de corte é escolhido em build/rebalance:
+        # round_robin (depth % k), max_spread, max_variance ou sliding_midpoint
+        self.split_policy = split_policy
         self.root = None
+        # size conta apenas pontos vivos
         self.size = 0
+        # remoção preguiçosa: delete só marca o nó; uma subárvore é
+        # compactada quando a fração de lápides nela passa de compact_threshold
+        self.lazy_delete = lazy_delete
+        self.compact_threshold = compact_threshold
+        self.dead = 0
+        # índice opcional tuple(ponto) -> nó (inclui lápides): busca exata e
+        # checagem de duplicata em O(1), sem descer a árvore
+        self._index = {} if index else None
+        # None = instrumentação desligada
+        self._stats = None
+
+    @classmethod
+    def build(cls, points, k, values=None, **kwargs):
+        # construção em lote (mediana por nível), sem reequilibrar a cada ponto;
+        # values, se dado, traz a carga de cada ponto (na mesma ordem)
+        tree = cls(k, **kwargs)
+        if values is None:
+            values = [None] * len(points)
+        unicos = list({tuple(p): (p, v) for p, v in zip(points, values)}.values())
+        tree.size = len(unicos)
+        tree._build(unicos)
+        return tree
+
+    def dump(self, fp):
+        # grava a árvore em fp (binário) sem recursão: flags de estrutura e
+        # lápide, eixos de corte, coordenadas e cargas em pré-ordem, cada
+        # vetor numa escrita só (caixas e contagens são recalculadas no load)
+        nos = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is not None:
+                nos.append(node)
+                stack.append(node.right)
+                stack.append(node.left)
+
+        from tools.serial import gravar_cabecalho, gravar_valores
+        gravar_cabecalho(fp, MAGIC, _CABECALHO, len(nos), self.k, self.size, self.dead,
+                         self.compact_threshold, self.lazy_delete, self._index is not None,
+                         SPLIT_POLICIES.index(self.split_policy))
+        fp.write(bytes((node.left is not None) | (node.right is not None) << 1 | node.deleted << 2
+                       for node in nos))
+        fp.write(bytes(node.split_axis for node in nos))
+        gravar_valores(fp, [c for node in nos for c in node.point])
+        gravar_valores(fp, [node.value for node in nos])
+
+    @classmethod
+    def load(cls, fp):
+        # reconstrói a árvore gravada por dump em tempo linear, sem inserções
+        from tools.serial import coletor_pausado, ler_cabecalho, ler_valores
+        n, k, size, dead, threshold, lazy, index, policy = ler_cabecalho(
+            fp, MAGIC, _CABECALHO, 'KDTree')
+        flags = fp.read(n)
+        eixos = fp.read(n)
+        coords = ler_valores(fp)
+        values = ler_valores(fp)
+
+        tree = cls(k, lazy_delete=lazy, compact_threshold=threshold,
+                   split_policy=SPLIT_POLICIES[policy], index=index)
+        tree.size, tree.dead = size, dead
+        criados = []
+        # milhões de nós novos: o coletor cíclico só atrasaria a construção
+        with coletor_pausado():
+            # nós com filho direito ainda por ligar; em pré-ordem, depois da
+            # subárvore esquerda de um nó vem o filho direito do último pendente
+            pendentes = []
+            pai_esquerdo = None
+            for i in range(n):
+                f = flags[i]
+                if pai_esquerdo is not None:
+                    pai = pai_esquerdo
+                elif pendentes:
+                    pai = pendentes.pop()
+                else:
+                    pai = None
+                node = Node(coords[i * k:(i + 1) * k], pai.depth + 1 if pai else 0, k,
+                            eixos[i], values[i])
+                node.parent = pai
+                if f & _LAPIDE:
+                    node.deleted = True
+                if pai is None:
+                    tree.root = node
+                elif pai is pai_esquerdo:
+                    pai.left = node
+                else:
+                    pai.right = node
+                criados.append(node)
+                if f & _DIR:
+                    pendentes.append(node)
+                pai_esquerdo = node if f & _ESQ else None
+
+        # pais vêm antes dos filhos: caixas de baixo para cima
+        for node in reversed(criados):
+            tree._annotate(node)
+        if tree._index is not None:
+            tree._index = {tuple(node.point): node for node in criados}
+        return tree
+
+    def points(self):
+        # pontos vivos, em pré-ordem
+        return [node.point for node in self._subtree_nodes(self.root)]
+
+    def items(self):
+        # pares (ponto, carga) vivos, em pré-ordem
+        return [(node.point, node.value) for node in self._subtree_nodes(self.root)]
 
-    def insert(self, point):
+    def _find(self, point):
+        # nó com exatamente este ponto (vivo ou lápide), ou None
+        if self._index is not None:
+            return self._index.get(tuple(point))
+        node = self.root
+        stats = self._stats
+        while node is not None:
+            if stats is not None:
+                stats['comparisons'] += 1
+            if node.point == point:
+                return node
+            axis = node.axis()
+            if point[axis] < node.point[axis]:
+                node = node.left
+            else:
+                node = node.right
+        return None
+
+    def get(self, point, default=None):
+        # carga associada ao ponto, ou default se ele não estiver na árvore
+        node = self._find(point)
+        if node is None or node.deleted:
+            return default
+        return node.value
+
+    def dead_ratio(self):
+        total = self.size + self.dead
+        return self.dead / total if total else 0.0
+
+    def compact(self, threshold=None):
+        # reconstrói só as subárvores mais altas cuja fração de lápides passa
+        # de threshold (padrão: compact_threshold); compact(0) remove todas
+        if threshold is None:
+            threshold = self.compact_threshold
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.tamanho == node.count:
+                continue
+            if node.tamanho - node.count > threshold * node.tamanho:
+                self._rebuild_subtree(node)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+    def _validar(self, point):
+        # ponto com outra dimensão quebraria os cortes no meio de uma
+        # inserção ou reconstrução (IndexError com a árvore já alterada)
+        if len(point) != self.k:
+            raise ValueError(f"Ponto {point} deve ter {self.k} coordenadas")
+
+    def insert(self, point, value=_SEM_VALOR):
+        # ponto já presente: atualiza a carga (se informada) e retorna False
+        self._validar(point)
+        index = self._index
+        if index is not None:
+            node = index.get(tuple(point))
+            if node is not None:
+                return self._insert_existing(node, value)
+        # carga do nó novo, se o ponto não estiver na árvore
+        carga = None if value is _SEM_VALOR else value
+        
         if self.root is None:
-            self.root = Node(point, 0, self.k)
+            self.root = Node(point, 0, self.k, value=carga)
             self.size += 1
+            if index is not None:
+                index[tuple(point)] = self.root
             return True
         
         node = self.root
         depth = 0
+        stats = self._stats
         
         while True:
+            if stats is not None:
+                stats['comparisons'] += 1
             if node.point == point:
-                return False
+                return self._insert_existing(node, value)
             
-            axis = depth % self.k
+            axis = node.axis()
             
             if point[axis] < node.point[axis]:
                 if node.left is None:
-                    node.left = Node(point, depth + 1, self.k)
+                    node.left = Node(point, depth + 1, self.k, (axis + 1) % self.k, carga)
                     node.left.parent = node
                     self.size += 1
-                    self.rebalance()
+                    if index is not None:
+                        index[tuple(point)] = node.left
+                    self._refresh(node)
+                    self._rebalance_path(node)
                     return True
                 else:
                     node = node.left
                     depth += 1
             else:
                 if node.right is None:
-                    node.right = Node(point, depth + 1, self.k)
+                    node.right = Node(point, depth + 1, self.k, (axis + 1) % self.k, carga)
                     node.right.parent = node
                     self.size += 1
-                    self.rebalance()
+                    if index is not None:
+                        index[tuple(point)] = node.right
+                    self._refresh(node)
+                    self._rebalance_path(node)
                     return True
                 else:
                     node = node.right
                     depth += 1
 
-    def delete(self, point):
-        node = self.root
-        parent = None
-        is_left_child = False
-        
-        while node:
-            if node.point == point:
-                break
-            
-            axis = node.axis()
-            parent = node
-            
-            if point[axis] < node.point[axis]:
-                node = node.left
-                is_left_child = True
+    def insert_many(self, points, values=None):
+        # insere um lote; retorna, para cada ponto, o que insert retornaria.
+        # Em values, _SEM_VALOR mantém a carga de um ponto já presente.
+        # Custo: m pontos novos em uma árvore com n vivos descem cada um
+        # pelo seu caminho, O(m log n) amortizado (só as subárvores
+        # desequilibradas são reconstruídas); com m >= n a árvore toda é
+        # reconstruída uma vez, O((n + m) log(n + m)), mais barato que m descidas
+        if values is None:
+            values = [_SEM_VALOR] * len(points)
+        # o lote inteiro é conferido antes de qualquer alteração
+        for point in points:
+            self._validar(point)
+        resultados = []
+        novos = {}
+        for point, value in zip(points, values):
+            key = tuple(point)
+            node = self._find(point)
+            if key in novos:
+                if value is not _SEM_VALOR:
+                    novos[key] = (novos[key][0], value)
+                resultados.append(False)
+            elif node is not None and not node.deleted:
+                if value is not _SEM_VALOR:
+                    node.value = value
+                resultados.append(False)
             else:
-                node = node.right
-                is_left_child = False
+                # lápide: revivida por insert ou descartada na reconstrução
+                novos[key] = (point, None if value is _SEM_VALOR else value)
+                resultados.append(True)
+        if novos and len(novos) < self.size:
+            for point, carga in novos.values():
+                self.insert(point, carga)
+        elif novos:
+            entries = self.items() + list(novos.values())
+            self.size = len(entries)
+            if self._stats is not None:
+                self._stats['rebalance'] += 1
+                self._stats['nodes_rebuilt'] += self.size
+            self._build(entries)
+        return resultados
+
+    def _insert_existing(self, node, value):
+        if not node.deleted:
+            if value is not _SEM_VALOR:
+                node.value = value
+            return False
+        # reinserção de um ponto removido: basta reviver o nó (a carga do
+        # ponto removido não volta)
+        node.value = None if value is _SEM_VALOR else value
+        node.deleted = False
+        self.dead -= 1
+        self.size += 1
+        self._refresh(node)
+        return True
+
+    def delete(self, point):
+        node = self._find(point)
         
-        if node is None or node.point != point:
+        if node is None or node.deleted:
             return False
         
         self.size -= 1
 
-        # sem filho
-        if node.left is None and node.right is None:
-            if parent is None:
-                self.root = None
-            elif is_left_child:
-                parent.left = None
-            else:
-                parent.right = None
-        
-        # só filho esquerdo
-        elif node.right is None:
-            if parent is None:
-                self.root = node.left
-            elif is_left_child:
-                parent.left = node.left
-            else:
-                parent.right = node.left
-            
-            if node.left:
-                node.left.parent = parent
-        
-        # só filho direito
-        elif node.left is None:
-            if parent is None:
-                self.root = node.right
-            elif is_left_child:
-                parent.left = node.right
-            else:
-                parent.right = node.right
-            
-            if node.right:
-                node.right.parent = parent
+        if self.lazy_delete:
+            node.deleted = True
+            self.dead += 1
+            self._refresh(node)
+            self._compact_path(node)
+            return True
+
+        if self._index is not None:
+            del self._index[tuple(node.point)]
+
+        # dois filhos: o ponto de menor coordenada no eixo do nó, dentro da
+        # subárvore direita, sobe para o lugar dele (a direita continua com
+        # coordenadas >= e a esquerda com <) e passa a ser o nó a remover
+        while node.left is not None and node.right is not None:
+            substituto = self._min_node(node.right, node.axis())
+            node.point = substituto.point
+            node.value = substituto.value
+            node.deleted = substituto.deleted
+            if self._index is not None:
+                self._index[tuple(node.point)] = node
+            node = substituto
         
-        # dois filhos
+        # no máximo um filho: ele ocupa o lugar do nó
+        parent = node.parent
+        filho = node.left if node.left is not None else node.right
+        if parent is None:
+            self.root = filho
+        elif parent.left is node:
+            parent.left = filho
         else:
-            min_node = node.right
-            min_parent = node
-            
-            while min_node.left:
-                min_parent = min_node
-                min_node = min_node.left
-            
-            node.point = min_node.point
-            
-            if min_parent == node:
-                node.right = min_node.right
-                if min_node.right:
-                    min_node.right.parent = node
-            else:
-                min_parent.left = min_node.right
-                if min_node.right:
-                    min_node.right.parent = min_parent
+            parent.right = filho
+        if filho is not None:
+            filho.parent = parent
         
-        if self.root:
-            self.rebalance()
+        self._refresh(parent)
+        self._rebalance_path(parent)
         
         return True
 
+    def _min_node(self, node, axis):
+        # nó de menor coordenada no eixo axis dentro da subárvore de node
+        melhor = node
+        stack = [node]
+        while stack:
+            atual = stack.pop()
+            if atual.point[axis] < melhor.point[axis]:
+                melhor = atual
+            # a caixa da subárvore diz se ela ainda pode ter um valor menor;
+            # quem corta no mesmo eixo tem à direita só coordenadas >=
+            for filho in (atual.left, None if atual.axis() == axis else atual.right):
+                if filho is not None and filho.low[axis] < melhor.point[axis]:
+                    stack.append(filho)
+        return melhor
+
     def search(self, point):
-        node = self.root
-        depth = 0
-        
-        while node is not None:
-            if node.point == point:
-                return node.point
-            
-            axis = depth % self.k
-            
-            if point[axis] < node.point[axis]:
-                node = node.left
-            else:
-                node = node.right
-            
-            depth += 1
-        
-        return None
+        node = self._find(point)
+        if node is None or node.deleted:
+            return None
+        return node.point
 
     def rebalance(self):
-        if self.size < 3:
+        # reconstrução completa (mediana por nível) da árvore
+        if self.size < 3 and not self.dead:
             return
+        self._rebuild()
 
-        points = []
-        stack = [self.root]
-        
+    def _rebalance_path(self, node):
+        # reconstrói a subárvore mais alta, de node até a raiz, com um filho
+        # grande demais (as folgas de ALPHA mantêm a altura O(log n))
+        alvo = None
+        while node is not None:
+            maior = max(node.left.tamanho if node.left else 0,
+                        node.right.tamanho if node.right else 0)
+            if maior > self.ALPHA * node.tamanho:
+                alvo = node
+            node = node.parent
+        if alvo is not None:
+            self._rebuild_subtree(alvo)
+
+    def _compact_path(self, node):
+        # compacta a subárvore mais alta, de node até a raiz, em que as
+        # lápides passam de compact_threshold
+        alvo = None
+        while node is not None:
+            grande = node.tamanho >= self.COMPACT_MIN_NODES or node.parent is None
+            if grande and node.tamanho - node.count > self.compact_threshold * node.tamanho:
+                alvo = node
+            node = node.parent
+        if alvo is not None:
+            self._rebuild_subtree(alvo)
+
+    def _rebuild(self):
+        if self._stats is not None:
+            self._stats['rebalance'] += 1
+            self._stats['nodes_rebuilt'] += self.size
+
+        self._build(self.items())
+
+    def _rebuild_subtree(self, node):
+        # reconstrói a subárvore de node, no mesmo lugar, só com os pontos vivos
+        entries = []
+        removidas = 0
+        stack = [node]
         while stack:
-            node = stack.pop()
-            if node:
-                points.append(node.point)
-                if node.right:
-                    stack.append(node.right)
-                if node.left:
-                    stack.append(node.left)
-        
-        if not points:
+            atual = stack.pop()
+            if atual is None:
+                continue
+            if atual.deleted:
+                removidas += 1
+                if self._index is not None:
+                    del self._index[tuple(atual.point)]
+            else:
+                entries.append((atual.point, atual.value))
+            stack.append(atual.right)
+            stack.append(atual.left)
+        self.dead -= removidas
+        if self._stats is not None:
+            self._stats['rebalance'] += 1
+            self._stats['nodes_rebuilt'] += len(entries)
+
+        parent = node.parent
+        # profundidade real (remoções sem lápide sobem subárvores)
+        depth = 0
+        ancestral = parent
+        while ancestral is not None:
+            depth += 1
+            ancestral = ancestral.parent
+        is_left = parent is not None and parent.left is node
+        if parent is None:
             self.root = None
-            return
+        elif is_left:
+            parent.left = None
+        else:
+            parent.right = None
+        novo = self._build_subtree(entries, depth, parent, is_left)
+        if parent is None:
+            self.root = novo
+        self._refresh(parent)
+
+    def _build(self, entries):
+        # entries: lista de pares (ponto, carga); substitui a árvore inteira
+        self.dead = 0
+        if self._index is not None:
+            self._index.clear()
+        self.root = self._build_subtree(entries, 0, None, False)
+
+    def _build_subtree(self, entries, depth, parent, is_left):
+        # monta entries (mediana por nível) como filho de parent e retorna a
+        # raiz da nova subárvore (None se entries for vazio)
+        if not entries:
+            return None
         
-        stack = [(0, len(points), 0, None, False)]
-        self.root = None
+        stack = [(0, len(entries), depth, parent, is_left)]
+        criados = []
         
         while stack:
             start, end, depth, parent, is_left = stack.pop()
@@ -185,24 +538,246 @@ class KDTree:
             if start >= end:
                 continue
             
-            axis = depth % self.k
-            mid = (start + end) // 2
-            points[start:end] = sorted(points[start:end], key=lambda p: p[axis])
+            axis = self._split_axis(entries, start, end, depth)
+            entries[start:end] = sorted(entries[start:end], key=lambda e: e[0][axis])
+            if self.split_policy == 'sliding_midpoint':
+                # corta no ponto mais próximo do meio da extensão, não na mediana
+                coords = [e[0][axis] for e in entries[start:end]]
+                meio = (coords[0] + coords[-1]) / 2
+                mid = min(start + bisect.bisect_left(coords, meio), end - 1)
+            else:
+                mid = (start + end) // 2
+            # a busca desce à direita quando a coordenada é igual, então
+            # pontos empatados com a mediana não podem ficar à esquerda
+            while mid > start and entries[mid - 1][0][axis] == entries[mid][0][axis]:
+                mid -= 1
             
-            node = Node(points[mid], depth, self.k)
+            point, value = entries[mid]
+            node = Node(point, depth, self.k, axis, value)
             node.parent = parent
+            criados.append(node)
             
-            if parent is None:
-                self.root = node
-            elif is_left:
-                parent.left = node
-            else:
-                parent.right = node
+            if parent is not None:
+                if is_left:
+                    parent.left = node
+                else:
+                    parent.right = node
             
             if mid + 1 < end:
                 stack.append((mid + 1, end, depth + 1, node, False))
             if start < mid:
                 stack.append((start, mid, depth + 1, node, True))
+        
+        # pais são criados antes dos filhos: caixas de baixo para cima
+        for node in reversed(criados):
+            self._annotate(node)
+        if self._index is not None:
+            for node in criados:
+                self._index[tuple(node.point)] = node
+        return criados[0]
+
+    def _annotate(self, node):
+        # recalcula caixa e contagem de node a partir dos filhos
+        low = list(node.point)
+        high = list(node.point)
+        count = 0 if node.deleted else 1
+        tamanho = 1
+        for child in (node.left, node.right):
+            if child is not None:
+                for i in range(self.k):
+                    if child.low[i] < low[i]:
+                        low[i] = child.low[i]
+                    if child.high[i] > high[i]:
+                        high[i] = child.high[i]
+                count += child.count
+                tamanho += child.tamanho
+        node.low, node.high, node.count, node.tamanho = low, high, count, tamanho
+
+    def _refresh(self, node):
+        # propaga uma alteração em node até a raiz
+        while node is not None:
+            self._annotate(node)
+            node = node.parent
+
+    def nearest(self, target, n=1):
+        # n vizinhos mais próximos: lista de (distância, ponto) em ordem crescente
+        if n < 1:
+            return []
+        heap = []  # max-heap por -distância²
+        contador = 0
+        stats = self._stats
+        stack = [(self.root, 0.0)]
+        
+        while stack:
+            node, box_d2 = stack.pop()
+            if node is None or node.count == 0:
+                continue
+            # poda: a caixa da subárvore já está mais longe que o n-ésimo melhor
+            if len(heap) == n and box_d2 >= -heap[0][0]:
+                continue
+            if stats is not None:
+                stats['nodes_visited'] += 1
+            
+            if not node.deleted:
+                d2 = _dist2(node.point, target)
+                contador += 1
+                if len(heap) < n:
+                    heapq.heappush(heap, (-d2, contador, node.point))
+                elif d2 < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d2, contador, node.point))
+            
+            axis = node.axis()
+            diff = target[axis] - node.point[axis]
+            if diff < 0:
+                near, far = node.left, node.right
+            else:
+                near, far = node.right, node.left
+            # o lado próximo é empilhado por último para ser visitado primeiro
+            if far is not None:
+                stack.append((far, _dist2_box(target, far.low, far.high)))
+            if near is not None:
+                stack.append((near, _dist2_box(target, near.low, near.high)))
+        
+        return [(sqrt(-d2), point) for d2, _, point in sorted(heap, reverse=True)]
+
+    def approximate_nearest(self, target, n=1, eps=0.0, max_checks=None):
+        # busca best-bin-first: as subárvores pendentes ficam numa fila de
+        # prioridade pela distância mínima à sua caixa envolvente. Uma subárvore é
+        # podada se não puder melhorar o n-ésimo melhor por um fator (1+eps),
+        # e a busca para após max_checks nós visitados.
+        # Retorna (lista de (distância, ponto), nós visitados).
+        if n < 1 or self.root is None:
+            return [], 0
+        fator = (1.0 + eps) ** 2
+        heap = []  # max-heap por -distância²
+        fila = [(0.0, 0, self.root)]
+        contador = 0
+        visitados = 0
+        
+        while fila:
+            bound, _, node = heapq.heappop(fila)
+            if len(heap) == n and bound * fator >= -heap[0][0]:
+                break
+            
+            # desce até a folha pelo lado próximo, enfileirando o lado distante
+            while node is not None:
+                if max_checks is not None and visitados >= max_checks:
+                    fila = []
+                    break
+                visitados += 1
+                
+                if not node.deleted:
+                    d2 = _dist2(node.point, target)
+                    contador += 1
+                    if len(heap) < n:
+                        heapq.heappush(heap, (-d2, contador, node.point))
+                    elif d2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d2, contador, node.point))
+                
+                axis = node.axis()
+                diff = target[axis] - node.point[axis]
+                if diff < 0:
+                    near, far = node.left, node.right
+                else:
+                    near, far = node.right, node.left
+                
+                if far is not None and far.count:
+                    far_bound = _dist2_box(target, far.low, far.high)
+                    if len(heap) < n or far_bound * fator < -heap[0][0]:
+                        contador += 1
+                        heapq.heappush(fila, (far_bound, contador, far))
+                node = near
+        
+        result = [(sqrt(-d2), point) for d2, _, point in sorted(heap, reverse=True)]
+        return result, visitados
+
+    def range_search(self, low, high):
+        # pontos p com low[i] <= p[i] <= high[i] em todas as coordenadas.
+        # Subárvores cuja caixa está contida na consulta são copiadas sem testes.
+        result = []
+        stats = self._stats
+        stack = [self.root]
+        
+        while stack:
+            node = stack.pop()
+            if node is None or node.count == 0:
+                continue
+            if stats is not None:
+                stats['nodes_visited'] += 1
+            
+            relacao = _box_relation(node.low, node.high, low, high)
+            if relacao == 0:
+                continue
+            if relacao == 2:
+                result.extend(n.point for n in self._subtree_nodes(node))
+                continue
+            
+            point = node.point
+            if not node.deleted and all(lo <= c <= hi for lo, c, hi in zip(low, point, high)):
+                result.append(point)
+            stack.append(node.left)
+            stack.append(node.right)
+        
+        return result
+
+    def range_count(self, low, high):
+        # quantidade de pontos na caixa [low, high]; subárvores contidas na
+        # consulta contribuem com a contagem armazenada, sem serem visitadas
+        total = 0
+        stats = self._stats
+        stack = [self.root]
+        
+        while stack:
+            node = stack.pop()
+            if node is None or node.count == 0:
+                continue
+            if stats is not None:
+                stats['nodes_visited'] += 1
+            
+            relacao = _box_relation(node.low, node.high, low, high)
+            if relacao == 0:
+                continue
+            if relacao == 2:
+                total += node.count
+                continue
+            
+            if not node.deleted and all(lo <= c <= hi for lo, c, hi in zip(low, node.point, high)):
+                total += 1
+            stack.append(node.left)
+            stack.append(node.right)
+        
+        return total
+
+    def _subtree_nodes(self, node):
+        # nós vivos da subárvore, em pré-ordem
+        result = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is not None and node.count:
+                if not node.deleted:
+                    result.append(node)
+                stack.append(node.right)
+                stack.append(node.left)
+        return result
+
+    def _split_axis(self, entries, start, end, depth):
+        if self.split_policy == 'round_robin':
+            return depth % self.k
+        
+        n = end - start
+        best_axis, best_score = 0, -1.0
+        for axis in range(self.k):
+            coords = [e[0][axis] for e in entries[start:end]]
+            if self.split_policy == 'max_variance':
+                media = sum(coords) / n
+                score = sum((c - media) * (c - media) for c in coords)
+            else:
+                # max_spread e sliding_midpoint: maior extensão
+                score = max(coords) - min(coords)
+            if score > best_score:
+                best_axis, best_score = axis, score
+        return best_axis
 
     def print_tree(self, filename, silent):
         if self.root is None:
@@ -210,49 +785,73 @@ class KDTree:
                 print("Árvore vazia!")
             return ""
         
-        digraph = Digraph(comment='k-D Tree', format='png')
-        digraph.attr(rankdir='TB', bgcolor='white')
-        digraph.attr('node', shape='circle', style='filled', fillcolor='#4ECDC4', 
-                color='black', penwidth='2.5', fontname='monospace', fontsize='14', fontweight='bold')
-        digraph.attr('edge', color='black', penwidth='2')
-        
-        counter = [0]
-        self.add_nodes(self.root, digraph, counter)
+        digraph = self._build_graph(self._copiar_estrutura())
         
         output_path = digraph.render(filename, cleanup=True)
         if not silent:
             print(f"Visualização gerada: {output_path}")
         return output_path
     
-    def add_nodes(self, root, digraph, counter):
-        if root is None:
-            return
+    def to_dot(self):
+        # código DOT do estado atual
+        return self.dot_snapshot()()
+
+    def dot_snapshot(self):
+        # copia só rótulos e lápides agora; o Digraph é montado por quem
+        # chamar a função retornada (p. ex. a thread do BackgroundRenderer)
+        copia = self._copiar_estrutura()
+        return lambda: self._build_graph(copia).source
+
+    def _copiar_estrutura(self):
+        # pré-ordem (esquerda antes da direita): (rótulo, removido, índice do pai)
+        copia = []
+        stack = [(self.root, None)] if self.root is not None else []
+        while stack:
+            node, pai = stack.pop()
+            label = '\n'.join(f"{c:.0f}" for c in node.point)
+            copia.append((label, node.deleted, pai))
+            indice = len(copia) - 1
+            if node.right:
+                stack.append((node.right, indice))
+            if node.left:
+                stack.append((node.left, indice))
+        return copia
+
+    def _build_graph(self, copia):
+        # graphviz só é importado quando há visualização
+        try:
+            from graphviz import Digraph
+        except ImportError:
+            raise ImportError(
+                "Biblioteca graphviz não está instalada.\n"
+                "Execute: pip install graphviz\n\n"
+                "Também é necessário instalar o executável Graphviz no sistema:\n"
+                "- Windows: https://graphviz.org/download/ ou 'winget install graphviz'\n"
+                "- Linux: sudo apt install graphviz\n"
+                "- Mac: brew install graphviz"
+            )
         
-        # pilha   node parent_id é_raiz
-        stack = [(root, None, True)]
+        digraph = Digraph(comment='k-D Tree', format='png')
+        digraph.attr(rankdir='TB', bgcolor='white')
+        digraph.attr('node', shape='circle', style='filled', fillcolor='#4ECDC4', 
+                color='black', penwidth='2.5', fontname='monospace', fontsize='14', fontweight='bold')
+        digraph.attr('edge', color='black', penwidth='2')
         
-        while stack:
-            node, parent_id, eh_raiz = stack.pop()
-            
-            if node is None:
-                continue
-            
-            counter[0] += 1
-            node_id = f"node_{counter[0]}"
-            
-            coords_str = ', '.join(f"{c:.0f}" for c in node.point)
-            label = coords_str.replace(', ', '\n')
+        self.add_nodes(copia, digraph)
+        return digraph
+    
+    def add_nodes(self, copia, digraph):
+        # copia vem de _copiar_estrutura; o nó i recebe o id node_{i + 1}
+        for i, (label, removido, pai) in enumerate(copia):
+            node_id = f"node_{i + 1}"
             
-            if eh_raiz:
+            if removido:
+                # lápide (remoção preguiçosa) aguardando compactação
+                digraph.node(node_id, label=label, fillcolor='lightgray', style='filled,dashed')
+            elif pai is None:
                 digraph.node(node_id, label=label, fillcolor='#FF6B6B', fontsize='16')
             else:
                 digraph.node(node_id, label=label)
 
-            if parent_id is not None:
-                digraph.edge(parent_id, node_id)
-            
-            # adicionando os filhos
-            if node.right:
-                stack.append((node.right, node_id, False))
-            if node.left:
-                stack.append((node.left, node_id, False))
+            if pai is not None:
+                digraph.edge(f"node_{pai + 1}", node_id)
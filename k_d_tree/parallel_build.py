@@ -0,0 +1,92 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .compact_kd_tree import STORAGE, CompactKDTree, _ordenar
+
+# Construção paralela da CompactKDTree. O coordenador codifica os pontos,
+# resolve os níveis de cima da árvore (mediana por nível) e grava as linhas
+# já permutadas num bloco de memória compartilhada. No layout implícito,
+# cada subárvore abaixo desses níveis é uma fatia contígua do buffer final,
+# então os workers constroem suas fatias no lugar, sem copiar a árvore
+# entre processos, e o resultado é idêntico ao da construção sequencial.
+
+
+def _construir_fatia(nomes, typecode, k, start, end, depth):
+    # worker: monta a subárvore da fatia [start, end) direto nos buffers
+    # compartilhados de coordenadas, eixos e ordem original dos pontos
+    blocos = [shared_memory.SharedMemory(name=nome) for nome in nomes]
+    try:
+        coords = blocos[0].buf.cast(typecode)
+        eixos = blocos[1].buf
+        ordem = blocos[2].buf.cast('q')
+
+        m = end - start
+        linhas = [coords[(start + j) * k:(start + j + 1) * k].tolist() for j in range(m)]
+        local = list(range(m))
+        eixos_local = [0] * m
+        _ordenar(linhas, local, eixos_local, 0, m, depth, k)
+
+        coords[start * k:end * k] = array(typecode, (c for j in local for c in linhas[j]))
+        eixos[start:end] = bytes(eixos_local)
+        originais = ordem[start:end].tolist()
+        ordem[start:end] = array('q', (originais[j] for j in local))
+        del coords, eixos, ordem
+    finally:
+        for bloco in blocos:
+            bloco.close()
+    return end - start
+
+
+def build_parallel(points, k, workers=2, values=None, storage='float64',
+                   scale=None, offset=None, fatias_por_worker=4):
+    # mesma assinatura de CompactKDTree.build, mais o número de processos;
+    # o coordenador resolve níveis até haver ~fatias_por_worker fatias por worker
+    tree = CompactKDTree(k, storage, scale, offset)
+    if values is None:
+        unicos = list({tuple(p): None for p in points}.items())
+    else:
+        unicos = list({tuple(p): v for p, v in zip(points, values)}.items())
+    pontos = [p for p, _ in unicos]
+    if workers <= 1 or len(pontos) < 2 * workers:
+        tree._build(pontos, [v for _, v in unicos] if values is not None else None)
+        return tree
+
+    codificados = tree._codificar_todos(pontos)
+    n = len(codificados)
+    ordem = list(range(n))
+    eixos = [0] * n
+    ate = max(1, (workers * fatias_por_worker - 1).bit_length())
+    pendentes = _ordenar(codificados, ordem, eixos, 0, n, 0, k, ate=ate)
+
+    typecode = STORAGE[storage][0]
+    linhas = array(typecode, (c for i in ordem for c in codificados[i]))
+    del codificados
+    blocos = [shared_memory.SharedMemory(create=True, size=max(1, tamanho))
+              for tamanho in (len(linhas) * linhas.itemsize, n, n * 8)]
+    try:
+        blocos[0].buf[:len(linhas) * linhas.itemsize] = linhas.tobytes()
+        blocos[1].buf[:n] = bytes(eixos)
+        blocos[2].buf[:n * 8] = array('q', ordem).tobytes()
+        del linhas, ordem, eixos
+
+        nomes = [bloco.name for bloco in blocos]
+        # fatias maiores primeiro, para equilibrar a carga
+        pendentes.sort(key=lambda fatia: fatia[0] - fatia[1])
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tarefas = [executor.submit(_construir_fatia, nomes, typecode, k, start, end, depth)
+                       for start, end, depth in pendentes]
+            for tarefa in tarefas:
+                tarefa.result()
+
+        coords = array(typecode)
+        coords.frombytes(bytes(blocos[0].buf[:n * k * coords.itemsize]))
+        ordem = array('q')
+        ordem.frombytes(bytes(blocos[2].buf[:n * 8]))
+        tree._montar(coords, bytes(blocos[1].buf[:n]),
+                     [unicos[i][1] for i in ordem] if values is not None else None)
+    finally:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+    return tree
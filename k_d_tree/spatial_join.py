@@ -0,0 +1,206 @@
+import heapq
+from math import dist, inf, sqrt
+
+from .k_d_tree import _dist2
+
+# Travessias duplas (dual-tree) entre duas KDTrees. Em vez de uma consulta
+# por ponto, os pares de subárvores são visitados juntos e um par inteiro é
+# podado quando a distância mínima entre as caixas envolventes já excede o
+# raio (ou o k-ésimo vizinho atual). Cada subárvore é decomposta em
+# {nó} ∪ esquerda ∪ direita, então todo par de pontos é visto uma única vez.
+# Pares pequenos (até FOLHA pares de pontos) são resolvidos por força bruta.
+
+FOLHA = 16
+
+# campos de um item (subárvore inteira ou apenas o ponto de um nó)
+_LOW, _HIGH, _INICIO, _FIM, _DIAG, _NO, _INTEIRO = range(7)
+
+
+def _anotar(tree):
+    # Percorre a árvore uma vez e devolve (nos, partes, raiz):
+    # - nos: nós em pré-ordem (toda subárvore é uma fatia contígua)
+    # - partes[node]: decomposição do item da subárvore de node
+    # - raiz: item da subárvore inteira
+    # Um item é (low, high, inicio, fim, diagonal², nó, inteiro), onde
+    # low/high é a caixa envolvente mantida no nó e [inicio, fim) a fatia em nos.
+    if tree.root is None:
+        return [], {}, None
+    nos = []
+    fatias = {}
+    stack = [(tree.root, False)]
+    while stack:
+        node, fechado = stack.pop()
+        if not fechado:
+            fatias[node] = [len(nos), len(nos) + 1]
+            nos.append(node)
+            stack.append((node, True))
+            if node.right is not None:
+                stack.append((node.right, False))
+            if node.left is not None:
+                stack.append((node.left, False))
+            continue
+        # a fatia termina onde termina a do último filho
+        for filho in (node.left, node.right):
+            if filho is not None and fatias[filho][1] > fatias[node][1]:
+                fatias[node][1] = fatias[filho][1]
+
+    itens = {node: (node.low, node.high, inicio, fim, _dist2(node.low, node.high), node, True)
+             for node, (inicio, fim) in fatias.items()}
+    partes = {}
+    for node in nos:
+        inicio = fatias[node][0]
+        partes[node] = [(node.point, node.point, inicio, inicio + 1, 0.0, node, False)]
+        for filho in (node.left, node.right):
+            if filho is not None:
+                partes[node].append(itens[filho])
+    return nos, partes, itens[tree.root]
+
+
+def _dist2_caixas(a, b):
+    total = 0.0
+    for a0, a1, b0, b1 in zip(a[_LOW], a[_HIGH], b[_LOW], b[_HIGH]):
+        if a1 < b0:
+            d = b0 - a1
+        elif b1 < a0:
+            d = a0 - b1
+        else:
+            continue
+        total += d * d
+    return total
+
+
+def _dividir(a, b, partes_a, partes_b):
+    # divide o lado cuja caixa é maior (itens de um ponto não se dividem)
+    if a[_INTEIRO] and (not b[_INTEIRO] or a[_DIAG] >= b[_DIAG]):
+        return [(parte, b) for parte in partes_a[a[_NO]]]
+    return [(a, parte) for parte in partes_b[b[_NO]]]
+
+
+def pairs_within(tree_a, tree_b, r):
+    # gera (ponto_a, ponto_b, distância) para todo par com distância <= r.
+    # Com tree_b igual a tree_a (auto-junção), cada par não ordenado de
+    # pontos distintos aparece uma única vez.
+    if tree_a.root is None or tree_b.root is None:
+        return
+    r2 = r * r
+    mesma = tree_a is tree_b
+    nos_a, partes_a, raiz_a = _anotar(tree_a)
+    nos_b, partes_b, raiz_b = (nos_a, partes_a, raiz_a) if mesma else _anotar(tree_b)
+    stack = [(raiz_a, raiz_b)]
+
+    while stack:
+        a, b = stack.pop()
+        inicio_a, fim_a = a[_INICIO], a[_FIM]
+        inicio_b, fim_b = b[_INICIO], b[_FIM]
+
+        if (fim_a - inicio_a) * (fim_b - inicio_b) <= FOLHA:
+            for i in range(inicio_a, fim_a):
+                na = nos_a[i]
+                if na.deleted:
+                    continue
+                # na auto-junção, apenas os índices j > i
+                for j in range(max(inicio_b, i + 1) if mesma else inicio_b, fim_b):
+                    nb = nos_b[j]
+                    if not nb.deleted:
+                        d = dist(na.point, nb.point)
+                        if d <= r:
+                            yield na.point, nb.point, d
+            continue
+
+        for filho_a, filho_b in _dividir(a, b, partes_a, partes_b):
+            # auto-junção: só pares com índice(a) < índice(b) em pré-ordem
+            if mesma and filho_a[_INICIO] >= filho_b[_FIM] - 1:
+                continue
+            if _dist2_caixas(filho_a, filho_b) <= r2:
+                stack.append((filho_a, filho_b))
+
+
+def knn_join(query_tree, reference_tree, n=1):
+    # para cada ponto vivo de query_tree, seus n vizinhos mais próximos em
+    # reference_tree: {tuple(ponto): [(distância, vizinho), ...]} em ordem
+    # crescente. Com a mesma árvore dos dois lados o próprio ponto é ignorado.
+    if n < 1 or query_tree.root is None:
+        return {}
+    mesma = query_tree is reference_tree
+    nos_q, partes_q, raiz_q = _anotar(query_tree)
+    nos_r, partes_r, raiz_r = (nos_q, partes_q, raiz_q) if mesma else _anotar(reference_tree)
+    if raiz_r is None:
+        return {tuple(node.point): [] for node in nos_q if not node.deleted}
+
+    heaps = {node: [] for node in nos_q}  # max-heap por -distância²
+
+    def kesimo(node):
+        # distância² que um candidato precisa superar; lápides não consultam
+        if node.deleted:
+            return -1.0
+        heap = heaps[node]
+        return -heap[0][0] if len(heap) == n else inf
+
+    # limite[node]: maior kesimo da subárvore (filhos antes dos pais)
+    limite = {}
+    for node in reversed(nos_q):
+        valor = kesimo(node)
+        for filho in (node.left, node.right):
+            if filho is not None and limite[filho] > valor:
+                valor = limite[filho]
+        limite[node] = valor
+
+    def atualizar(node):
+        # propaga a redução do kesimo de um ponto até a raiz
+        while node is not None:
+            valor = kesimo(node)
+            for filho in (node.left, node.right):
+                if filho is not None and limite[filho] > valor:
+                    valor = limite[filho]
+            if valor == limite[node]:
+                break
+            limite[node] = valor
+            node = node.parent
+
+    contador = 0
+    stack = [(0.0, raiz_q, raiz_r)]
+
+    while stack:
+        d2_caixas, q, ref = stack.pop()
+        nq = q[_NO]
+        if d2_caixas >= (limite[nq] if q[_INTEIRO] else kesimo(nq)):
+            continue
+        inicio_q, fim_q = q[_INICIO], q[_FIM]
+        inicio_r, fim_r = ref[_INICIO], ref[_FIM]
+
+        if (fim_q - inicio_q) * (fim_r - inicio_r) <= FOLHA:
+            for i in range(inicio_q, fim_q):
+                nq = nos_q[i]
+                if nq.deleted:
+                    continue
+                heap = heaps[nq]
+                antes = kesimo(nq)
+                for j in range(inicio_r, fim_r):
+                    nr = nos_r[j]
+                    if nr.deleted or (mesma and nr is nq):
+                        continue
+                    d = dist(nq.point, nr.point)
+                    d2 = d * d
+                    contador += 1
+                    if len(heap) < n:
+                        heapq.heappush(heap, (-d2, contador, nr.point))
+                    elif d2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d2, contador, nr.point))
+                if kesimo(nq) != antes:
+                    atualizar(nq)
+            continue
+
+        pares = [(_dist2_caixas(filho_q, filho_r), filho_q, filho_r)
+                 for filho_q, filho_r in _dividir(q, ref, partes_q, partes_r)]
+        # os pares mais próximos são empilhados por último para serem
+        # visitados primeiro e apertarem os limites mais cedo
+        pares.sort(key=lambda par: par[0], reverse=True)
+        stack.extend(pares)
+
+    return {tuple(node.point): [(sqrt(-d2), point) for d2, _, point in sorted(heaps[node], reverse=True)]
+            for node in nos_q if not node.deleted}
+
+
+def all_knn(tree, n=1):
+    # grafo dos n vizinhos mais próximos de todos os pontos da árvore
+    return knn_join(tree, tree, n)
@@ -0,0 +1,293 @@
+import heapq
+import random
+from math import dist, sqrt
+
+
+class VPNode:
+    def __init__(self, point):
+        self.point = point
+        # corte por distância ao ponto de vantagem: dentro (d < mu) ou
+        # fora (d >= mu); mu é None enquanto o nó não tem descendentes
+        self.mu = None
+        # maior distância do ponto de vantagem a um descendente
+        self.raio = 0.0
+        self.inside = None
+        self.outside = None
+        self.deleted = False
+        # nós da subárvore (incluindo lápides), usado no reequilíbrio
+        self.tamanho = 1
+
+
+class VPTree:
+    # Vantage-point tree: cada nó separa os descendentes pela distância ao
+    # seu ponto (dentro ou fora de uma esfera de raio mu) em vez de por uma
+    # única coordenada, então a poda continua funcionando em dimensões altas.
+    # Mesma API pública da KDTree. O equilíbrio segue a ideia da scapegoat
+    # tree: a subárvore mais alta desbalanceada no caminho de uma inserção é
+    # reconstruída. Remoções são lápides, compactadas por limiar.
+
+    # fração máxima do tamanho de um nó que um filho pode ter
+    ALPHA = 0.75
+
+    def __init__(self, k, compact_threshold=0.25, seed=0):
+        self.k = k
+        self.root = None
+        # size conta apenas pontos vivos
+        self.size = 0
+        self.dead = 0
+        self.compact_threshold = compact_threshold
+        # escolha dos pontos de vantagem
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def build(cls, points, k, **kwargs):
+        tree = cls(k, **kwargs)
+        unicos = list({tuple(p): p for p in points}.values())
+        tree.size = len(unicos)
+        tree.root = tree._build(unicos)
+        return tree
+
+    def points(self):
+        # pontos vivos, em pré-ordem
+        result = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node:
+                if not node.deleted:
+                    result.append(node.point)
+                stack.append(node.outside)
+                stack.append(node.inside)
+        return result
+
+    def dead_ratio(self):
+        total = self.size + self.dead
+        return self.dead / total if total else 0.0
+
+    def compact(self):
+        self.root = self._build(self.points())
+        self.dead = 0
+
+    def _find(self, point):
+        node = self.root
+        while node is not None:
+            if node.point == point:
+                return node
+            if node.mu is None:
+                return None
+            if dist(point, node.point) < node.mu:
+                node = node.inside
+            else:
+                node = node.outside
+        return None
+
+    def insert(self, point):
+        if self.root is None:
+            self.root = VPNode(point)
+            self.size += 1
+            return True
+
+        found = self._find(point)
+        if found is not None:
+            if not found.deleted:
+                return False
+            # reinserção de um ponto removido: basta reviver o nó
+            found.deleted = False
+            self.dead -= 1
+            self.size += 1
+            return True
+
+        caminho = []
+        node = self.root
+        while True:
+            caminho.append(node)
+            node.tamanho += 1
+            d = dist(point, node.point)
+            if d > node.raio:
+                node.raio = d
+            if node.mu is None:
+                # primeiro descendente de uma folha define o corte
+                node.mu = d
+
+            if d < node.mu:
+                if node.inside is None:
+                    node.inside = VPNode(point)
+                    break
+                node = node.inside
+            else:
+                if node.outside is None:
+                    node.outside = VPNode(point)
+                    break
+                node = node.outside
+
+        self.size += 1
+        self._rebalance(caminho)
+        return True
+
+    def _rebalance(self, caminho):
+        # reconstrói a subárvore mais alta do caminho com um filho grande demais
+        for i, node in enumerate(caminho):
+            maior = max(node.inside.tamanho if node.inside else 0,
+                        node.outside.tamanho if node.outside else 0)
+            if maior <= self.ALPHA * node.tamanho:
+                continue
+
+            pontos = []
+            stack = [node]
+            while stack:
+                atual = stack.pop()
+                if atual:
+                    if not atual.deleted:
+                        pontos.append(atual.point)
+                    stack.append(atual.outside)
+                    stack.append(atual.inside)
+            removidas = node.tamanho - len(pontos)
+            self.dead -= removidas
+            # as lápides descartadas saem da contagem dos ancestrais
+            for ancestral in caminho[:i]:
+                ancestral.tamanho -= removidas
+            novo = self._build(pontos)
+
+            if i == 0:
+                self.root = novo
+            elif caminho[i - 1].inside is node:
+                caminho[i - 1].inside = novo
+            else:
+                caminho[i - 1].outside = novo
+            return
+
+    def _build(self, points):
+        # construção em lote: ponto de vantagem aleatório e corte na
+        # distância mediana dos demais pontos da fatia
+        if not points:
+            return None
+        points = list(points)
+        root = None
+        stack = [(0, len(points), None, False)]
+
+        while stack:
+            start, end, parent, is_inside = stack.pop()
+            if start >= end:
+                continue
+
+            i = self._rng.randrange(start, end)
+            points[start], points[i] = points[i], points[start]
+            vp = points[start]
+            node = VPNode(vp)
+            node.tamanho = end - start
+
+            if parent is None:
+                root = node
+            elif is_inside:
+                parent.inside = node
+            else:
+                parent.outside = node
+
+            if end - start == 1:
+                continue
+
+            pares = sorted(((dist(vp, p), p) for p in points[start + 1:end]),
+                           key=lambda par: par[0])
+            points[start + 1:end] = [p for _, p in pares]
+            mid = (end - start - 1) // 2
+            # a busca vai para fora quando a distância é igual a mu, então
+            # pontos empatados com a mediana não podem ficar dentro
+            while mid > 0 and pares[mid - 1][0] == pares[mid][0]:
+                mid -= 1
+            node.mu = pares[mid][0]
+            node.raio = pares[-1][0]
+
+            stack.append((start + 1 + mid, end, node, False))
+            stack.append((start + 1, start + 1 + mid, node, True))
+
+        return root
+
+    def delete(self, point):
+        node = self._find(point)
+        if node is None or node.deleted:
+            return False
+        node.deleted = True
+        self.size -= 1
+        self.dead += 1
+        if self.dead_ratio() > self.compact_threshold:
+            self.compact()
+        return True
+
+    def search(self, point):
+        node = self._find(point)
+        if node is None or node.deleted:
+            return None
+        return node.point
+
+    def nearest(self, target, n=1):
+        # n vizinhos mais próximos: lista de (distância, ponto) em ordem crescente
+        if n < 1:
+            return []
+        heap = []  # max-heap por -distância
+        contador = 0
+        # (nó, limite inferior da distância de target à subárvore)
+        stack = [(self.root, 0.0)]
+
+        while stack:
+            node, bound = stack.pop()
+            if node is None:
+                continue
+            if len(heap) == n and bound >= -heap[0][0]:
+                continue
+
+            d = dist(target, node.point)
+            if not node.deleted:
+                contador += 1
+                if len(heap) < n:
+                    heapq.heappush(heap, (-d, contador, node.point))
+                elif d < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d, contador, node.point))
+            if node.mu is None:
+                continue
+
+            # desigualdade triangular: dentro d(x, vp) < mu; fora mu <= d(x, vp) <= raio
+            dentro = (node.inside, max(bound, d - node.mu))
+            fora = (node.outside, max(bound, node.mu - d, d - node.raio))
+            # o lado próximo é empilhado por último para ser visitado primeiro
+            if d < node.mu:
+                stack.append(fora)
+                stack.append(dentro)
+            else:
+                stack.append(dentro)
+                stack.append(fora)
+
+        return [(-d, point) for d, _, point in sorted(heap, reverse=True)]
+
+    def range_search(self, low, high):
+        # pontos p com low[i] <= p[i] <= high[i] em todas as coordenadas
+        result = []
+        stack = [self.root]
+
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+
+            point = node.point
+            if not node.deleted and all(lo <= c <= hi for lo, c, hi in zip(low, point, high)):
+                result.append(point)
+            if node.mu is None:
+                continue
+
+            # distâncias mínima e máxima do ponto de vantagem à caixa
+            perto = longe = 0.0
+            for lo, c, hi in zip(low, point, high):
+                if c < lo:
+                    perto += (lo - c) * (lo - c)
+                elif c > hi:
+                    perto += (c - hi) * (c - hi)
+                extremo = max(c - lo, hi - c)
+                longe += extremo * extremo
+            perto, longe = sqrt(perto), sqrt(longe)
+
+            if perto < node.mu:
+                stack.append(node.inside)
+            if longe >= node.mu and perto <= node.raio:
+                stack.append(node.outside)
+
+        return result
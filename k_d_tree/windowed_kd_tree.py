@@ -0,0 +1,163 @@
+import bisect
+import heapq
+import time
+
+from .dynamic_kd_tree import DynamicKDTree
+from .k_d_tree import _SEM_VALOR
+
+
+class WindowedKDTree:
+    # Janela deslizante de tempo: só os pontos inseridos nos últimos
+    # `horizon` segundos são vistos pelas consultas.
+    # Os pontos são agrupados em baldes de tempo de largura bucket_width,
+    # cada um com sua própria DynamicKDTree. Um balde que sai inteiro da
+    # janela é descartado de uma vez; no balde da fronteira, os pontos
+    # vencidos são removidos um a um (lápides), em ordem de timestamp.
+    # O custo da expiração é proporcional ao lote expirado, não à árvore.
+    # Reinserir um ponto já presente renova seu timestamp.
+    # O "agora" da janela é o maior timestamp inserido; com um relógio
+    # (clock), as consultas também o avançam. clock=None: só timestamps
+    # explícitos (ex.: replay de traces).
+
+    def __init__(self, k, horizon, bucket_width=None, clock=time.monotonic):
+        self.k = k
+        self.horizon = horizon
+        self.bucket_width = bucket_width if bucket_width is not None else horizon / 8
+        self.clock = clock
+        # maior timestamp visto (o "agora" da janela)
+        self.now = None
+        self.size = 0
+        # id do balde -> (árvore, heap de (timestamp, seq, ponto)); ids ordenados
+        self._buckets = {}
+        self._ids = []
+        # tuple(ponto) -> (id do balde, seq) da inserção vigente
+        self._where = {}
+        self._seq = 0
+
+    def _tick(self):
+        # avança o relógio (se houver) e expira os pontos vencidos
+        if self.clock is not None:
+            self.expire(self.clock())
+        else:
+            self.expire()
+
+    def expire(self, now=None):
+        # remove os pontos com timestamp < now - horizon; retorna quantos
+        if now is not None and (self.now is None or now > self.now):
+            self.now = now
+        if self.now is None:
+            return 0
+        limite = self.now - self.horizon
+        removidos = 0
+
+        while self._ids:
+            bid = self._ids[0]
+            tree, heap = self._buckets[bid]
+            if (bid + 1) * self.bucket_width <= limite:
+                # balde inteiro fora da janela: descartado de uma vez
+                for _, seq, point in heap:
+                    key = tuple(point)
+                    if self._where.get(key) == (bid, seq):
+                        del self._where[key]
+                removidos += tree.size
+                self.size -= tree.size
+                del self._buckets[bid]
+                self._ids.pop(0)
+                continue
+
+            # balde da fronteira: só os pontos vencidos
+            while heap and heap[0][0] < limite:
+                _, seq, point = heapq.heappop(heap)
+                key = tuple(point)
+                if self._where.get(key) == (bid, seq):
+                    del self._where[key]
+                    tree.delete(point)
+                    self.size -= 1
+                    removidos += 1
+            break
+
+        return removidos
+
+    def insert(self, point, value=_SEM_VALOR, timestamp=None):
+        if timestamp is None:
+            if self.clock is None:
+                raise ValueError("timestamp é obrigatório quando clock=None")
+            timestamp = self.clock()
+        self.expire(timestamp)
+        if timestamp < self.now - self.horizon:
+            return False
+
+        key = tuple(point)
+        if key in self._where:
+            if value is _SEM_VALOR:
+                # renovar o timestamp não apaga a carga
+                value = self._buckets[self._where[key][0]][0].get(point)
+            self._remover(key, point)
+
+        bid = int(timestamp // self.bucket_width)
+        if bid not in self._buckets:
+            self._buckets[bid] = (DynamicKDTree(self.k), [])
+            bisect.insort(self._ids, bid)
+        tree, heap = self._buckets[bid]
+        tree.insert(point, value)
+        self._seq += 1
+        heapq.heappush(heap, (timestamp, self._seq, point))
+        self._where[key] = (bid, self._seq)
+        self.size += 1
+        return True
+
+    def _remover(self, key, point):
+        # a entrada no heap do balde fica obsoleta e é ignorada na expiração
+        bid, _ = self._where.pop(key)
+        self._buckets[bid][0].delete(point)
+        self.size -= 1
+
+    def delete(self, point):
+        self._tick()
+        key = tuple(point)
+        if key not in self._where:
+            return False
+        self._remover(key, point)
+        return True
+
+    def _arvores(self):
+        return [self._buckets[bid][0] for bid in self._ids]
+
+    def search(self, point):
+        self._tick()
+        key = tuple(point)
+        if key not in self._where:
+            return None
+        return self._buckets[self._where[key][0]][0].search(point)
+
+    def get(self, point, default=None):
+        self._tick()
+        key = tuple(point)
+        if key not in self._where:
+            return default
+        return self._buckets[self._where[key][0]][0].get(point, default)
+
+    def nearest(self, target, n=1):
+        self._tick()
+        candidatos = []
+        for tree in self._arvores():
+            candidatos.extend(tree.nearest(target, n))
+        return heapq.nsmallest(n, candidatos, key=lambda item: item[0])
+
+    def range_search(self, low, high):
+        self._tick()
+        result = []
+        for tree in self._arvores():
+            result.extend(tree.range_search(low, high))
+        return result
+
+    def range_count(self, low, high):
+        self._tick()
+        return sum(tree.range_count(low, high) for tree in self._arvores())
+
+    def points(self):
+        self._tick()
+        result = []
+        for tree in self._arvores():
+            result.extend(tree.points())
+        return result
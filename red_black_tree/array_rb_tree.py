@@ -0,0 +1,343 @@
+from array import array
+
+VERMELHO = 1
+PRETO = 0
+NIL = 0
+
+
+class ArrayRedBlackTree:
+    # Mesma árvore rubro-negra da RedBlackTree (mesmos casos de inserção e
+    # remoção), mas sem um objeto por nó: cada nó é um índice em vetores
+    # paralelos. left/right/parent são array('i'), as cores um bytearray
+    # (1 = vermelho), as repetições um array('q') e as chaves uma lista.
+    # O índice 0 é o NIL (preto) e as posições liberadas por delete formam
+    # uma lista encadeada (por parent) reaproveitada nas inserções.
+    # Como os vetores não guardam referências, o coletor de lixo só
+    # acompanha a lista de chaves, e pickle copia os vetores como bytes.
+
+    def __init__(self):
+        self.data = [None]
+        self.left = array('i', [NIL])
+        self.right = array('i', [NIL])
+        self.parent = array('i', [NIL])
+        self.color = bytearray([PRETO])
+        self.count = array('q', [0])
+        self.root = NIL
+        # primeira posição livre (0 = nenhuma)
+        self._livre = NIL
+        self.size = 0
+        self.total = 0
+        self.black_height = 0
+
+    def _alocar(self, data):
+        i = self._livre
+        if i != NIL:
+            self._livre = self.parent[i]
+            self.data[i] = data
+            self.left[i] = self.right[i] = self.parent[i] = NIL
+            self.color[i] = VERMELHO
+            self.count[i] = 1
+            return i
+        self.data.append(data)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        self.parent.append(NIL)
+        self.color.append(VERMELHO)
+        self.count.append(1)
+        return len(self.data) - 1
+
+    def _liberar(self, i):
+        self.data[i] = None
+        self.count[i] = 0
+        self.parent[i] = self._livre
+        self._livre = i
+
+    def slots(self):
+        # posições alocadas nos vetores (incluindo NIL e posições livres)
+        return len(self.data)
+
+    def insert(self, data):
+        keys, left, right, parent = self.data, self.left, self.right, self.parent
+        pai = NIL
+        current = self.root
+
+        while current != NIL:
+            pai = current
+            chave = keys[current]
+            if data == chave:
+                self.count[current] += 1
+                self.total += 1
+                return
+            elif data < chave:
+                current = left[current]
+            else:
+                current = right[current]
+
+        node = self._alocar(data)
+        self.size += 1
+        self.total += 1
+        parent[node] = pai
+
+        if pai == NIL:
+            self.root = node
+            self.color[node] = PRETO
+            self.black_height = 1
+            return
+        if data < keys[pai]:
+            left[pai] = node
+        else:
+            right[pai] = node
+
+        if parent[pai] == NIL:
+            return
+
+        self._fix_insert(node)
+
+    def _fix_insert(self, node):
+        left, right, parent, color = self.left, self.right, self.parent, self.color
+
+        while color[parent[node]] == VERMELHO:
+            pai = parent[node]
+            avo = parent[pai]
+            if pai == right[avo]:
+                uncle = left[avo]
+
+                if color[uncle] == VERMELHO:
+                    color[uncle] = PRETO
+                    color[pai] = PRETO
+                    color[avo] = VERMELHO
+                    node = avo
+                else:
+                    if node == left[pai]:
+                        node = pai
+                        self._rotate_right(node)
+                    color[parent[node]] = PRETO
+                    color[parent[parent[node]]] = VERMELHO
+                    self._rotate_left(parent[parent[node]])
+            else:
+                uncle = right[avo]
+
+                if color[uncle] == VERMELHO:
+                    color[uncle] = PRETO
+                    color[pai] = PRETO
+                    color[avo] = VERMELHO
+                    node = avo
+                else:
+                    if node == right[pai]:
+                        node = pai
+                        self._rotate_left(node)
+                    color[parent[node]] = PRETO
+                    color[parent[parent[node]]] = VERMELHO
+                    self._rotate_right(parent[parent[node]])
+
+            if node == self.root:
+                break
+
+        # a recoloração chegou até a raiz: todo caminho ganha um nó preto
+        if color[self.root] == VERMELHO:
+            self.black_height += 1
+        color[self.root] = PRETO
+
+    def _rotate_left(self, node):
+        left, right, parent = self.left, self.right, self.parent
+        right_child = right[node]
+        right[node] = left[right_child]
+
+        if left[right_child] != NIL:
+            parent[left[right_child]] = node
+
+        pai = parent[node]
+        parent[right_child] = pai
+
+        if pai == NIL:
+            self.root = right_child
+        elif node == left[pai]:
+            left[pai] = right_child
+        else:
+            right[pai] = right_child
+
+        left[right_child] = node
+        parent[node] = right_child
+
+    def _rotate_right(self, node):
+        left, right, parent = self.left, self.right, self.parent
+        left_child = left[node]
+        left[node] = right[left_child]
+
+        if right[left_child] != NIL:
+            parent[right[left_child]] = node
+
+        pai = parent[node]
+        parent[left_child] = pai
+
+        if pai == NIL:
+            self.root = left_child
+        elif node == right[pai]:
+            right[pai] = left_child
+        else:
+            left[pai] = left_child
+
+        right[left_child] = node
+        parent[node] = left_child
+
+    def _find(self, data):
+        # índice do nó com a chave ou NIL
+        keys, left, right = self.data, self.left, self.right
+        node = self.root
+        while node != NIL:
+            chave = keys[node]
+            if data == chave:
+                return node
+            node = left[node] if data < chave else right[node]
+        return NIL
+
+    def search(self, data):
+        # a chave armazenada, ou None se ausente
+        node = self._find(data)
+        return self.data[node] if node != NIL else None
+
+    def count_of(self, data):
+        # repetições da chave (0 se ausente)
+        return self.count[self._find(data)]
+
+    def delete(self, data):
+        node = self._find(data)
+        if node == NIL:
+            return False
+
+        self.total -= 1
+        if self.count[node] > 1:
+            self.count[node] -= 1
+            return True
+
+        self.size -= 1
+        self._delete_node(node)
+        self._liberar(node)
+        return True
+
+    def _delete_node(self, node):
+        left, right, parent, color = self.left, self.right, self.parent, self.color
+        y = node
+        y_original_color = color[y]
+
+        if left[node] == NIL:
+            x = right[node]
+            self._transplant(node, x)
+        elif right[node] == NIL:
+            x = left[node]
+            self._transplant(node, x)
+        else:
+            y = self._minimum(right[node])
+            y_original_color = color[y]
+            x = right[y]
+
+            if parent[y] == node:
+                parent[x] = y
+            else:
+                self._transplant(y, right[y])
+                right[y] = right[node]
+                parent[right[y]] = y
+
+            self._transplant(node, y)
+            left[y] = left[node]
+            parent[left[y]] = y
+            color[y] = color[node]
+
+        if y_original_color == PRETO:
+            self._fix_delete(x)
+        # o NIL pode ter recebido um pai durante a remoção
+        parent[NIL] = NIL
+
+    def _fix_delete(self, node):
+        left, right, parent, color = self.left, self.right, self.parent, self.color
+        resolvido = False
+
+        while node != self.root and color[node] == PRETO:
+            pai = parent[node]
+            if node == left[pai]:
+                sibling = right[pai]
+
+                if color[sibling] == VERMELHO:
+                    color[sibling] = PRETO
+                    color[pai] = VERMELHO
+                    self._rotate_left(pai)
+                    sibling = right[pai]
+
+                if color[left[sibling]] == PRETO and color[right[sibling]] == PRETO:
+                    color[sibling] = VERMELHO
+                    node = pai
+                else:
+                    if color[right[sibling]] == PRETO:
+                        color[left[sibling]] = PRETO
+                        color[sibling] = VERMELHO
+                        self._rotate_right(sibling)
+                        sibling = right[pai]
+
+                    color[sibling] = color[pai]
+                    color[pai] = PRETO
+                    color[right[sibling]] = PRETO
+                    self._rotate_left(pai)
+                    node = self.root
+                    resolvido = True
+            else:
+                sibling = left[pai]
+
+                if color[sibling] == VERMELHO:
+                    color[sibling] = PRETO
+                    color[pai] = VERMELHO
+                    self._rotate_right(pai)
+                    sibling = left[pai]
+
+                if color[right[sibling]] == PRETO and color[left[sibling]] == PRETO:
+                    color[sibling] = VERMELHO
+                    node = pai
+                else:
+                    if color[left[sibling]] == PRETO:
+                        color[right[sibling]] = PRETO
+                        color[sibling] = VERMELHO
+                        self._rotate_left(sibling)
+                        sibling = left[pai]
+
+                    color[sibling] = color[pai]
+                    color[pai] = PRETO
+                    color[left[sibling]] = PRETO
+                    self._rotate_right(pai)
+                    node = self.root
+                    resolvido = True
+
+        # o preto extra subiu até a raiz: todo caminho perdeu um nó preto
+        if not resolvido and node == self.root and color[node] == PRETO:
+            self.black_height -= 1
+        color[node] = PRETO
+
+    def _transplant(self, u, v):
+        parent = self.parent
+        pai = parent[u]
+        if pai == NIL:
+            self.root = v
+        elif u == self.left[pai]:
+            self.left[pai] = v
+        else:
+            self.right[pai] = v
+        parent[v] = pai
+
+    def _minimum(self, node):
+        left = self.left
+        while left[node] != NIL:
+            node = left[node]
+        return node
+
+    def traverse(self):
+        # chaves em ordem (sem repetições)
+        keys, left, right = self.data, self.left, self.right
+        result = []
+        stack = []
+        node = self.root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            result.append(keys[node])
+            node = right[node]
+        return result
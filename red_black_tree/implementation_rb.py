@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
 from red_black_tree.red_black_tree import RedBlackTree
+from tools.render_worker import BackgroundRenderer
 
 
 class RedBlackTreeSession:
@@ -9,6 +10,8 @@ class RedBlackTreeSession:
         self.tree = RedBlackTree()
         self.session_name = self._create_session_name()
         self.base_path = self._create_directory_structure()
+        # renderização em segundo plano: as operações não esperam o graphviz
+        self.renderer = BackgroundRenderer()
         
     def _create_session_name(self):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -34,12 +37,17 @@ class RedBlackTreeSession:
             temp_dir = os.path.dirname(path)
             os.makedirs(temp_dir, exist_ok=True)
             
-            output = self.tree.visualize(path, view=False)
-            return output
+            return self.renderer.submit(self.tree.dot_snapshot(), path)
         except Exception as e:
             print(f"Erro ao gerar visualização: {e}")
             return None
     
+    def _finalizar_visualizacoes(self):
+        print("\nAguardando visualizações pendentes...")
+        self.renderer.close()
+        for erro in self.renderer.erros:
+            print(f"Erro ao gerar visualização: {erro}")
+    
     def inserir_no(self):
         print("\n" + "=" * 60)
         print("INSERIR NÓ")
@@ -53,23 +61,23 @@ class RedBlackTreeSession:
             return
         
         print(f"\nSalvando estado ANTES da inserção...")
-        antes_path = self._save_visualization(f"valor_{valor}_antes", "adicoes")
+        antes = self._save_visualization(f"valor_{valor}_antes", "adicoes")
         
         self.tree.insert(valor)
         node = self.tree.search(valor)
         
         print(f"Salvando estado DEPOIS da inserção...")
-        depois_path = self._save_visualization(f"valor_{valor}_depois", "adicoes")
+        depois = self._save_visualization(f"valor_{valor}_depois", "adicoes")
         
         print(f"\nValor {valor} inserido com sucesso!")
         if node and node.count > 1:
             print(f"Este valor já existia. Contador incrementado para {node.count}")
         
-        print(f"\nImagens salvas em:")
-        if antes_path:
-            print(f"   • Antes:  {os.path.basename(antes_path)}")
-        if depois_path:
-            print(f"   • Depois: {os.path.basename(depois_path)}")
+        print(f"\nImagens (geradas em segundo plano):")
+        if antes:
+            print(f"   • Antes:  {os.path.basename(antes.caminho)}")
+        if depois:
+            print(f"   • Depois: {os.path.basename(depois.caminho)}")
     
     def remover_no(self):
         print("\n" + "=" * 60)
@@ -91,13 +99,13 @@ class RedBlackTreeSession:
         count_antes = node.count
         
         print(f"\nSalvando estado ANTES da remoção...")
-        antes_path = self._save_visualization(f"valor_{valor}_antes", "remocoes")
+        antes = self._save_visualization(f"valor_{valor}_antes", "remocoes")
         
         self.tree.delete(valor)
         node_depois = self.tree.search(valor)
         
         print(f"Salvando estado DEPOIS da remoção...")
-        depois_path = self._save_visualization(f"valor_{valor}_depois", "remocoes")
+        depois = self._save_visualization(f"valor_{valor}_depois", "remocoes")
         
         if node_depois:
             print(f"\nContador do valor {valor} decrementado!")
@@ -105,11 +113,11 @@ class RedBlackTreeSession:
         else:
             print(f"\nValor {valor} removido completamente da árvore!")
         
-        print(f"\nImagens salvas em:")
-        if antes_path:
-            print(f"   • Antes:  {os.path.basename(antes_path)}")
-        if depois_path:
-            print(f"   • Depois: {os.path.basename(depois_path)}")
+        print(f"\nImagens (geradas em segundo plano):")
+        if antes:
+            print(f"   • Antes:  {os.path.basename(antes.caminho)}")
+        if depois:
+            print(f"   • Depois: {os.path.basename(depois.caminho)}")
     
     def buscar_no(self):
 
@@ -125,7 +133,7 @@ class RedBlackTreeSession:
             return
         
         print(f"\nGerando visualização do estado atual...")
-        estado_path = self._save_visualization("estado_atual")
+        estado = self._save_visualization("estado_atual")
         
         node = self.tree.search(valor)
         
@@ -158,8 +166,8 @@ class RedBlackTreeSession:
             print(f"{'='*60}")
             print(f"\n   O valor {valor} não existe na árvore.")
         
-        if estado_path:
-            print(f"\nEstado atual salvo em: {os.path.basename(estado_path)}")
+        if estado:
+            print(f"\nEstado atual (gerado em segundo plano): {os.path.basename(estado.caminho)}")
     
     def exibir_menu(self):
         print("\n" + "=" * 60)
@@ -180,19 +188,12 @@ class RedBlackTreeSession:
         print("INFORMAÇÕES DA ÁRVORE")
         print("=" * 60)
         
-        def contar_nos(node):
-            if node == self.tree.NIL:
-                return 0, 0  
-            
-            left_nos, left_vals = contar_nos(node.left)
-            right_nos, right_vals = contar_nos(node.right)
-            
-            return (1 + left_nos + right_nos, node.count + left_vals + right_vals)
-        
-        total_nos, total_valores = contar_nos(self.tree.root)
+        # contadores mantidos pela árvore a cada operação (sem percorrer os nós)
+        total_nos, total_valores = self.tree.size, self.tree.total
         
         print(f"\n   • Nós únicos: {total_nos}")
         print(f"   • Total de valores (com repetições): {total_valores}")
+        print(f"   • Altura preta (black-height): {self.tree.black_height}")
         
         if self.tree.root != self.tree.NIL:
             print(f"   • Raiz: {self.tree.root.data}{self.tree.root.color}")
@@ -224,6 +225,7 @@ class RedBlackTreeSession:
                 print("\n" + "=" * 60)
                 print("👋 Encerrando sessão...")
                 print("=" * 60)
+                self._finalizar_visualizacoes()
                 print(f"\n📁 Todos os arquivos foram salvos em:")
                 print(f"   {os.path.relpath(self.base_path)}")
                 print("\n✅ Sessão encerrada com sucesso!")
@@ -0,0 +1,111 @@
+from math import inf
+
+from red_black_tree.red_black_tree import Node, RedBlackTree
+
+
+class IntervalNode(Node):
+
+    def __init__(self, data):
+        super().__init__(data)
+        # maior extremo direito da subárvore (-inf no NIL)
+        self.max = data[1] if data is not None else -inf
+
+
+class IntervalTree(RedBlackTree):
+    # Árvore rubro-negra de intervalos fechados [lo, hi], ordenados por
+    # (lo, hi). Cada nó guarda o maior hi da sua subárvore, o que permite
+    # descartar subárvores inteiras nas consultas de sobreposição.
+    # O máximo é mantido localmente nas rotações e, após inserir ou remover,
+    # ao longo do único caminho até a raiz que pode ter mudado: O(log n).
+    # Intervalos repetidos ficam no mesmo nó (count), como na RedBlackTree.
+
+    node_class = IntervalNode
+
+    def _recalcular(self, node):
+        node.max = max(node.data[1], node.left.max, node.right.max)
+
+    def _rotate_left(self, node):
+        super()._rotate_left(node)
+        # node desceu: recalcula ele e depois quem subiu
+        self._recalcular(node)
+        self._recalcular(node.parent)
+
+    def _rotate_right(self, node):
+        super()._rotate_right(node)
+        self._recalcular(node)
+        self._recalcular(node.parent)
+
+    def insert(self, interval):
+        lo, hi = interval
+        if lo > hi:
+            raise ValueError(f"Intervalo inválido: {interval}")
+        data = (lo, hi)
+        # o novo extremo entra no caminho de descida antes de ligar o nó,
+        # então as rotações do balanceamento já partem de máximos corretos
+        node = self.root
+        while node != self.NIL:
+            if hi > node.max:
+                node.max = hi
+            if data == node.data:
+                break
+            node = node.left if data < node.data else node.right
+        super().insert(data)
+
+    def search(self, interval):
+        return super().search(tuple(interval))
+
+    def delete(self, interval):
+        return super().delete(tuple(interval))
+
+    def _delete_node(self, node):
+        # nó mais baixo cuja subárvore muda com a remoção; os máximos
+        # desatualizados ficam todos no caminho dele até a raiz
+        if node.left == self.NIL or node.right == self.NIL:
+            inicio = node.parent
+        else:
+            y = self._minimum(node.right)
+            inicio = y if y.parent == node else y.parent
+        super()._delete_node(node)
+        while inicio is not None:
+            self._recalcular(inicio)
+            inicio = inicio.parent
+
+    @classmethod
+    def load(cls, fp):
+        # o formato não guarda os máximos: recalculados de baixo para cima
+        tree = super().load(fp)
+        nos = []
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            if node != tree.NIL:
+                nos.append(node)
+                stack.append(node.left)
+                stack.append(node.right)
+        for node in reversed(nos):
+            tree._recalcular(node)
+        return tree
+
+    def overlapping(self, a, b):
+        # gera, em ordem de (lo, hi), os intervalos distintos que cortam [a, b]
+        # em O(log n + m): subárvores com max < a são puladas e a travessia
+        # termina no primeiro nó com lo > b
+        stack = []
+        node = self.root
+        while True:
+            while node != self.NIL and node.max >= a:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            lo, hi = node.data
+            if lo > b:
+                return
+            if hi >= a:
+                yield node.data
+            node = node.right
+
+    def stab(self, x):
+        # intervalos que contêm o ponto x
+        return self.overlapping(x, x)
@@ -1,3 +1,22 @@
+try:
+    from tools.stats import StatsMixin
+except ModuleNotFoundError:
+    # executado como script de dentro da pasta da árvore: a raiz do
+    # repositório (onde fica tools/) não está no sys.path
+    import os as _os
+    import sys as _sys
+    _sys.path.append(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+    from tools.stats import StatsMixin
+
+
+# formato de dump/load: MAGIC, cabeçalho, vetores em pré-ordem
+MAGIC = b'RBT1'
+# nós, size, total, black_height, há repetições
+_CABECALHO = '<QQQQ?'
+# flags por nó: filho esquerdo, filho direito, vermelho
+_ESQ, _DIR, _RUBRO = 1, 2, 4
+
+
 class Node:
     
     def __init__(self, data):
@@ -14,31 +33,50 @@ class Node:
         return f"{self.data}{self.color}"
 
 
-class RedBlackTree:
+class RedBlackTree(StatsMixin):
+
+    # contadores expostos por stats() quando a instrumentação está ativa
+    STATS_KEYS = ('comparisons', 'rotate_left', 'rotate_right',
+                  'fix_insert_iterations', 'fix_delete_iterations')
+
+    # classe dos nós (inclusive NIL); variantes aumentadas trocam por uma subclasse
+    node_class = Node
    
     def __init__(self):
-        self.NIL = Node(None)
+        self.NIL = self.node_class(None)
         self.NIL.color = '⚫'
         self.NIL.left = None
         self.NIL.right = None
         self.root = self.NIL
+        # estatísticas mantidas a cada operação (O(1) para consultar)
+        self.size = 0          # nós (valores distintos)
+        self.total = 0         # valores contando repetições
+        self.black_height = 0  # nós pretos em qualquer caminho raiz -> NIL
+        # None = instrumentação desligada (custo de um teste nos laços)
+        self._stats = None
 
     def insert(self, data):
         parent = None
         current = self.root
+        stats = self._stats
         
         while current != self.NIL:
             parent = current
+            if stats is not None:
+                stats['comparisons'] += 1
             if data == current.data:
                 
                 current.count += 1
+                self.total += 1
                 return
             elif data < current.data:
                 current = current.left
             else:
                 current = current.right
         
-        new_node = Node(data)
+        new_node = self.node_class(data)
+        self.size += 1
+        self.total += 1
         new_node.left = self.NIL
         new_node.right = self.NIL
         new_node.parent = parent
@@ -52,6 +90,7 @@ class RedBlackTree:
         
         if new_node.parent is None:
             new_node.color = '⚫'
+            self.black_height = 1
             return
         
         if new_node.parent.parent is None:
@@ -60,8 +99,11 @@ class RedBlackTree:
         self._fix_insert(new_node)
 
     def _fix_insert(self, node):
+        stats = self._stats
        
         while node.parent.color == '🔴':
+            if stats is not None:
+                stats['fix_insert_iterations'] += 1
             if node.parent == node.parent.parent.right:
                 uncle = node.parent.parent.left
                 
@@ -102,9 +144,14 @@ class RedBlackTree:
             if node == self.root:
                 break
         
+        # a recoloração chegou até a raiz: todo caminho ganha um nó preto
+        if self.root.color == '🔴':
+            self.black_height += 1
         self.root.color = '⚫'
 
     def _rotate_left(self, node):
+        if self._stats is not None:
+            self._stats['rotate_left'] += 1
        
         right_child = node.right
         node.right = right_child.left
@@ -125,6 +172,8 @@ class RedBlackTree:
         node.parent = right_child
 
     def _rotate_right(self, node):
+        if self._stats is not None:
+            self._stats['rotate_right'] += 1
         
         left_child = node.left
         node.left = left_child.right
@@ -150,8 +199,12 @@ class RedBlackTree:
 
     def _search_helper(self, node, data):
       
-        if node == self.NIL or data == node.data:
-            return node if node != self.NIL else None
+        if node == self.NIL:
+            return None
+        if self._stats is not None:
+            self._stats['comparisons'] += 1
+        if data == node.data:
+            return node
         
         if data < node.data:
             return self._search_helper(node.left, data)
@@ -159,14 +212,16 @@ class RedBlackTree:
 
     def delete(self, data):
       
-        node = self.search(data)
+        node = self._search_helper(self.root, data)
         if node is None:
             return False
         
+        self.total -= 1
         if node.count > 1:
             node.count -= 1
             return True
         
+        self.size -= 1
         self._delete_node(node)
         return True
 
@@ -202,8 +257,12 @@ class RedBlackTree:
             self._fix_delete(x)
 
     def _fix_delete(self, node):
+        stats = self._stats
+        resolvido = False
        
         while node != self.root and node.color == '⚫':
+            if stats is not None:
+                stats['fix_delete_iterations'] += 1
             if node == node.parent.left:
                 sibling = node.parent.right
                 
@@ -228,6 +287,7 @@ class RedBlackTree:
                     sibling.right.color = '⚫'
                     self._rotate_left(node.parent)
                     node = self.root
+                    resolvido = True
             else:
                 sibling = node.parent.left
                 
@@ -252,7 +312,11 @@ class RedBlackTree:
                     sibling.left.color = '⚫'
                     self._rotate_right(node.parent)
                     node = self.root
+                    resolvido = True
         
+        # o preto extra subiu até a raiz: todo caminho perdeu um nó preto
+        if not resolvido and node == self.root and node.color == '⚫':
+            self.black_height -= 1
         node.color = '⚫'
 
     def _transplant(self, u, v):
@@ -271,11 +335,124 @@ class RedBlackTree:
             node = node.left
         return node
 
+    def dump(self, fp):
+        # grava a árvore em fp (binário) sem recursão: chaves, flags de
+        # estrutura/cor e repetições em pré-ordem, cada vetor numa escrita só
+        nil = self.NIL
+        # total > size só quando alguma chave se repete
+        repetidos = self.total != self.size
+        chaves = []
+        contagens = []
+        flags = bytearray()
+        stack = [self.root] if self.root is not nil else []
+        pop, push = stack.pop, stack.append
+        while stack:
+            node = pop()
+            chaves.append(node.data)
+            if repetidos:
+                contagens.append(node.count)
+            left, right = node.left, node.right
+            f = _RUBRO if node.color == '🔴' else 0
+            if right is not nil:
+                f |= _DIR
+                push(right)
+            if left is not nil:
+                f |= _ESQ
+                push(left)
+            flags.append(f)
+
+        from tools.serial import gravar_cabecalho, gravar_inteiros, gravar_valores
+        gravar_cabecalho(fp, MAGIC, _CABECALHO,
+                         len(chaves), self.size, self.total, self.black_height, repetidos)
+        fp.write(flags)
+        gravar_valores(fp, chaves)
+        if repetidos:
+            gravar_inteiros(fp, contagens)
+
+    @classmethod
+    def load(cls, fp):
+        # reconstrói a árvore gravada por dump em tempo linear, sem inserções
+        from tools.serial import coletor_pausado, ler_cabecalho, ler_inteiros, ler_valores
+        n, size, total, black_height, repetidos = ler_cabecalho(
+            fp, MAGIC, _CABECALHO, 'RedBlackTree')
+        flags = fp.read(n)
+        chaves = ler_valores(fp)
+        contagens = ler_inteiros(fp, n) if repetidos else None
+
+        tree = cls()
+        tree.size, tree.total, tree.black_height = size, total, black_height
+        nil = tree.NIL
+        node_class = tree.node_class
+        # milhões de nós novos: o coletor cíclico só atrasaria a construção
+        with coletor_pausado():
+            # nós com filho direito ainda por ligar; em pré-ordem, depois da
+            # subárvore esquerda de um nó vem o filho direito do último pendente
+            pendentes = []
+            pai_esquerdo = None
+            for i in range(n):
+                node = node_class(chaves[i])
+                node.left = node.right = nil
+                f = flags[i]
+                if not f & _RUBRO:
+                    node.color = '⚫'
+                if contagens is not None:
+                    node.count = contagens[i]
+                if pai_esquerdo is not None:
+                    pai_esquerdo.left = node
+                    node.parent = pai_esquerdo
+                elif pendentes:
+                    pai = pendentes.pop()
+                    pai.right = node
+                    node.parent = pai
+                else:
+                    tree.root = node
+                if f & _DIR:
+                    pendentes.append(node)
+                pai_esquerdo = node if f & _ESQ else None
+        return tree
+
     def visualize(self, filename="red_black_tree", view=True):
+        import os
+
+        dot = self._build_graph(self._copiar_estrutura())
+        
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        files_dir = os.path.join(current_dir, 'files')
+        os.makedirs(files_dir, exist_ok=True)
+        
+        output_path = os.path.join(files_dir, filename)
+        
+        # Renderiza o grafo no diretório files
+        rendered_path = dot.render(output_path, format='png', cleanup=True, view=view)
+        return rendered_path
+
+    def to_dot(self):
+        # código DOT do estado atual
+        return self.dot_snapshot()()
+
+    def dot_snapshot(self):
+        # copia só rótulos e cores agora; o Digraph é montado por quem chamar
+        # a função retornada (p. ex. a thread do BackgroundRenderer)
+        copia = self._copiar_estrutura()
+        return lambda: self._build_graph(copia).source
+
+    def _copiar_estrutura(self):
+        # cópia como (rótulo, vermelho, esquerda, direita); None no lugar de NIL
+        def copiar(node):
+            if node == self.NIL:
+                return None
+            if node.count > 1:
+                label = f"{node.data}\n({node.count})"
+            else:
+                label = str(node.data)
+            return (label, node.color == '🔴', copiar(node.left), copiar(node.right))
+
+        return copiar(self.root)
+
+    def _build_graph(self, copia):
         
         try:
             from graphviz import Digraph
-            import os
         except ImportError:
             raise ImportError(
                 "Biblioteca graphviz não está instalada.\n"
@@ -286,12 +463,6 @@ class RedBlackTree:
                 "- Mac: brew install graphviz"
             )
         
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        files_dir = os.path.join(current_dir, 'files')
-        os.makedirs(files_dir, exist_ok=True)
-        
-        output_path = os.path.join(files_dir, filename)
-        
         dot = Digraph(comment='Red-Black Tree')
         dot.attr(rankdir='TB')
         dot.attr('node', shape='circle', style='filled', fontsize='12', fontname='Arial Bold')
@@ -299,55 +470,35 @@ class RedBlackTree:
         nil_counter = [0]
         
         def add_nodes(node):
-            if node == self.NIL:
-                return
+            label, vermelho, left, right = node
+            node_id = str(id(node))
             
-            if node.color == '🔴':
+            if vermelho:
                 color = 'red'
                 fontcolor = 'white'
             else:
                 color = 'black'
                 fontcolor = 'white'
             
-
-            if node.count > 1:
-                label = f"{node.data}\n({node.count})"
-            else:
-                label = str(node.data)
-            
             # Adiciona o nó
-            dot.node(str(id(node)), label, fillcolor=color, fontcolor=fontcolor)
+            dot.node(node_id, label, fillcolor=color, fontcolor=fontcolor)
             
-            # Adiciona filho esquerdo
-            if node.left != self.NIL:
-                dot.edge(str(id(node)), str(id(node.left)), label='L')
-                add_nodes(node.left)
-            else:
-                # Adiciona NIL visual
-                nil_id = f"nil_{nil_counter[0]}"
-                nil_counter[0] += 1
-                dot.node(nil_id, 'NIL', fillcolor='lightgray', fontcolor='black', 
-                        shape='square', style='filled')
-                dot.edge(str(id(node)), nil_id, style='dashed')
-            
-            # Adiciona filho direito
-            if node.right != self.NIL:
-                dot.edge(str(id(node)), str(id(node.right)), label='R')
-                add_nodes(node.right)
-            else:
-                # Adiciona NIL visual
-                nil_id = f"nil_{nil_counter[0]}"
-                nil_counter[0] += 1
-                dot.node(nil_id, 'NIL', fillcolor='lightgray', fontcolor='black',
-                        shape='square', style='filled')
-                dot.edge(str(id(node)), nil_id, style='dashed')
+            for filho, lado in ((left, 'L'), (right, 'R')):
+                if filho is not None:
+                    dot.edge(node_id, str(id(filho)), label=lado)
+                    add_nodes(filho)
+                else:
+                    # Adiciona NIL visual
+                    nil_id = f"nil_{nil_counter[0]}"
+                    nil_counter[0] += 1
+                    dot.node(nil_id, 'NIL', fillcolor='lightgray', fontcolor='black', 
+                            shape='square', style='filled')
+                    dot.edge(node_id, nil_id, style='dashed')
         
-        if self.root != self.NIL:
-            add_nodes(self.root)
+        if copia is not None:
+            add_nodes(copia)
         else:
             dot.node('empty', 'Árvore Vazia', shape='plaintext')
         
-        # Renderiza o grafo no diretório files
-        rendered_path = dot.render(output_path, format='png', cleanup=True, view=view)
-        return rendered_path
+        return dot
 
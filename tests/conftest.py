@@ -0,0 +1,17 @@
+"""Configuração comum dos testes: a raiz do repositório entra no sys.path."""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+
+@pytest.fixture(scope='session')
+def b234():
+    """Pacote 2-3-4 (nome com hífen, importado via importlib)."""
+    return importlib.import_module('2-3-4')
@@ -0,0 +1,83 @@
+import pickle
+import random
+from collections import Counter
+
+from red_black_tree.array_rb_tree import NIL, PRETO, VERMELHO, ArrayRedBlackTree
+from red_black_tree.red_black_tree import RedBlackTree
+
+
+def _forma_array(tree):
+    # (chave, count, vermelho?) em pré-ordem, conferindo as invariantes
+    forma = []
+    pretos = set()
+    stack = [(tree.root, NIL, 0)]
+    while stack:
+        node, pai, acima = stack.pop()
+        if node == NIL:
+            pretos.add(acima)
+            continue
+        assert tree.parent[node] == pai
+        vermelho = tree.color[node] == VERMELHO
+        assert not (vermelho and tree.color[pai] == VERMELHO)
+        forma.append((tree.data[node], tree.count[node], vermelho))
+        acima += not vermelho
+        stack.append((tree.right[node], node, acima))
+        stack.append((tree.left[node], node, acima))
+    assert tree.root == NIL or tree.color[tree.root] == PRETO
+    assert pretos == {tree.black_height}
+    return forma
+
+
+def _forma_objetos(rb):
+    forma = []
+    stack = [rb.root]
+    while stack:
+        node = stack.pop()
+        if node == rb.NIL:
+            continue
+        forma.append((node.data, node.count, node.color == '🔴'))
+        stack.append(node.right)
+        stack.append(node.left)
+    return forma
+
+
+def test_confere_com_modelo_e_com_a_rb_de_objetos():
+    rng = random.Random(8)
+    tree = ArrayRedBlackTree()
+    referencia = RedBlackTree()
+    modelo = Counter()
+    maior = 0
+    for passo in range(4000):
+        k = rng.randrange(300)
+        if rng.random() < 0.55:
+            tree.insert(k)
+            referencia.insert(k)
+            modelo[k] += 1
+        else:
+            assert tree.delete(k) == referencia.delete(k) == (k in modelo)
+            if modelo[k] > 1:
+                modelo[k] -= 1
+            else:
+                modelo.pop(k, None)
+        maior = max(maior, tree.size)
+        assert tree.count_of(k) == modelo[k]
+        if passo % 200 == 0:
+            # mesmos casos de balanceamento: a forma é idêntica
+            assert _forma_array(tree) == _forma_objetos(referencia)
+    assert tree.traverse() == sorted(modelo)
+    assert (tree.size, tree.total, tree.black_height) == (
+        len(modelo), sum(modelo.values()), referencia.black_height)
+    # posições liberadas são reaproveitadas
+    assert tree.slots() == maior + 1
+
+
+def test_pickle_ida_e_volta():
+    tree = ArrayRedBlackTree()
+    for k in [5, 3, 8, 3, 1, 9, 7]:
+        tree.insert(k)
+    tree.delete(8)
+    copia = pickle.loads(pickle.dumps(tree))
+    assert _forma_array(copia) == _forma_array(tree)
+    copia.insert(8)
+    assert copia.traverse() == [1, 3, 5, 7, 8, 9]
+    assert copia.search(4) is None and copia.search(3) == 3
@@ -0,0 +1,98 @@
+import io
+import random
+
+import pytest
+
+
+def _conferir(tree):
+    # B-tree 2-3-4 válida, sem mensagens pendentes, com contadores corretos
+    assert tree.pendentes() == 0
+    if tree.root.leaf and not tree.root.keys:
+        assert (tree.size, tree.node_count, tree.height) == (0, 0, 0)
+        return
+    chaves = nos = 0
+    profundidades = set()
+    stack = [(tree.root, 1, None, None)]
+    while stack:
+        node, nivel, lo, hi = stack.pop()
+        nos += 1
+        chaves += len(node.keys)
+        assert 1 <= len(node.keys) <= 3
+        assert node.keys == sorted(node.keys)
+        assert all((lo is None or lo < k) and (hi is None or k < hi) for k in node.keys)
+        if node.leaf:
+            profundidades.add(nivel)
+            continue
+        assert len(node.children) == len(node.keys) + 1
+        limites = [lo] + node.keys + [hi]
+        for i, child in enumerate(node.children):
+            stack.append((child, nivel + 1, limites[i], limites[i + 1]))
+    assert len(profundidades) == 1
+    assert (tree.size, tree.node_count, tree.height) == (chaves, nos, profundidades.pop())
+
+
+@pytest.mark.parametrize('capacidade', [1, 2, 7, 64])
+def test_confere_com_conjunto(b234, capacidade):
+    rng = random.Random(capacidade)
+    tree = b234.BufferedBTree234(capacidade)
+    modelo = set()
+    for passo in range(4000):
+        k = rng.randrange(600)
+        op = rng.random()
+        if op < 0.55:
+            assert tree.insert(k) is None
+            modelo.add(k)
+        elif op < 0.9:
+            assert tree.delete(k) is None
+            modelo.discard(k)
+        else:
+            assert tree.search(k) == (k if k in modelo else None)
+        if passo % 500 == 0:
+            assert tree.traverse() == sorted(modelo)
+            _conferir(tree)
+    assert [k for k in range(600) if tree.search(k) is not None] == sorted(modelo)
+    tree.flush()
+    _conferir(tree)
+    assert list(tree.iter_from(300)) == sorted(k for k in modelo if k >= 300)
+
+
+def test_dump_load_aplica_e_preserva(b234):
+    rng = random.Random(13)
+    tree = b234.BufferedBTree234(16)
+    chaves = rng.sample(range(10000), 3000)
+    for k in chaves:
+        tree.insert(k)
+    for k in chaves[::4]:
+        tree.delete(k)
+    assert tree.pendentes() > 0
+    buffer = io.BytesIO()
+    tree.dump(buffer)
+    buffer.seek(0)
+    carregada = b234.BufferedBTree234.load(buffer)
+    esperado = sorted(set(chaves) - set(chaves[::4]))
+    _conferir(carregada)
+    assert carregada.traverse() == esperado
+    # continua aceitando mensagens depois do load
+    for k in range(10000, 10100):
+        carregada.insert(k)
+    assert carregada.traverse() == esperado + list(range(10000, 10100))
+    _conferir(carregada)
+
+
+def test_visualizacao_e_impressao_aplicam_as_mensagens(b234, capsys):
+    tree = b234.BufferedBTree234(64)
+    for k in range(40):
+        tree.insert(k)
+    tree.delete(5)
+    assert tree.pendentes() > 0
+    copia = tree._copiar_estrutura()
+    assert tree.pendentes() == 0
+
+    def chaves(no):
+        keys, filhos = no
+        return list(keys) + [k for f in filhos or [] for k in chaves(f)]
+    assert sorted(chaves(copia)) == [k for k in range(40) if k != 5]
+
+    tree.insert(99)
+    tree.pretty_print()
+    assert tree.pendentes() == 0 and '99' in capsys.readouterr().out
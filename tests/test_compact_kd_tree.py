@@ -0,0 +1,80 @@
+import math
+import random
+
+import pytest
+
+from k_d_tree.compact_kd_tree import STORAGE, CompactKDTree
+
+
+def _pontos(semente, n=800):
+    rng = random.Random(semente)
+    # coordenadas com mais precisão do que float32 guarda
+    return list({(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(n)})
+
+
+@pytest.mark.parametrize('storage', STORAGE)
+def test_busca_exata_com_as_coordenadas_originais(storage):
+    pontos = _pontos(17)
+    tree = CompactKDTree.build([list(p) for p in pontos], 2,
+                               values=list(range(len(pontos))), storage=storage)
+    assert tree.size == len(pontos)
+    for i, p in enumerate(pontos):
+        encontrado = tree.search(list(p))
+        assert encontrado is not None
+        assert encontrado == pytest.approx(p, abs=0.01)
+        assert tree.get(list(p)) == i
+    for p in pontos[::2]:
+        assert tree.delete(list(p))
+        assert tree.search(list(p)) is None and not tree.delete(list(p))
+    assert tree.size == len(pontos) - len(pontos[::2])
+
+
+@pytest.mark.parametrize('storage', STORAGE)
+def test_range_search_inclui_pontos_nos_limites(storage):
+    pontos = _pontos(18)
+    tree = CompactKDTree.build([list(p) for p in pontos], 2, storage=storage)
+    rng = random.Random(19)
+    for _ in range(30):
+        a, b = rng.sample(pontos, 2)
+        low = [min(a[0], b[0]), min(a[1], b[1])]
+        high = [max(a[0], b[0]), max(a[1], b[1])]
+        dentro = [p for p in pontos if all(lo <= c <= hi for lo, c, hi in zip(low, p, high))]
+        # os pontos que definem os limites sempre entram
+        assert len(tree.range_search(low, high)) >= len(dentro)
+        achados = {tuple(tree.search(list(p))) for p in dentro}
+        assert achados <= set(map(tuple, tree.range_search(low, high)))
+
+
+@pytest.mark.parametrize('storage', STORAGE)
+def test_nearest_confere_com_forca_bruta(storage):
+    pontos = _pontos(20, 500)
+    tree = CompactKDTree.build([list(p) for p in pontos], 2, storage=storage)
+    armazenados = tree.points()
+    rng = random.Random(21)
+    for _ in range(25):
+        alvo = [rng.uniform(-90, 90), rng.uniform(-180, 180)]
+        esperado = sorted(math.dist(alvo, p) for p in armazenados)[:3]
+        assert [d for d, _ in tree.nearest(alvo, 3)] == pytest.approx(esperado)
+
+
+def test_float32_encontra_todos_os_pontos():
+    pontos = _pontos(22, 2000)
+    tree = CompactKDTree.build([list(p) for p in pontos], 2, storage='float32')
+    assert all(tree.search(list(p)) is not None for p in pontos)
+    # ponto realmente ausente continua ausente
+    assert tree.search([1000.0, 1000.0]) is None
+
+
+@pytest.mark.parametrize('storage', ['float64', 'int16'])
+def test_build_paralelo_identico_ao_sequencial(storage):
+    from k_d_tree.parallel_build import build_parallel
+    pontos = [list(p) for p in _pontos(23, 3000)]
+    valores = list(range(len(pontos)))
+    sequencial = CompactKDTree.build(pontos, 2, values=valores, storage=storage)
+    paralelo = build_parallel(pontos, 2, workers=2, values=valores, storage=storage)
+    assert paralelo.coords == sequencial.coords
+    assert paralelo.axes == sequencial.axes
+    assert paralelo.values == sequencial.values
+    assert paralelo.size == sequencial.size
+    for p in pontos[:50]:
+        assert paralelo.get(p) == sequencial.get(p)
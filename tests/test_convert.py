@@ -0,0 +1,92 @@
+import random
+from collections import Counter
+
+from red_black_tree.red_black_tree import RedBlackTree
+from tools.convert import b234_para_rb, rb_para_234
+
+
+def _forma_234(tree):
+    # (chaves, folha?) de cada nó em pré-ordem
+    forma = []
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        forma.append((tuple(node.keys), node.leaf))
+        if not node.leaf:
+            stack.extend(reversed(node.children))
+    return forma
+
+
+def _conferir_rb(rb):
+    # invariantes rubro-negras, ligações de pai e contadores; retorna em ordem
+    nil = rb.NIL
+    assert rb.root == nil or (rb.root.color == '⚫' and rb.root.parent is None)
+    em_ordem = []
+    pretos = set()
+
+    def visitar(node, acima):
+        if node == nil:
+            pretos.add(acima)
+            return
+        for filho in (node.left, node.right):
+            assert filho == nil or filho.parent is node
+            assert node.color != '🔴' or filho.color != '🔴'
+        acima += node.color == '⚫'
+        visitar(node.left, acima)
+        em_ordem.append((node.data, node.count))
+        visitar(node.right, acima)
+
+    visitar(rb.root, 0)
+    assert len(pretos) == 1 and pretos.pop() == rb.black_height
+    assert rb.size == len(em_ordem) and rb.total == sum(c for _, c in em_ordem)
+    return em_ordem
+
+
+def test_234_para_rb_e_volta(b234):
+    rng = random.Random(6)
+    for n in (0, 1, 2, 3, 4, 50, 2000):
+        tree = b234.BTree234()
+        for k in rng.sample(range(10 * n + 1), n):
+            tree.insert(k)
+        for k in rng.sample(tree.traverse(), n // 3):
+            tree.delete(k)
+        rb = b234_para_rb(tree)
+        assert _conferir_rb(rb) == [(k, 1) for k in tree.traverse()]
+        de_volta, contagens = rb_para_234(rb)
+        assert contagens == {}
+        assert _forma_234(de_volta) == _forma_234(tree)
+        assert (de_volta.size, de_volta.node_count, de_volta.height) == (
+            tree.size, tree.node_count, tree.height)
+
+
+def test_rb_para_234_preserva_repeticoes(b234):
+    rng = random.Random(7)
+    rb = RedBlackTree()
+    modelo = Counter()
+    for _ in range(3000):
+        k = rng.randrange(500)
+        if rng.random() < 0.7:
+            rb.insert(k)
+            modelo[k] += 1
+        elif rb.delete(k):
+            modelo[k] -= 1
+            if not modelo[k]:
+                del modelo[k]
+    tree, contagens = rb_para_234(rb)
+    assert tree.traverse() == sorted(modelo)
+    assert contagens == {k: c for k, c in modelo.items() if c > 1}
+    # a árvore convertida continua operável
+    for k in range(500, 600):
+        assert tree.insert(k)
+    assert tree.delete(0) == (0 in modelo)
+    de_volta = b234_para_rb(*rb_para_234(rb))
+    assert _conferir_rb(de_volta) == sorted(modelo.items())
+
+
+def test_contagens_de_chaves_ausentes_nao_entram_no_total(b234):
+    tree = b234.BTree234()
+    for k in range(10):
+        tree.insert(k)
+    rb = b234_para_rb(tree, {3: 4, 99: 5})
+    assert rb.total == 10 + 3
+    assert _conferir_rb(rb) == [(k, 4 if k == 3 else 1) for k in range(10)]
@@ -0,0 +1,77 @@
+import random
+import re
+
+import pytest
+
+from k_d_tree.k_d_tree import KDTree
+from red_black_tree.red_black_tree import RedBlackTree
+from tools.dot_stream import escrever_dot
+
+
+def _arvore(nome, b234, n=500):
+    rng = random.Random(3)
+    if nome == 'kd':
+        tree = KDTree(2)
+        for _ in range(n):
+            tree.insert([rng.randrange(1000), rng.randrange(1000)])
+        return tree
+    tree = RedBlackTree() if nome == 'rb' else b234.BTree234()
+    for k in rng.sample(range(10 * n), n):
+        tree.insert(k)
+    return tree
+
+
+def _resumos(caminho):
+    texto = caminho.read_text(encoding='utf-8')
+    rotulos = re.findall(r'label="([^"]*)" shape="folder"', texto)
+    return [rotulo.split('\\n') for rotulo in rotulos]
+
+
+@pytest.mark.parametrize('nome', ['rb', '234', 'kd'])
+def test_resumos_exatos_somam_a_arvore(nome, b234, tmp_path):
+    tree = _arvore(nome, b234)
+    saida = tmp_path / 'arvore.dot'
+    resultado = escrever_dot(tree, str(saida), max_profundidade=2, limite_resumo=None)
+    resumos = _resumos(saida)
+    assert resultado['resumos'] == len(resumos) > 0
+    for faixa, chaves, altura in resumos:
+        assert '≥' not in chaves and '≥' not in altura
+    # chaves dos nós expandidos + chaves resumidas = tamanho da árvore
+    resumidas = sum(int(chaves.split()[0]) for _, chaves, _ in resumos)
+    if nome == '234':
+        rotulos = re.findall(r'label="([^"]*)" shape="box"', saida.read_text(encoding='utf-8'))
+        expandidas = sum(len(rotulo.split(' | ')) for rotulo in rotulos)
+    else:
+        expandidas = resultado['expandidos']
+    assert expandidas + resumidas == tree.size
+
+
+@pytest.mark.parametrize('nome, contagem_exata', [('rb', False), ('234', False), ('kd', True)])
+def test_limite_resumo(nome, contagem_exata, b234, tmp_path):
+    tree = _arvore(nome, b234)
+    exato, limitado = tmp_path / 'exato.dot', tmp_path / 'limitado.dot'
+    escrever_dot(tree, str(exato), max_profundidade=1, limite_resumo=None)
+    escrever_dot(tree, str(limitado), max_profundidade=1, limite_resumo=5)
+    for (faixa, chaves, altura), (faixa_l, chaves_l, altura_l) in zip(
+            _resumos(exato), _resumos(limitado)):
+        # a faixa nunca depende do limite
+        assert faixa == faixa_l
+        assert (chaves == chaves_l) == contagem_exata
+        if not contagem_exata:
+            assert chaves_l.startswith('≥')
+        # a 2-3-4 sabe a altura pela descida até uma folha
+        assert (altura == altura_l) == (nome == '234')
+
+
+def test_padrao_limitado(b234, tmp_path):
+    tree = _arvore('rb', b234, n=5000)
+    saida = tmp_path / 'arvore.dot'
+    escrever_dot(tree, str(saida), max_profundidade=0)
+    # a raiz é expandida; os dois filhos têm mais nós que o limite padrão
+    assert all(chaves.startswith('≥') for _, chaves, _ in _resumos(saida))
+
+
+def test_arvore_vazia(b234, tmp_path):
+    saida = tmp_path / 'vazia.dot'
+    assert escrever_dot(b234.BTree234(), str(saida)) == {'expandidos': 0, 'resumos': 0}
+    assert 'Árvore Vazia' in saida.read_text(encoding='utf-8')
@@ -0,0 +1,68 @@
+import math
+import random
+
+import pytest
+
+from k_d_tree.dynamic_kd_tree import DynamicKDTree
+
+
+def test_operacoes_aleatorias_conferem_com_dict():
+    rng = random.Random(11)
+    tree = DynamicKDTree(2)
+    modelo = {}
+    for passo in range(3000):
+        p = [rng.randrange(100), rng.randrange(100)]
+        op = rng.random()
+        if op < 0.55:
+            assert tree.insert(p, passo) == (tuple(p) not in modelo)
+            modelo[tuple(p)] = passo
+        elif op < 0.8:
+            assert tree.delete(p) == (tuple(p) in modelo)
+            modelo.pop(tuple(p), None)
+        else:
+            assert tree.search(p) == (p if tuple(p) in modelo else None)
+            assert tree.get(p, 'ausente') == modelo.get(tuple(p), 'ausente')
+        assert tree.size == len(modelo)
+        if passo % 150 == 0:
+            low = [rng.randrange(50), rng.randrange(50)]
+            high = [low[0] + rng.randrange(50), low[1] + rng.randrange(50)]
+            dentro = sorted(q for q in modelo if all(a <= c <= b for a, c, b in zip(low, q, high)))
+            assert sorted(map(tuple, tree.range_search(low, high))) == dentro
+            assert tree.range_count(low, high) == len(dentro)
+            alvo = [rng.uniform(0, 100), rng.uniform(0, 100)]
+            esperado = sorted(math.dist(alvo, q) for q in modelo)[:3]
+            assert [d for d, _ in tree.nearest(alvo, 3)] == pytest.approx(esperado)
+    assert sorted((tuple(p), v) for p, v in tree.items()) == sorted(modelo.items())
+
+
+def test_componentes_em_potencias_de_dois():
+    tree = DynamicKDTree(2)
+    for i in range(13):
+        tree.insert([i, -i])
+    # 13 = 0b1101: componentes de 1, 4 e 8 pontos
+    tamanhos = [None if c is None else c.size for c in tree.components]
+    assert tamanhos == [1, None, 4, 8]
+
+
+def test_reinsercao_sem_carga_preserva_a_carga():
+    tree = DynamicKDTree(2)
+    for i in range(6):
+        tree.insert([i, i], f"v{i}")
+    assert not tree.insert([3, 3])
+    assert tree.get([3, 3]) == 'v3'
+    assert not tree.insert([3, 3], 'novo')
+    assert tree.get([3, 3]) == 'novo'
+
+
+def test_ponto_invalido_nao_altera_a_arvore():
+    tree = DynamicKDTree(2)
+    for i in range(3):
+        tree.insert([i, i], i)
+    antes = sorted(tree.points())
+    for ponto in ([7], [1, 2, 3]):
+        with pytest.raises(ValueError):
+            tree.insert(ponto)
+    assert tree.size == 3
+    assert sorted(tree.points()) == antes
+    assert [t is not None for t in tree.components] == [True, True]
+    assert tree.get([2, 2]) == 2
@@ -0,0 +1,76 @@
+import random
+from collections import Counter
+
+from red_black_tree.red_black_tree import RedBlackTree
+
+
+def _medir_234(tree):
+    # (chaves, nós, altura) percorrendo a árvore
+    if not tree.root.keys and tree.root.leaf:
+        return 0, 0, 0
+    chaves = nos = 0
+    pilha = [(tree.root, 1)]
+    altura = 0
+    while pilha:
+        node, nivel = pilha.pop()
+        chaves += len(node.keys)
+        nos += 1
+        altura = max(altura, nivel)
+        if not node.leaf:
+            pilha.extend((child, nivel + 1) for child in node.children)
+    return chaves, nos, altura
+
+
+def _medir_rb(tree):
+    # (nós, valores com repetição, altura preta) percorrendo a árvore
+    nos = total = 0
+    pretos = set()
+    pilha = [(tree.root, 0)]
+    while pilha:
+        node, pretos_acima = pilha.pop()
+        if node == tree.NIL:
+            pretos.add(pretos_acima)
+            continue
+        assert node.color != '🔴' or (node.left.color != '🔴' and node.right.color != '🔴')
+        nos += 1
+        total += node.count
+        pretos_acima += node.color != '🔴'
+        pilha.append((node.left, pretos_acima))
+        pilha.append((node.right, pretos_acima))
+    assert len(pretos) == 1
+    return nos, total, pretos.pop()
+
+
+def test_contadores_234_conferem_com_percurso(b234):
+    rng = random.Random(1)
+    tree = b234.BTree234()
+    presentes = set()
+    for _ in range(3000):
+        k = rng.randrange(400)
+        if rng.random() < 0.55:
+            assert tree.insert(k) == (k not in presentes)
+            presentes.add(k)
+        else:
+            assert tree.delete(k) == (k in presentes)
+            presentes.discard(k)
+        assert (tree.size, tree.node_count, tree.height) == _medir_234(tree)
+    assert tree.traverse() == sorted(presentes)
+
+
+def test_contadores_rb_conferem_com_percurso():
+    rng = random.Random(2)
+    tree = RedBlackTree()
+    modelo = Counter()
+    for _ in range(3000):
+        k = rng.randrange(300)
+        if rng.random() < 0.55:
+            tree.insert(k)
+            modelo[k] += 1
+        else:
+            tree.delete(k)
+            if modelo[k]:
+                modelo[k] -= 1
+            if not modelo[k]:
+                del modelo[k]
+        assert (tree.size, tree.total, tree.black_height) == _medir_rb(tree)
+    assert tree.size == len(modelo) and tree.total == sum(modelo.values())
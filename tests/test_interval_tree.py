@@ -0,0 +1,66 @@
+import io
+import random
+from collections import Counter
+from math import inf
+
+import pytest
+
+from red_black_tree.interval_tree import IntervalTree
+
+
+def _conferir_maximos(tree):
+    # max de cada nó = maior hi da subárvore (-inf no NIL)
+    def maximo(node):
+        if node == tree.NIL:
+            assert node.max == -inf
+            return -inf
+        esperado = max(node.data[1], maximo(node.left), maximo(node.right))
+        assert node.max == esperado
+        return esperado
+    maximo(tree.root)
+
+
+def test_sobreposicoes_conferem_com_forca_bruta():
+    rng = random.Random(3)
+    tree = IntervalTree()
+    modelo = Counter()
+    for passo in range(2500):
+        lo = rng.randrange(200)
+        intervalo = (lo, lo + rng.randrange(30))
+        if rng.random() < 0.6:
+            tree.insert(intervalo)
+            modelo[intervalo] += 1
+        else:
+            assert tree.delete(intervalo) == (intervalo in modelo)
+            if modelo[intervalo] > 1:
+                modelo[intervalo] -= 1
+            else:
+                modelo.pop(intervalo, None)
+        if passo % 100 == 0:
+            _conferir_maximos(tree)
+        a = rng.randrange(-10, 240)
+        b = a + rng.randrange(20)
+        assert list(tree.overlapping(a, b)) == sorted(
+            i for i in modelo if i[0] <= b and i[1] >= a)
+    _conferir_maximos(tree)
+    assert tree.size == len(modelo) and tree.total == sum(modelo.values())
+    assert list(tree.stab(100)) == sorted(i for i in modelo if i[0] <= 100 <= i[1])
+
+
+def test_load_recalcula_os_maximos():
+    rng = random.Random(4)
+    tree = IntervalTree()
+    for _ in range(500):
+        lo = rng.uniform(0, 100)
+        tree.insert((lo, lo + rng.uniform(0, 10)))
+    buffer = io.BytesIO()
+    tree.dump(buffer)
+    buffer.seek(0)
+    carregada = IntervalTree.load(buffer)
+    _conferir_maximos(carregada)
+    assert list(carregada.overlapping(40, 60)) == list(tree.overlapping(40, 60))
+
+
+def test_intervalo_invertido():
+    with pytest.raises(ValueError):
+        IntervalTree().insert((5, 1))
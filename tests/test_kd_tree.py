@@ -0,0 +1,289 @@
+import math
+import random
+
+import pytest
+
+from k_d_tree.k_d_tree import _SEM_VALOR, SPLIT_POLICIES, KDTree
+
+
+def _ponto(rng, k=2, universo=200):
+    return [rng.randrange(universo) for _ in range(k)]
+
+
+def _verificar(tree):
+    # estrutura: corte por eixo, pais, anotações (caixa, vivos, tamanho)
+    vivos = mortos = 0
+    altura = 0
+    stack = [(tree.root, None, 1)]
+    while stack:
+        node, pai, nivel = stack.pop()
+        if node is None:
+            continue
+        assert node.parent is pai
+        altura = max(altura, nivel)
+        eixo = node.axis()
+        if node.left is not None:
+            assert all(p[eixo] < node.point[eixo] for p in _pontos(node.left))
+        if node.right is not None:
+            assert all(p[eixo] >= node.point[eixo] for p in _pontos(node.right))
+        filhos = [f for f in (node.left, node.right) if f is not None]
+        assert node.count == (not node.deleted) + sum(f.count for f in filhos)
+        assert node.tamanho == 1 + sum(f.tamanho for f in filhos)
+        # caixa justa da subárvore (lápides incluídas)
+        sub = _pontos(node)
+        assert node.low == [min(p[i] for p in sub) for i in range(tree.k)]
+        assert node.high == [max(p[i] for p in sub) for i in range(tree.k)]
+        vivos += not node.deleted
+        mortos += node.deleted
+        stack.extend((f, node, nivel + 1) for f in filhos)
+    assert (vivos, mortos) == (tree.size, tree.dead)
+    return altura
+
+
+def _pontos(node):
+    stack, result = [node], []
+    while stack:
+        atual = stack.pop()
+        if atual is not None:
+            result.append(atual.point)
+            stack.extend((atual.left, atual.right))
+    return result
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+@pytest.mark.parametrize('index', [False, True])
+def test_operacoes_aleatorias_conferem_com_dict(lazy, index):
+    rng = random.Random(7)
+    tree = KDTree(2, lazy_delete=lazy, index=index)
+    modelo = {}
+    for passo in range(2500):
+        p = _ponto(rng)
+        op = rng.random()
+        if op < 0.5:
+            assert tree.insert(p, passo) == (tuple(p) not in modelo)
+            modelo[tuple(p)] = passo
+        elif op < 0.8:
+            assert tree.delete(p) == (tuple(p) in modelo)
+            modelo.pop(tuple(p), None)
+        else:
+            assert tree.search(p) == (p if tuple(p) in modelo else None)
+            assert tree.get(p) == modelo.get(tuple(p))
+        if passo % 97 == 0:
+            _verificar(tree)
+            low, high = sorted([_ponto(rng), _ponto(rng)])
+            low, high = [min(a, b) for a, b in zip(low, high)], [max(a, b) for a, b in zip(low, high)]
+            esperado = sorted(q for q in modelo if all(a <= c <= b for a, c, b in zip(low, q, high)))
+            assert sorted(map(tuple, tree.range_search(low, high))) == esperado
+            assert tree.range_count(low, high) == len(esperado)
+    assert sorted(map(tuple, tree.points())) == sorted(modelo)
+    assert sorted((tuple(p), v) for p, v in tree.items()) == sorted(modelo.items())
+
+
+def test_nearest_confere_com_forca_bruta():
+    rng = random.Random(8)
+    pontos = {tuple(_ponto(rng, 3)) for _ in range(400)}
+    tree = KDTree(3)
+    for p in pontos:
+        tree.insert(list(p))
+    for _ in range(30):
+        alvo = _ponto(rng, 3)
+        esperado = sorted(math.dist(alvo, p) for p in pontos)[:5]
+        assert [d for d, _ in tree.nearest(alvo, 5)] == pytest.approx(esperado)
+
+
+def test_insercao_nao_reconstroi_a_arvore_toda():
+    tree = KDTree(2)
+    tree.enable_stats()
+    n = 2000
+    # pontos em ordem crescente: o pior caso sem reequilíbrio
+    for i in range(n):
+        tree.insert([i, i])
+    altura = _verificar(tree)
+    assert altura <= 3 * math.log2(n)
+    # reconstruir tudo a cada inserção custaria ~n²/2 nós
+    assert tree.stats()['nodes_rebuilt'] < 20 * n * math.log2(n) < n * n / 2
+
+
+def test_compactacao_local_das_lapides():
+    tree = KDTree.build([[i, j] for i in range(40) for j in range(40)], 2,
+                        lazy_delete=True, compact_threshold=0.25)
+    tree.enable_stats()
+    # remove um canto: só a região afetada é compactada
+    for i in range(12):
+        for j in range(12):
+            assert tree.delete([i, j])
+    _verificar(tree)
+    assert tree.size == 1600 - 144
+    assert 0 < tree.stats()['nodes_rebuilt'] < tree.size
+    assert tree.dead_ratio() <= tree.compact_threshold
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        if node.tamanho >= KDTree.COMPACT_MIN_NODES:
+            assert node.tamanho - node.count <= tree.compact_threshold * node.tamanho
+        stack.extend((node.left, node.right))
+
+
+def test_compact_sem_limiar_remove_todas_as_lapides():
+    tree = KDTree.build([[i, i % 7] for i in range(100)], 2, lazy_delete=True,
+                        compact_threshold=0.9)
+    for i in range(0, 100, 10):
+        tree.delete([i, i % 7])
+    assert tree.dead == 10
+    tree.compact(0)
+    assert tree.dead == 0 and tree.size == 90
+    _verificar(tree)
+
+
+def test_approximate_nearest_respeita_eps_e_max_checks():
+    rng = random.Random(9)
+    pontos = list({tuple(_ponto(rng, 3, 1000)) for _ in range(2000)})
+    tree = KDTree.build([list(p) for p in pontos], 3)
+    for _ in range(40):
+        alvo = _ponto(rng, 3, 1000)
+        exato = [d for d, _ in tree.nearest(alvo, 4)]
+        resultado, _ = tree.approximate_nearest(alvo, 4)
+        assert [d for d, _ in resultado] == pytest.approx(exato)
+        resultado, _ = tree.approximate_nearest(alvo, 4, eps=0.5)
+        assert len(resultado) == 4
+        for d, p in resultado:
+            assert d == pytest.approx(math.dist(alvo, p))
+        # o n-ésimo devolvido está a no máximo (1+eps) do n-ésimo verdadeiro
+        assert resultado[-1][0] <= 1.5 * exato[-1] + 1e-9
+        resultado, visitados = tree.approximate_nearest(alvo, 4, max_checks=10)
+        assert visitados <= 10 and len(resultado) == 4
+
+
+def test_approximate_nearest_arvore_vazia():
+    assert KDTree(2).approximate_nearest([0, 0]) == ([], 0)
+
+
+@pytest.mark.parametrize('politica', SPLIT_POLICIES)
+def test_politicas_de_corte_mantem_a_arvore_valida(politica):
+    rng = random.Random(10)
+    # dados alongados e com muitos empates no segundo eixo
+    pontos = list({(rng.uniform(0, 1000), rng.randrange(5)) for _ in range(600)})
+    tree = KDTree.build([list(p) for p in pontos], 2, split_policy=politica)
+    _verificar(tree)
+    # as políticas adaptativas cortam primeiro no eixo mais espalhado
+    assert tree.root.axis() == 0
+    for p in pontos[:200]:
+        assert tree.delete(list(p))
+    for _ in range(200):
+        p = [rng.uniform(0, 1000), rng.randrange(5)]
+        tree.insert(p)
+        pontos.append(tuple(p))
+    _verificar(tree)
+    vivos = set(pontos[200:])
+    assert sorted(map(tuple, tree.points())) == sorted(vivos)
+    alvo = [500.0, 2.0]
+    esperado = sorted(math.dist(alvo, p) for p in vivos)[:5]
+    assert [d for d, _ in tree.nearest(alvo, 5)] == pytest.approx(esperado)
+
+
+def test_politica_desconhecida():
+    with pytest.raises(ValueError):
+        KDTree(2, split_policy='aleatoria')
+
+
+def test_range_count_usa_contagens_das_subarvores():
+    rng = random.Random(16)
+    pontos = list({tuple(_ponto(rng, 2, 500)) for _ in range(3000)})
+    tree = KDTree.build([list(p) for p in pontos], 2, lazy_delete=True)
+    for p in pontos[:500]:
+        tree.delete(list(p))
+    vivos = pontos[500:]
+    _verificar(tree)
+    tree.enable_stats()
+    # consulta que cobre quase tudo: subárvores contidas não são visitadas
+    low, high = [10, 10], [490, 490]
+    esperado = sum(all(a <= c <= b for a, c, b in zip(low, p, high)) for p in vivos)
+    assert tree.range_count(low, high) == esperado
+    assert tree.stats()['nodes_visited'] < len(vivos) // 4
+    assert len(tree.range_search(low, high)) == esperado
+    assert tree.range_count([600, 600], [700, 700]) == 0
+
+
+@pytest.mark.parametrize('index', [False, True])
+def test_reinsercao_sem_carga_preserva_a_carga(index):
+    tree = KDTree(2, lazy_delete=True, index=index)
+    assert tree.insert([1, 2], 'a')
+    assert not tree.insert([1, 2])
+    assert tree.get([1, 2]) == 'a'
+    assert not tree.insert([1, 2], None)
+    assert tree.get([1, 2], 'ausente') is None
+    tree.insert([1, 2], 'b')
+    # um ponto removido e reinserido sem carga não recupera a antiga
+    assert tree.delete([1, 2])
+    assert tree.insert([1, 2])
+    assert tree.get([1, 2], 'ausente') is None
+
+
+def test_insert_many_sem_carga_preserva_a_carga():
+    tree = KDTree(2)
+    tree.insert([0, 0], 'zero')
+    assert tree.insert_many([[0, 0], [1, 1], [1, 1]], None) == [False, True, False]
+    assert tree.get([0, 0]) == 'zero' and tree.get([1, 1], 'ausente') is None
+    tree.insert_many([[2, 2], [2, 2]], ['x', _SEM_VALOR])
+    assert tree.get([2, 2]) == 'x'
+
+
+def test_insert_many_lote_pequeno_nao_reconstroi_a_arvore_toda():
+    rng = random.Random(5)
+    tree = KDTree.build([_ponto(rng, universo=10_000) for _ in range(1000)], 2,
+                        lazy_delete=True)
+    removidos = tree.points()[:5]
+    for p in removidos:
+        tree.delete(p)
+    tree.enable_stats()
+    modelo = {tuple(p): v for p, v in tree.items()}
+    for lote in range(20):
+        pontos = [_ponto(rng, universo=10_000) for _ in range(8)] + removidos[lote % 5:][:1]
+        valores = [f'{lote}-{i}' for i in range(len(pontos))]
+        esperado = []
+        for p, v in zip(pontos, valores):
+            esperado.append(tuple(p) not in modelo)
+            modelo[tuple(p)] = v
+        assert tree.insert_many(pontos, valores) == esperado
+    _verificar(tree)
+    assert {tuple(p): v for p, v in tree.items()} == modelo
+    # cada lote reconstruindo tudo custaria 20 * ~1000 nós
+    assert tree.stats()['nodes_rebuilt'] < 5 * len(modelo)
+
+
+@pytest.mark.parametrize('politica', SPLIT_POLICIES)
+def test_dump_load_preserva_estrutura_lapides_e_cargas(politica):
+    import io
+    rng = random.Random(11)
+    tree = KDTree.build([[rng.uniform(0, 100), rng.uniform(0, 100)] for _ in range(300)], 2,
+                        values=[f'v{i}' for i in range(300)], lazy_delete=True,
+                        split_policy=politica, index=True)
+    # inserções ordenadas deixam um ramo profundo
+    for i in range(200):
+        tree.insert([200.0 + i, 200.0 + i], i)
+    for p in rng.sample(tree.points(), 60):
+        tree.delete(p)
+    buffer = io.BytesIO()
+    tree.dump(buffer)
+    buffer.seek(0)
+    carregada = KDTree.load(buffer)
+    assert _verificar(carregada) == _verificar(tree)
+    assert carregada.split_policy == politica and carregada.lazy_delete
+    assert sorted(carregada.items()) == sorted(tree.items())
+    for p in tree.points()[:50]:
+        assert carregada.search(p) == p and carregada.get(p) == tree.get(p)
+    assert carregada.insert([1000.0, 1000.0], 'x') and carregada.get([1000.0, 1000.0]) == 'x'
+    _verificar(carregada)
+
+
+def test_insert_many_rejeita_ponto_malformado_sem_alterar_a_arvore():
+    tree = KDTree(2)
+    tree.insert([1, 1], 'a')
+    with pytest.raises(ValueError):
+        tree.insert_many([[1, 1], [3], [2, 2]], ['b', 'c', 'd'])
+    assert tree.size == 1 and tree.get([1, 1]) == 'a' and tree.search([2, 2]) is None
+    with pytest.raises(ValueError):
+        tree.insert([4, 4, 4])
+    _verificar(tree)
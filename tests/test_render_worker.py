@@ -0,0 +1,233 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from k_d_tree.k_d_tree import KDTree
+from red_black_tree.red_black_tree import RedBlackTree
+from tools.render_worker import BackgroundRenderer
+
+
+class RendererFalso(BackgroundRenderer):
+    """Grava o texto DOT em vez de chamar o graphviz; pode ser travado."""
+
+    def __init__(self, *args, **kwargs):
+        self.liberado = threading.Event()
+        self.liberado.set()
+        self.gerados = []
+        super().__init__(*args, **kwargs)
+
+    def _render(self, source, output_path):
+        self.liberado.wait()
+        if source == 'falha':
+            raise RuntimeError('dot falhou')
+        with open(f"{output_path}.{self.formato}", 'w') as arquivo:
+            arquivo.write(source)
+        self.gerados.append(output_path)
+
+
+def _esperar_fila_vazia(renderer):
+    while renderer._pendentes:
+        time.sleep(0.001)
+
+
+def test_resultado_so_apos_arquivo_existir(tmp_path):
+    renderer = RendererFalso(workers=1)
+    renderer.liberado.clear()
+    pedido = renderer.submit('digraph {}', str(tmp_path / 'a'))
+    assert pedido.caminho == str(tmp_path / 'a.png')
+    assert not pedido.done()
+    renderer.liberado.set()
+    assert pedido.result(timeout=5) == pedido.caminho
+    assert (tmp_path / 'a.png').read_text() == 'digraph {}'
+    renderer.close()
+
+
+def test_fonte_chamavel_roda_na_thread_de_fundo(tmp_path):
+    threads = []
+
+    def gerar():
+        threads.append(threading.current_thread())
+        return 'digraph { x }'
+
+    renderer = RendererFalso(workers=1)
+    renderer.submit(gerar, str(tmp_path / 'b')).result(timeout=5)
+    renderer.close()
+    assert threads and threads[0] is not threading.current_thread()
+
+
+def test_coalescidos_e_descartados(tmp_path):
+    renderer = RendererFalso(workers=1, max_pendentes=2)
+    renderer.liberado.clear()
+    # o primeiro pedido ocupa o worker; os seguintes ficam na fila
+    ocupado = renderer.submit('0', str(tmp_path / 'ocupado'))
+    _esperar_fila_vazia(renderer)
+    velho = renderer.submit('1', str(tmp_path / 'x'))
+    novo = renderer.submit('2', str(tmp_path / 'x'))
+    outro = renderer.submit('3', str(tmp_path / 'y'))
+    descartado = renderer.submit('4', str(tmp_path / 'z'))
+    # z entrou com a fila cheia: o mais antigo (x) foi descartado
+    assert velho.cancelled() and novo.cancelled()
+    renderer.liberado.set()
+    for pedido in (ocupado, outro, descartado):
+        pedido.result(timeout=5)
+    with pytest.raises(CancelledError):
+        velho.result()
+    assert renderer.coalescidos == 1 and renderer.descartados == 1
+    renderer.close()
+
+
+def test_coalescido_termina_com_o_novo(tmp_path):
+    renderer = RendererFalso(workers=1)
+    renderer.liberado.clear()
+    ocupado = renderer.submit('0', str(tmp_path / 'ocupado'))
+    _esperar_fila_vazia(renderer)
+    velho = renderer.submit('1', str(tmp_path / 'x'))
+    novo = renderer.submit('2', str(tmp_path / 'x'))
+    renderer.liberado.set()
+    assert velho.result(timeout=5) == novo.result(timeout=5)
+    assert (tmp_path / 'x.png').read_text() == '2'
+    assert renderer.gerados.count(str(tmp_path / 'x')) == 1
+    ocupado.result(timeout=5)
+    renderer.close()
+
+
+def test_erro_propagado(tmp_path):
+    renderer = RendererFalso(workers=1)
+    pedido = renderer.submit('falha', str(tmp_path / 'c'))
+    with pytest.raises(RuntimeError):
+        pedido.result(timeout=5)
+    renderer.close()
+    assert renderer.erros and 'dot falhou' in renderer.erros[0]
+
+
+def test_submit_apos_close():
+    renderer = RendererFalso(workers=1)
+    renderer.close()
+    with pytest.raises(RuntimeError):
+        renderer.submit('digraph {}', 'x')
+
+
+class RendererLento(RendererFalso):
+    """Conta quantas threads renderizam o mesmo arquivo ao mesmo tempo."""
+
+    def __init__(self, *args, **kwargs):
+        self.simultaneos = 0
+        self.pico = 0
+        self.iniciou = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def _render(self, source, output_path):
+        with self._cond:
+            self.simultaneos += 1
+            self.pico = max(self.pico, self.simultaneos)
+        self.iniciou.set()
+        try:
+            time.sleep(0.02)
+            super()._render(source, output_path)
+        finally:
+            with self._cond:
+                self.simultaneos -= 1
+
+
+def test_mesmo_arquivo_nao_renderiza_em_paralelo(tmp_path):
+    renderer = RendererLento(workers=2)
+    renderer.liberado.clear()
+    caminho = str(tmp_path / 'e')
+    antigo = renderer.submit('digraph { antigo }', caminho)
+    assert renderer.iniciou.wait(5)
+    novo = renderer.submit('digraph { novo }', caminho)
+    # a segunda thread está livre, mas o arquivo ainda está sendo gerado
+    time.sleep(0.05)
+    assert not novo.running()
+    renderer.liberado.set()
+    assert antigo.result(timeout=5) == novo.result(timeout=5)
+    renderer.close()
+    assert renderer.pico == 1
+    assert renderer.gerados == [caminho, caminho]
+    assert (tmp_path / 'e.png').read_text() == 'digraph { novo }'
+
+
+def test_descartar_nao_espera_renderizacao(tmp_path):
+    renderer = RendererFalso(workers=1)
+    renderer.liberado.clear()
+    em_andamento = renderer.submit('digraph {}', str(tmp_path / 'f'))
+    _esperar_fila_vazia(renderer)
+    pendente = renderer.submit('digraph {}', str(tmp_path / 'g'))
+    renderer.descartar(str(tmp_path / 'f'))
+    renderer.descartar(str(tmp_path / 'g'))
+    assert pendente.cancelled()
+    renderer.liberado.set()
+    with pytest.raises(CancelledError):
+        em_andamento.result(timeout=5)
+    renderer.close()
+    assert not (tmp_path / 'f.png').exists()
+    assert not (tmp_path / 'g.png').exists()
+
+
+def test_copia_independente_da_arvore(b234):
+    tree = b234.BTree234()
+    for k in range(10):
+        tree.insert(k)
+    copia = tree._copiar_estrutura()
+    for k in range(10, 20):
+        tree.insert(k)
+    chaves = []
+    pilha = [copia]
+    while pilha:
+        keys, filhos = pilha.pop()
+        chaves.extend(keys)
+        pilha.extend(filhos or ())
+    assert sorted(chaves) == list(range(10))
+
+    rb = RedBlackTree()
+    for k in (5, 3, 8, 3):
+        rb.insert(k)
+    label, vermelho, esquerda, direita = rb._copiar_estrutura()
+    assert (label, vermelho) == ('5', False)
+    assert esquerda[0] == '3\n(2)' and direita[0] == '8'
+
+    kd = KDTree(2)
+    for p in ([5, 5], [2, 7], [8, 1]):
+        kd.insert(p)
+    assert kd._copiar_estrutura() == [('5\n5', False, None), ('2\n7', False, 0), ('8\n1', False, 0)]
+
+
+def test_dot_snapshot_gera_dot_da_copia():
+    pytest.importorskip('graphviz')
+    tree = KDTree(2)
+    tree.insert([1, 2])
+    gerar = tree.dot_snapshot()
+    tree.insert([3, 4])
+    dot = gerar()
+    assert 'node_1' in dot and 'node_2' not in dot
+
+
+def test_driver_kd_remove_sem_esperar_renderizacao(tmp_path, monkeypatch):
+    from k_d_tree import implementacao
+
+    renderer = RendererFalso(workers=1)
+    renderer.liberado.clear()
+    monkeypatch.setattr(implementacao, 'renderizador', renderer)
+    monkeypatch.setattr(implementacao, 'caminho_kd_tree', lambda nome: str(tmp_path / nome))
+    tree = KDTree(2)
+    tree.insert([1, 1])
+    # sem graphviz instalado: o DOT fica fixo, só a ordem importa aqui
+    monkeypatch.setattr(tree, 'dot_snapshot', lambda: lambda: 'digraph {}')
+    em_andamento = implementacao.agendar_visualizacao(tree, 'estado')
+    _esperar_fila_vazia(renderer)
+    pendente = implementacao.agendar_visualizacao(tree, 'estado')
+
+    removedor = threading.Thread(
+        target=implementacao.remover_arquivo_se_existir, args=(em_andamento.caminho,))
+    removedor.start()
+    # a renderização travada não segura a remoção
+    removedor.join(5)
+    assert not removedor.is_alive()
+    assert pendente.cancelled()
+    renderer.liberado.set()
+    with pytest.raises(CancelledError):
+        em_andamento.result(timeout=5)
+    renderer.close()
+    assert not (tmp_path / 'estado.png').exists()
@@ -0,0 +1,84 @@
+import io
+import random
+from collections import Counter
+
+import pytest
+
+from tools import replay
+
+
+def _trace(n=300, universo=50, semente=0):
+    rng = random.Random(semente)
+    return [(rng.choice(replay.OPERACOES), rng.randrange(universo)) for _ in range(n)]
+
+
+def test_ler_texto_aceita_aliases_e_comentarios():
+    linhas = ['# cabeçalho', 'i 10', 'insert 20  # comentário', '', 'S 10', 'd 20']
+    assert list(replay.ler_texto(linhas, 0)) == [
+        ('insert', 10), ('insert', 20), ('search', 10), ('delete', 20)]
+    assert list(replay.ler_texto(['i 1.5 2'], 2)) == [('insert', [1.5, 2.0])]
+
+
+@pytest.mark.parametrize('linha, dim', [('voar 1', 0), ('i 1 2', 0), ('i 1', 2)])
+def test_ler_texto_rejeita_linhas_invalidas(linha, dim):
+    with pytest.raises(ValueError):
+        list(replay.ler_texto([linha], dim))
+
+
+@pytest.mark.parametrize('dim', [0, 3])
+def test_binario_ida_e_volta(dim):
+    if dim == 0:
+        ops = _trace()
+    else:
+        ops = [(op, [float(k), k / 2, -k]) for op, k in _trace()]
+    buffer = io.BytesIO()
+    assert replay.escrever_binario(ops, dim, buffer) == len(ops)
+    assert replay.ler_binario(buffer.getvalue()) == (dim, ops)
+
+
+def test_binario_sem_cabecalho():
+    with pytest.raises(ValueError):
+        replay.ler_binario(b'XXXX\x00')
+
+
+@pytest.mark.parametrize('nome', ['rb', '234'])
+def test_aplicar_confere_com_modelo(nome):
+    ops = _trace()
+    # a RedBlackTree conta repetições (multiconjunto); a BTree234 não
+    modelo = Counter()
+    esperadas = 0
+    for op, k in ops:
+        if op == 'insert':
+            modelo[k] = modelo[k] + 1 if nome == 'rb' else 1
+        elif op == 'delete':
+            modelo[k] -= 1
+            if modelo[k] <= 0:
+                del modelo[k]
+        else:
+            esperadas += k in modelo
+    tree = replay.criar_arvore(nome, 0)
+    resultado = replay.aplicar(tree, nome, ops)
+    assert resultado['operacoes'] == len(ops)
+    assert resultado['por_tipo'] == Counter(op for op, _ in ops)
+    assert resultado['buscas_encontradas'] == esperadas
+    assert tree.size == len(modelo)
+    if nome == 'rb':
+        assert tree.total == sum(modelo.values())
+    else:
+        assert tree.traverse() == sorted(modelo)
+
+
+def test_criar_arvore_desconhecida():
+    with pytest.raises(ValueError):
+        replay.criar_arvore('avl', 0)
+
+
+def test_main_texto_e_conversao(tmp_path, capsys):
+    texto = tmp_path / 'trace.txt'
+    texto.write_text('i 5\ni 7\ns 5\nd 5\ns 5\n')
+    binario = tmp_path / 'trace.bin'
+    assert replay.main([str(texto), '--arvore', '234', '--converter', str(binario)]) == 0
+    assert replay.main([str(binario), '--arvore', '234', '--stats']) == 0
+    saida = capsys.readouterr().out
+    assert 'Buscas encontradas: 1' in saida
+    assert "'chaves': 1" in saida
@@ -0,0 +1,129 @@
+import io
+import random
+from collections import Counter
+
+import pytest
+
+from red_black_tree.red_black_tree import RedBlackTree
+from tools.serial import gravar_valores, ler_valores
+
+
+def _ida_e_volta(tree, cls):
+    buffer = io.BytesIO()
+    tree.dump(buffer)
+    buffer.seek(0)
+    return cls.load(buffer)
+
+
+@pytest.mark.parametrize('valores', [
+    [], [None, None], [1, -2, 3], [0.5, -1e300], [2 ** 70, 1],
+    ['a', 'b'], [1, 1.5], [True, False], [(1, 2), None],
+])
+def test_valores_ida_e_volta(valores):
+    buffer = io.BytesIO()
+    gravar_valores(buffer, valores)
+    gravar_valores(buffer, [7])
+    buffer.seek(0)
+    lidos = ler_valores(buffer)
+    assert lidos == valores and [type(v) for v in lidos] == [type(v) for v in valores]
+    # o próximo vetor começa logo depois
+    assert ler_valores(buffer) == [7]
+
+
+def _forma_rb(rb):
+    forma = []
+    stack = [rb.root]
+    while stack:
+        node = stack.pop()
+        if node == rb.NIL:
+            forma.append(None)
+            continue
+        assert node.left == rb.NIL or node.left.parent is node
+        assert node.right == rb.NIL or node.right.parent is node
+        forma.append((node.data, node.color, node.count))
+        stack.extend((node.right, node.left))
+    return forma
+
+
+@pytest.mark.parametrize('chave', [int, float, str])
+def test_rb_dump_load(chave):
+    rng = random.Random(9)
+    tree = RedBlackTree()
+    for _ in range(2000):
+        k = chave(rng.randrange(700))
+        if rng.random() < 0.75:
+            tree.insert(k)
+        else:
+            tree.delete(k)
+    carregada = _ida_e_volta(tree, RedBlackTree)
+    assert _forma_rb(carregada) == _forma_rb(tree)
+    assert (carregada.size, carregada.total, carregada.black_height) == (
+        tree.size, tree.total, tree.black_height)
+    carregada.insert(chave(5000))
+    assert carregada.search(chave(5000)) is not None
+    assert _forma_rb(_ida_e_volta(RedBlackTree(), RedBlackTree)) == [None]
+
+
+def _forma_234(tree):
+    forma = []
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        forma.append((tuple(node.keys), node.leaf))
+        if not node.leaf:
+            assert len(node.children) == len(node.keys) + 1
+            stack.extend(reversed(node.children))
+    return forma
+
+
+@pytest.mark.parametrize('chave', [int, float, str, lambda k: 2 ** 64 + k])
+def test_234_dump_load(b234, chave):
+    rng = random.Random(10)
+    tree = b234.BTree234()
+    modelo = set()
+    for _ in range(3000):
+        k = chave(rng.randrange(1000))
+        if rng.random() < 0.7:
+            tree.insert(k)
+            modelo.add(k)
+        else:
+            tree.delete(k)
+            modelo.discard(k)
+    carregada = _ida_e_volta(tree, b234.BTree234)
+    assert _forma_234(carregada) == _forma_234(tree)
+    assert (carregada.size, carregada.node_count, carregada.height) == (
+        tree.size, tree.node_count, tree.height)
+    assert carregada.traverse() == sorted(modelo)
+    # a árvore carregada continua operável
+    removidas = sorted(modelo)[::3]
+    for k in removidas:
+        assert carregada.delete(k)
+    assert carregada.traverse() == sorted(modelo - set(removidas))
+    assert _ida_e_volta(b234.BTree234(), b234.BTree234).traverse() == []
+
+
+def test_load_rejeita_outro_formato(b234):
+    buffer = io.BytesIO()
+    b234.BTree234().dump(buffer)
+    buffer.seek(0)
+    with pytest.raises(ValueError):
+        RedBlackTree.load(buffer)
+
+
+def test_rb_arvore_grande_sem_recursao():
+    # pickle recursivo estoura com árvores profundas; dump/load não recursam
+    tree = RedBlackTree()
+    for k in range(20000):
+        tree.insert(k)
+        if k % 3 == 0:
+            tree.insert(k)
+    carregada = _ida_e_volta(tree, RedBlackTree)
+    assert carregada.total == tree.total
+    contagens = Counter()
+    stack = [carregada.root]
+    while stack:
+        node = stack.pop()
+        if node != carregada.NIL:
+            contagens[node.count] += 1
+            stack.extend((node.left, node.right))
+    assert contagens == {1: 20000 - 6667, 2: 6667}
@@ -0,0 +1,44 @@
+import itertools
+import random
+
+import pytest
+
+
+@pytest.mark.parametrize('curve', ['morton', 'hilbert'])
+@pytest.mark.parametrize('k', [2, 3])
+def test_range_search_confere_com_forca_bruta(b234, curve, k):
+    rng = random.Random(k)
+    index = b234.SFCIndex(k, low=[0] * k, high=[100] * k, bits=6, curve=curve)
+    modelo = {}
+    for i in range(1500):
+        p = tuple(rng.uniform(0, 100) for _ in range(k))
+        assert index.insert(list(p), i)
+        modelo[p] = i
+    for p in rng.sample(sorted(modelo), 400):
+        assert index.delete(list(p))
+        del modelo[p]
+    assert not index.delete([50.0] * k) and index.size == len(modelo)
+    for p, v in list(modelo.items())[:50]:
+        assert index.get(list(p)) == v
+    # reinserção só atualiza a carga
+    p = next(iter(modelo))
+    assert not index.insert(list(p), 'novo') and index.get(list(p)) == 'novo'
+
+    for _ in range(60):
+        a = [rng.uniform(-10, 110) for _ in range(k)]
+        b = [rng.uniform(-10, 110) for _ in range(k)]
+        low, high = [min(x, y) for x, y in zip(a, b)], [max(x, y) for x, y in zip(a, b)]
+        esperado = sorted(p for p in modelo if all(l <= c <= h for l, c, h in zip(low, p, high)))
+        assert sorted(map(tuple, index.range_search(low, high))) == esperado
+        assert index.range_count(low, high) == len(esperado)
+
+
+def test_hilbert_celulas_vizinhas_na_curva(b234):
+    # 2**(bits*k) chaves distintas e passos consecutivos entre células adjacentes
+    index = b234.SFCIndex(2, low=[0, 0], high=[1, 1], bits=4, curve='hilbert')
+    celulas = {index._chave(c): c for c in itertools.product(range(16), repeat=2)}
+    assert sorted(celulas) == list(range(256))
+    for chave in range(255):
+        a, b = celulas[chave], celulas[chave + 1]
+        assert sum(abs(x - y) for x, y in zip(a, b)) == 1
+
@@ -0,0 +1,112 @@
+import importlib
+import random
+
+import pytest
+
+sharded = importlib.import_module('2-3-4.sharded')
+
+
+class Chave(int):
+    # compara com inteiros comuns, mas não com outra Chave: provoca um erro
+    # dentro do worker depois de o roteamento (bisect nos limites) funcionar
+    def _conferir(self, outro):
+        if isinstance(outro, Chave):
+            raise TypeError("Chaves não comparáveis entre si")
+
+    def __lt__(self, outro):
+        self._conferir(outro)
+        return int(self) < outro
+
+    def __gt__(self, outro):
+        self._conferir(outro)
+        return int(self) > outro
+
+    def __eq__(self, outro):
+        self._conferir(outro)
+        return int(self) == outro
+
+    __hash__ = int.__hash__
+
+
+def test_operacoes_e_splits_conferem_com_conjunto():
+    rng = random.Random(12)
+    modelo = set()
+    with sharded.ShardedBTree234(limites=[300, 600]) as tree:
+        for rodada in range(6):
+            lote = [rng.randrange(1000) for _ in range(300)]
+            assert tree.insert_many(lote) == len(set(lote) - modelo)
+            modelo.update(lote)
+            for _ in range(100):
+                k = rng.randrange(1000)
+                if rng.random() < 0.5:
+                    assert tree.insert(k) == (k not in modelo)
+                    modelo.add(k)
+                else:
+                    assert tree.delete(k) == (k in modelo)
+                    modelo.discard(k)
+                assert tree.search(k) == (k if k in modelo else None)
+            if rodada % 2:
+                tree.split_hot()
+            lo = rng.randrange(1000)
+            hi = lo + rng.randrange(300)
+            assert tree.range_search(lo, hi) == sorted(k for k in modelo if lo <= k <= hi)
+        assert tree.traverse() == sorted(modelo)
+        assert tree.size == len(modelo) == sum(tree.shard_sizes())
+        assert tree.limites == sorted(tree.limites) and tree.shards == 6
+
+
+def test_split_pela_mediana_e_com_corte():
+    with sharded.ShardedBTree234() as tree:
+        tree.insert_many(range(101))
+        assert tree.split(0) == 50
+        assert tree.shard_sizes() == [50, 51]
+        assert tree.split(1, corte=90) == 90
+        assert tree.shard_sizes() == [50, 40, 11]
+        with pytest.raises(ValueError):
+            tree.split(0, corte=70)
+        assert tree.traverse() == list(range(101))
+
+
+def test_split_hot_conta_chaves_e_nao_mensagens():
+    with sharded.ShardedBTree234(limites=[1000]) as tree:
+        for k in range(10):
+            tree.insert(k)
+        # uma mensagem com 500 chaves pesa mais que 10 mensagens de uma
+        tree.insert_many(range(1000, 1500))
+        assert tree.split_hot() == 1
+        assert tree.shards == 3
+
+
+def test_split_sem_perder_chaves_se_o_worker_novo_falhar(monkeypatch):
+    class ShardFalho(sharded._Shard):
+        def chamar(self, op, *args):
+            if op == 'insert_many':
+                raise RuntimeError("worker novo caiu")
+            return super().chamar(op, *args)
+
+    with sharded.ShardedBTree234() as tree:
+        tree.insert_many(range(100))
+        monkeypatch.setattr(sharded, '_Shard', ShardFalho)
+        with pytest.raises(RuntimeError):
+            tree.split(0)
+        monkeypatch.undo()
+        assert tree.shards == 1 and tree.limites == []
+        assert tree.traverse() == list(range(100)) and tree.shard_sizes() == [100]
+        tree.split(0)
+        assert tree.traverse() == list(range(100))
+
+
+def test_erro_num_shard_nao_deixa_respostas_atrasadas():
+    with sharded.ShardedBTree234(limites=[100]) as tree:
+        # o shard 0 falha no meio do lote; o shard 1 responde depois
+        with pytest.raises(TypeError):
+            tree.insert_many([Chave(1), Chave(2), 150])
+        # o que entrou antes do erro é contado
+        assert tree.shard_sizes() == [1, 1] and tree.size == 2
+        assert tree.search(150) == 150
+        assert tree.insert(7) is True
+
+        with pytest.raises(TypeError):
+            tree.range_search(Chave(0), 200)
+        assert tree.range_search(100, 200) == [150]
+        assert tree.delete(7) is True and tree.search(7) is None
@@ -0,0 +1,66 @@
+import math
+import random
+from itertools import combinations
+
+import pytest
+
+from k_d_tree.k_d_tree import KDTree
+from k_d_tree.spatial_join import all_knn, knn_join, pairs_within
+
+
+def _arvore(rng, n, remover=0):
+    pontos = list({(rng.randrange(100), rng.randrange(100)) for _ in range(n)})
+    tree = KDTree.build([list(p) for p in pontos], 2, lazy_delete=True, compact_threshold=0.9)
+    # lápides também precisam ser ignoradas pela junção
+    for p in pontos[:remover]:
+        tree.delete(list(p))
+    return tree, pontos[remover:]
+
+
+def _pares(resultado):
+    return sorted((tuple(a), tuple(b), round(d, 9)) for a, b, d in resultado)
+
+
+def test_pairs_within_entre_duas_arvores():
+    rng = random.Random(12)
+    tree_a, pontos_a = _arvore(rng, 300, remover=30)
+    tree_b, pontos_b = _arvore(rng, 250, remover=20)
+    esperado = [(a, b, round(math.dist(a, b), 9)) for a in pontos_a for b in pontos_b
+                if math.dist(a, b) <= 6]
+    assert _pares(pairs_within(tree_a, tree_b, 6)) == sorted(esperado)
+
+
+def test_pairs_within_auto_juncao_sem_repetir_pares():
+    rng = random.Random(13)
+    tree, pontos = _arvore(rng, 300, remover=25)
+    resultado = list(pairs_within(tree, tree, 7))
+    nao_ordenados = {frozenset((tuple(a), tuple(b))) for a, b, _ in resultado}
+    assert len(nao_ordenados) == len(resultado)
+    esperado = {frozenset(par) for par in combinations(pontos, 2) if math.dist(*par) <= 7}
+    assert nao_ordenados == esperado
+
+
+def test_knn_join_e_all_knn():
+    rng = random.Random(14)
+    consultas, pontos_q = _arvore(rng, 120, remover=10)
+    referencia, pontos_r = _arvore(rng, 300, remover=30)
+    resultado = knn_join(consultas, referencia, 3)
+    assert set(resultado) == set(pontos_q)
+    for q, vizinhos in resultado.items():
+        esperado = sorted(math.dist(q, r) for r in pontos_r)[:3]
+        assert [d for d, _ in vizinhos] == pytest.approx(esperado)
+
+    grafo = all_knn(referencia, 2)
+    for p, vizinhos in grafo.items():
+        # o próprio ponto não conta como vizinho
+        esperado = sorted(math.dist(p, r) for r in pontos_r if r != p)[:2]
+        assert [d for d, _ in vizinhos] == pytest.approx(esperado)
+        assert all(tuple(v) != p for _, v in vizinhos)
+
+
+def test_arvores_vazias():
+    vazia = KDTree(2)
+    cheia = KDTree.build([[1, 1], [2, 2]], 2)
+    assert list(pairs_within(vazia, cheia, 5)) == []
+    assert knn_join(vazia, cheia) == {}
+    assert knn_join(cheia, vazia) == {(1, 1): [], (2, 2): []}
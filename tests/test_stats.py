@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from k_d_tree import KDTree
+from red_black_tree.red_black_tree import RedBlackTree
+
+
+@pytest.fixture(params=['rb', '234', 'kd'])
+def arvore(request, b234):
+    if request.param == 'rb':
+        return RedBlackTree(), random.random
+    if request.param == '234':
+        return b234.BTree234(), random.random
+    return KDTree(2), lambda: [random.random(), random.random()]
+
+
+def test_contadores_desligados_por_padrao(arvore):
+    tree, gerar = arvore
+    tree.insert(gerar())
+    assert tree.stats() == {}
+
+
+def test_contadores_e_callback_de_tempo(arvore):
+    tree, gerar = arvore
+    tempos = []
+    tree.enable_stats(on_timing=lambda op, segundos: tempos.append((op, segundos)))
+    for _ in range(40):
+        tree.insert(gerar())
+    tree.search(gerar())
+    stats = tree.stats()
+    assert set(stats) == set(type(tree).STATS_KEYS)
+    assert stats['comparisons'] > 0
+    assert [op for op, _ in tempos].count('insert') == 40
+    assert tempos[-1][0] == 'search' and all(s >= 0 for _, s in tempos)
+
+    tree.disable_stats()
+    assert tree.stats() == {}
+    assert 'insert' not in tree.__dict__
+
+
+def test_comparacoes_da_insercao_2_3_4(b234):
+    tree = b234.BTree234()
+    for k in (10, 20, 30):
+        tree.insert(k)
+    tree.enable_stats()
+    # raiz cheia [10, 20, 30]: busca de duplicata (3 comparações), split da
+    # raiz, 1 comparação para escolher o lado e 1 na folha [30]
+    tree.insert(40)
+    assert tree.stats()['comparisons'] == 3 + 1 + 1
+    assert tree.stats()['split_child'] == 1
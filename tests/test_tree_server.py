@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+
+from tools.tree_server import TreeClient, TreeServer
+
+
+def _rodar(cenario):
+    # servidor e cliente no mesmo loop, por TCP numa porta livre
+    async def principal():
+        servidor = TreeServer()
+        server = await servidor.start(port=0)
+        porta = server.sockets[0].getsockname()[1]
+        cliente = await TreeClient.connect(port=porta)
+        try:
+            # uma resposta perdida falha o teste em vez de travá-lo
+            return await asyncio.wait_for(cenario(servidor, cliente), 10)
+        finally:
+            await cliente.close()
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(principal())
+
+
+async def _respostas(futuros):
+    # resultado de cada requisição, ou a mensagem de erro
+    resultados = await asyncio.gather(*futuros, return_exceptions=True)
+    return [str(r) if isinstance(r, Exception) else r for r in resultados]
+
+
+def test_lote_kd_recusa_so_o_ponto_malformado():
+    async def cenario(servidor, cliente):
+        await cliente.create('pts', 'kd', 2)
+        # enviados sem esperar: chegam juntos e viram um insert_many
+        lote = [[1, 1], [3], [2, 2], [0, 5]]
+        respostas = await _respostas([cliente.insert('pts', p, i) for i, p in enumerate(lote)])
+        tamanho = await cliente.size('pts')
+        caixa = await cliente.range('pts', [0, 0], [9, 9])
+        return respostas, tamanho, caixa
+    respostas, tamanho, caixa = _rodar(cenario)
+    assert respostas[0] is True and respostas[2] is True and respostas[3] is True
+    assert respostas[1].startswith('ValueError')
+    assert tamanho == 3
+    assert sorted(caixa) == [[0, 5], [1, 1], [2, 2]]
+
+
+@pytest.mark.parametrize('args', [
+    (['a', 1],), ([1, 2, 3],), ('1,2',), ([1, None],), ([1, 2], 'x', 'y'), (),
+])
+def test_insercoes_kd_malformadas(args):
+    async def cenario(servidor, cliente):
+        await cliente.create('pts', 'kd', 2)
+        respostas = await _respostas([cliente.insert('pts', [5, 5]),
+                                      cliente.insert('pts', *args),
+                                      cliente.insert('pts', [6, 6], 'b')])
+        # sozinha no lote, a malformada também é recusada
+        sozinha = await _respostas([cliente.insert('pts', *args)])
+        return respostas + sozinha, await cliente.size('pts'), await cliente.search('pts', [6, 6])
+    respostas, tamanho, achado = _rodar(cenario)
+    assert respostas[0] is True and respostas[2] is True
+    assert 'Error' in respostas[1] and 'Error' in respostas[3]
+    assert tamanho == 2 and achado == [6, 6]
+
+
+def test_lote_kd_mantem_cargas_e_reinsercoes():
+    async def cenario(servidor, cliente):
+        await cliente.create('pts', 'kd', 2)
+        primeiras = await _respostas([cliente.insert('pts', [i, i], i) for i in range(20)])
+        # reinserção sem carga não apaga a carga anterior
+        segundas = await _respostas([cliente.insert('pts', [i, i]) for i in range(0, 30, 2)])
+        vizinho = await cliente.knn('pts', [3.1, 3.1], 1)
+        return primeiras, segundas, vizinho, await cliente.size('pts')
+    primeiras, segundas, vizinho, tamanho = _rodar(cenario)
+    assert primeiras == [True] * 20
+    assert segundas == [False] * 10 + [True] * 5
+    assert vizinho[0][1] == [3, 3] and tamanho == 25
+
+
+@pytest.mark.parametrize('tipo', ['rb', '234'])
+def test_operacoes_e_erros(tipo):
+    async def cenario(servidor, cliente):
+        await cliente.create('idx', tipo)
+        inseridas = await _respostas([cliente.insert('idx', k) for k in [5, 3, 5, 9, 1]])
+        return (inseridas,
+                await cliente.range('idx', 2, 9),
+                await cliente.delete('idx', 3),
+                await cliente.search('idx', 3),
+                await cliente.size('idx'),
+                await _respostas([cliente.size('nada'), cliente.call('idx', 'voar')]))
+    inseridas, faixa, removida, busca, tamanho, erros = _rodar(cenario)
+    assert inseridas == [True, True, False, True, True]
+    assert faixa == [3, 5, 9]
+    assert removida is True and busca is None and tamanho == 3
+    assert erros[0] == 'Árvore desconhecida: nada'
+    assert erros[1].startswith('ValueError')
+
+
+def test_requisicao_invalida_responde_na_ordem():
+    async def cenario(servidor, cliente):
+        porta = cliente._writer.get_extra_info('peername')[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', porta)
+        # tudo numa escrita: as válidas já estão na fila quando o lixo chega
+        writer.write(b'{"id": 1, "arvore": "t", "op": "create", "args": ["rb"]}\n'
+                     b'{"id": 2, "arvore": "t", "op": "insert", "args": [5]}\n'
+                     b'isto nao e json\n'
+                     b'[1, 2]\n'
+                     b'{"id": 3, "arvore": "t", "op": "size", "args": []}\n')
+        respostas = [json.loads(await reader.readline()) for _ in range(5)]
+        writer.close()
+        return respostas
+    respostas = _rodar(cenario)
+    assert [r['id'] for r in respostas] == [1, 2, None, None, 3]
+    assert respostas[2] == {'id': None, 'ok': False, 'erro': "Requisição inválida"}
+    assert respostas[4]['resultado'] == 1
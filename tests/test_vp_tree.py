@@ -0,0 +1,47 @@
+import math
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from k_d_tree.vp_tree import VPTree
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_operacoes_aleatorias_conferem_com_conjunto():
+    rng = random.Random(15)
+    tree = VPTree(3)
+    modelo = set()
+    for passo in range(2500):
+        p = [rng.randrange(30) for _ in range(3)]
+        op = rng.random()
+        if op < 0.55:
+            assert tree.insert(p) == (tuple(p) not in modelo)
+            modelo.add(tuple(p))
+        elif op < 0.8:
+            assert tree.delete(p) == (tuple(p) in modelo)
+            modelo.discard(tuple(p))
+        else:
+            assert tree.search(p) == (p if tuple(p) in modelo else None)
+        assert tree.size == len(modelo)
+        if passo % 125 == 0:
+            alvo = [rng.uniform(0, 30) for _ in range(3)]
+            esperado = sorted(math.dist(alvo, q) for q in modelo)[:4]
+            assert [d for d, _ in tree.nearest(alvo, 4)] == pytest.approx(esperado)
+            low = [rng.randrange(15) for _ in range(3)]
+            high = [c + rng.randrange(15) for c in low]
+            dentro = sorted(q for q in modelo if all(a <= c <= b for a, c, b in zip(low, q, high)))
+            assert sorted(map(tuple, tree.range_search(low, high))) == dentro
+    assert sorted(map(tuple, tree.points())) == sorted(modelo)
+
+
+def test_import_do_pacote_nao_carrega_os_motores():
+    codigo = ("import sys, k_d_tree; "
+              "print('k_d_tree.vp_tree' in sys.modules, 'random' in sys.modules); "
+              "k_d_tree.VPTree; print('k_d_tree.vp_tree' in sys.modules)")
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True,
+                           check=True, cwd=RAIZ).stdout.split()
+    assert saida == ['False', 'False', 'True']
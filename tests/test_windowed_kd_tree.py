@@ -0,0 +1,51 @@
+from k_d_tree.windowed_kd_tree import WindowedKDTree
+
+
+def test_renovar_timestamp_sem_carga_preserva_a_carga():
+    tree = WindowedKDTree(2, horizon=10, bucket_width=1, clock=None)
+    tree.insert([1, 1], 'a', timestamp=0)
+    # reinserção move o ponto para o balde atual, com a mesma carga
+    assert tree.insert([1, 1], timestamp=5)
+    assert tree.get([1, 1]) == 'a'
+    tree.expire(12)
+    assert tree.get([1, 1]) == 'a'
+    assert tree.insert([1, 1], 'b', timestamp=13)
+    assert tree.get([1, 1]) == 'b'
+
+
+def test_expiracao_confere_com_modelo():
+    import random
+    rng = random.Random(5)
+    horizon = 20
+    tree = WindowedKDTree(2, horizon=horizon, bucket_width=3, clock=None)
+    # modelo: ponto -> (timestamp, carga)
+    modelo = {}
+    agora = 0
+    for passo in range(3000):
+        agora += rng.choice([0, 0, 1, 2])
+        # timestamps um pouco fora de ordem, às vezes já vencidos
+        ts = agora - rng.randrange(25)
+        p = (rng.randrange(12), rng.randrange(12))
+        op = rng.random()
+        if op < 0.7:
+            aceito = tree.insert(list(p), passo, timestamp=ts)
+            # o "agora" da janela é o maior timestamp já visto
+            assert aceito == (ts >= tree.now - horizon)
+            if aceito:
+                modelo[p] = (ts, passo)
+        elif op < 0.85:
+            tree.expire(agora)
+            modelo = {q: v for q, v in modelo.items() if v[0] >= tree.now - horizon}
+            assert tree.delete(list(p)) == (p in modelo)
+            modelo.pop(p, None)
+        else:
+            tree.expire(agora)
+        limite = tree.now - horizon
+        modelo = {q: v for q, v in modelo.items() if v[0] >= limite}
+        assert tree.size == len(modelo)
+        if passo % 50 == 0:
+            assert sorted(map(tuple, tree.points())) == sorted(modelo)
+            for q, (_, carga) in modelo.items():
+                assert tree.get(list(q)) == carga
+            assert tree.range_count([2, 2], [8, 8]) == sum(
+                2 <= x <= 8 and 2 <= y <= 8 for x, y in modelo)
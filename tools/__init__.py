@@ -0,0 +1,11 @@
+"""
+Ferramentas compartilhadas entre as árvores do repositório.
+
+Este pacote contém:
+- replay.py: Execução não interativa (batch/replay) de traces de operações
+- render_worker.py: Renderização das visualizações em segundo plano
+- dot_stream.py: Visualização em stream, com nível de detalhe, de árvores grandes
+- convert.py: Conversão em O(n) entre BTree234 e RedBlackTree (isomorfismo 2-3-4 / rubro-negra)
+- stats.py: Instrumentação opcional (contadores e callbacks de tempo) compartilhada pelas árvores
+- tree_server.py: Servidor local (asyncio) de árvores nomeadas, com pipelining e inserções em lote
+"""
@@ -0,0 +1,152 @@
+"""
+Conversão em O(n) entre BTree234 e RedBlackTree, sem comparações.
+
+As duas estruturas são isomorfas (ver 234.md e REDBLACK.md):
+- 2-nó [b]        <-> b preto
+- 3-nó [a, b]     <-> b preto com filho esquerdo a vermelho
+- 4-nó [a, b, c]  <-> b preto com filhos a e c vermelhos
+Os filhos do nó 2-3-4 viram, em ordem, os filhos dos nós da tradução.
+Cada nó é visitado uma única vez (iterativamente, sem recursão) e as chaves
+nunca são comparadas, então a forma da árvore é preservada: a altura da
+2-3-4 é a altura preta da rubro-negra e vice-versa.
+
+A BTree234 não guarda repetições; as multiplicidades de RedBlackTree
+(Node.count) saem de rb_para_234 num dicionário {chave: count} (só as
+chaves com count > 1), que b234_para_rb aceita de volta.
+
+Exemplo de uso:
+    from tools.convert import rb_para_234, b234_para_rb
+    btree, contagens = rb_para_234(rb)
+    rb_de_novo = b234_para_rb(btree, contagens)
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, Optional, Tuple
+
+from red_black_tree.red_black_tree import RedBlackTree
+
+VERMELHO = '🔴'
+PRETO = '⚫'
+
+
+def _modulo_234():
+    return importlib.import_module('2-3-4.2-3-4')
+
+
+def b234_para_rb(tree, contagens: Optional[Dict[Any, int]] = None) -> RedBlackTree:
+    """Monta a RedBlackTree equivalente à BTree234 (cada chave com count 1,
+    exceto as presentes em contagens)."""
+    rb = RedBlackTree()
+    nil = rb.NIL
+    if not tree.root.keys:
+        return rb
+    node_class = rb.node_class
+    contagens = contagens or {}
+    # cópias além da primeira, só das chaves que estão na árvore
+    extras = 0
+
+    def novo(chave, cor, parent):
+        nonlocal extras
+        node = node_class(chave)
+        node.color = cor
+        node.left = node.right = nil
+        node.parent = parent
+        if contagens:
+            node.count = contagens.get(chave, 1)
+            extras += node.count - 1
+        return node
+
+    # (nó da 2-3-4, pai na rubro-negra, vai à esquerda do pai?)
+    stack = [(tree.root, None, False)]
+    while stack:
+        bnode, parent, esquerda = stack.pop()
+        keys = bnode.keys
+        if len(keys) == 1:
+            topo = novo(keys[0], PRETO, parent)
+            encaixes = [(topo, True), (topo, False)]
+        elif len(keys) == 2:
+            topo = novo(keys[1], PRETO, parent)
+            a = topo.left = novo(keys[0], VERMELHO, topo)
+            encaixes = [(a, True), (a, False), (topo, False)]
+        else:
+            topo = novo(keys[1], PRETO, parent)
+            a = topo.left = novo(keys[0], VERMELHO, topo)
+            c = topo.right = novo(keys[2], VERMELHO, topo)
+            encaixes = [(a, True), (a, False), (c, True), (c, False)]
+
+        if parent is None:
+            rb.root = topo
+        elif esquerda:
+            parent.left = topo
+        else:
+            parent.right = topo
+
+        if not bnode.leaf:
+            for child, (pai, lado) in zip(bnode.children, encaixes):
+                stack.append((child, pai, lado))
+
+    rb.size = tree.size
+    rb.total = tree.size + extras
+    rb.black_height = tree.height
+    return rb
+
+
+def rb_para_234(rb: RedBlackTree) -> Tuple[Any, Dict[Any, int]]:
+    """Monta a BTree234 equivalente à RedBlackTree.
+
+    Retorna (árvore, contagens), com contagens = {chave: count} das chaves
+    repetidas na rubro-negra.
+    """
+    modulo = _modulo_234()
+    tree = modulo.BTree234()
+    nil = rb.NIL
+    contagens: Dict[Any, int] = {}
+    if rb.root == nil:
+        return tree, contagens
+
+    BTreeNode = modulo.BTreeNode
+    t = tree.t
+    # (nó preto da rubro-negra, nó 2-3-4 pai ou None)
+    stack = [(rb.root, None)]
+    node_count = 0
+    while stack:
+        black, parent = stack.pop()
+        node_count += 1
+        left, right = black.left, black.right
+        # filhos vermelhos são absorvidos no nó 2-3-4 do pai preto
+        absorvidos = []
+        filhos = []
+        if left.color == VERMELHO:
+            absorvidos.append(left)
+            filhos += (left.left, left.right)
+        else:
+            filhos.append(left)
+        absorvidos.append(black)
+        if right.color == VERMELHO:
+            absorvidos.append(right)
+            filhos += (right.left, right.right)
+        else:
+            filhos.append(right)
+
+        # pela altura preta uniforme, ou todos os filhos são NIL ou nenhum
+        bnode = BTreeNode(t, leaf=filhos[0] == nil)
+        bnode.keys = [node.data for node in absorvidos]
+        for node in absorvidos:
+            if node.count > 1:
+                contagens[node.data] = node.count
+
+        if parent is None:
+            tree.root = bnode
+        else:
+            parent.children.append(bnode)
+        if not bnode.leaf:
+            # empilha do último para o primeiro para os filhos entrarem em ordem
+            for filho in reversed(filhos):
+                stack.append((filho, bnode))
+
+    tree.size = rb.size
+    tree.node_count = node_count
+    tree.height = rb.black_height
+    return tree, contagens
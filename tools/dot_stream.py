@@ -0,0 +1,290 @@
+"""
+Visualização de árvores muito grandes com nível de detalhe e saída em stream.
+
+Em vez de montar o grafo inteiro em memória (como visualize/print_tree), os
+nós são visitados iterativamente (sem recursão) em largura e cada linha DOT
+é escrita assim que gerada — direto no arquivo ou na entrada do executável
+`dot` quando a saída é SVG/PNG.
+
+Controles de detalhe:
+- max_profundidade: nós abaixo dessa profundidade viram nós-resumo
+- max_nos: limite de nós expandidos; o restante da fronteira é resumido
+- amostra: fração dos filhos expandidos em cada nó (os demais são resumidos)
+- limite_resumo: máximo de nós percorridos para montar cada resumo
+  (padrão LIMITE_RESUMO; None = exato, O(tamanho da subárvore) por resumo)
+
+Cada nó-resumo mostra o intervalo de chaves (ou a caixa envolvente na
+k-D tree), a quantidade de chaves e a altura da subárvore colapsada. O
+intervalo é sempre exato (descida até os extremos ou a caixa guardada no
+nó da k-D tree), assim como a contagem na k-D tree (node.count) e a
+altura na 2-3-4 (folhas no mesmo nível). O que a árvore não guarda é
+contado percorrendo até limite_resumo nós; se o limite é atingido, o
+rótulo mostra o valor mínimo (≥).
+Os filhos NIL da Red-Black Tree não são desenhados.
+
+Exemplo de uso:
+    from tools.dot_stream import escrever_dot
+    escrever_dot(tree, 'arvore.svg', max_profundidade=8, amostra=0.25)
+"""
+
+from __future__ import annotations
+
+import random
+import subprocess
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+# nós percorridos por resumo quando limite_resumo não é informado
+LIMITE_RESUMO = 1000
+
+
+class _AdaptadorRB:
+    def __init__(self, tree) -> None:
+        self.nil = tree.NIL
+        self.raiz = tree.root if tree.root != tree.NIL else None
+
+    def filhos(self, node) -> List[Any]:
+        return [f for f in (node.left, node.right) if f is not self.nil]
+
+    def chaves(self, node) -> List[Any]:
+        return [node.data]
+
+    def contagem(self, node) -> int:
+        return node.count
+
+    def faixa(self, node) -> Tuple[Any, Any]:
+        minimo = maximo = node
+        while minimo.left is not self.nil:
+            minimo = minimo.left
+        while maximo.right is not self.nil:
+            maximo = maximo.right
+        return minimo.data, maximo.data
+
+    def total(self, node) -> Optional[int]:
+        return None
+
+    def altura(self, node) -> Optional[int]:
+        return None
+
+    def rotulo(self, node) -> str:
+        if node.count > 1:
+            return f"{node.data}\n({node.count})"
+        return str(node.data)
+
+    def atributos(self, node) -> Dict[str, str]:
+        cor = 'red' if node.color == '🔴' else 'black'
+        return {'shape': 'circle', 'fillcolor': cor, 'fontcolor': 'white'}
+
+
+class _Adaptador234:
+    def __init__(self, tree) -> None:
+        self.raiz = tree.root if tree.root.keys else None
+
+    def filhos(self, node) -> List[Any]:
+        return [] if node.leaf else node.children
+
+    def chaves(self, node) -> List[Any]:
+        return node.keys
+
+    def contagem(self, node) -> int:
+        return len(node.keys)
+
+    def faixa(self, node) -> Tuple[Any, Any]:
+        minimo = maximo = node
+        while not minimo.leaf:
+            minimo = minimo.children[0]
+        while not maximo.leaf:
+            maximo = maximo.children[-1]
+        return minimo.keys[0], maximo.keys[-1]
+
+    def total(self, node) -> Optional[int]:
+        return None
+
+    def altura(self, node) -> Optional[int]:
+        # todas as folhas estão no mesmo nível
+        altura = 1
+        while not node.leaf:
+            node = node.children[0]
+            altura += 1
+        return altura
+
+    def rotulo(self, node) -> str:
+        return " | ".join(map(str, node.keys))
+
+    def atributos(self, node) -> Dict[str, str]:
+        return {'shape': 'box', 'fillcolor': 'lightblue', 'fontcolor': 'black'}
+
+
+class _AdaptadorKD:
+    def __init__(self, tree) -> None:
+        self.raiz = tree.root
+
+    def filhos(self, node) -> List[Any]:
+        return [f for f in (node.left, node.right) if f is not None]
+
+    def chaves(self, node) -> List[Any]:
+        return [node.point]
+
+    def contagem(self, node) -> int:
+        return 0 if node.deleted else 1
+
+    def faixa(self, node) -> Tuple[Any, Any]:
+        # caixa mantida no nó (inclui lápides ainda não compactadas)
+        return list(node.low), list(node.high)
+
+    def total(self, node) -> Optional[int]:
+        return node.count
+
+    def altura(self, node) -> Optional[int]:
+        return None
+
+    def rotulo(self, node) -> str:
+        return "\n".join(f"{c:.0f}" for c in node.point)
+
+    def atributos(self, node) -> Dict[str, str]:
+        return {'shape': 'circle', 'fillcolor': '#4ECDC4', 'fontcolor': 'black'}
+
+
+def _adaptador(tree):
+    if hasattr(tree, 'NIL'):
+        return _AdaptadorRB(tree)
+    if hasattr(tree, 't') and hasattr(tree.root, 'keys'):
+        return _Adaptador234(tree)
+    if hasattr(tree, 'k'):
+        return _AdaptadorKD(tree)
+    raise TypeError(f"Árvore não suportada: {type(tree).__name__}")
+
+
+def _escapar(texto: str) -> str:
+    return texto.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _linha_no(node_id: str, rotulo: str, atributos: Dict[str, str]) -> str:
+    attrs = ''.join(f' {k}="{_escapar(v)}"' for k, v in atributos.items())
+    return f'  {node_id} [label="{_escapar(rotulo)}"{attrs}];\n'
+
+
+def _resumir(adaptador, node, limite: Optional[int]) -> Dict[str, Any]:
+    """Resume a subárvore de node.
+
+    O intervalo (e a contagem/altura, quando a árvore as guarda) vem do
+    adaptador sem percorrer a subárvore; o restante é contado num percurso
+    iterativo de no máximo `limite` nós (None = sem limite).
+    """
+    minimo, maximo = adaptador.faixa(node)
+    total = adaptador.total(node)
+    altura_guardada = adaptador.altura(node)
+    chaves = 0
+    altura = 0
+    visitados = 0
+    completo = True
+    stack = [(node, 1)]
+    if total is not None and altura_guardada is not None:
+        stack = []
+    while stack:
+        if limite is not None and visitados >= limite:
+            completo = False
+            break
+        atual, nivel = stack.pop()
+        visitados += 1
+        chaves += adaptador.contagem(atual)
+        if nivel > altura:
+            altura = nivel
+        for filho in adaptador.filhos(atual):
+            stack.append((filho, nivel + 1))
+    return {'chaves': chaves if total is None else total,
+            'altura': altura if altura_guardada is None else altura_guardada,
+            'min': minimo, 'max': maximo,
+            'chaves_exatas': completo or total is not None,
+            'altura_exata': completo or altura_guardada is not None}
+
+
+def _rotulo_resumo(resumo: Dict[str, Any]) -> str:
+    prefixo_chaves = '' if resumo['chaves_exatas'] else '≥'
+    prefixo_altura = '' if resumo['altura_exata'] else '≥'
+    if isinstance(resumo['min'], list):
+        faixa = " × ".join(f"[{a:.0f}, {b:.0f}]" for a, b in zip(resumo['min'], resumo['max']))
+    else:
+        faixa = f"[{resumo['min']}, {resumo['max']}]"
+    return (f"{faixa}\n{prefixo_chaves}{resumo['chaves']} chaves\n"
+            f"altura {prefixo_altura}{resumo['altura']}")
+
+
+def escrever_dot(tree, saida: str, formato: Optional[str] = None,
+                 max_profundidade: Optional[int] = None,
+                 max_nos: Optional[int] = None, amostra: float = 1.0,
+                 limite_resumo: Optional[int] = LIMITE_RESUMO,
+                 semente: int = 0) -> Dict[str, int]:
+    """Escreve a árvore em DOT (ou SVG/PNG via `dot`) de forma incremental.
+
+    formato: 'dot', 'svg' ou 'png' (padrão: deduzido da extensão de saida).
+    Retorna a quantidade de nós expandidos e de nós-resumo emitidos.
+    """
+    if formato is None:
+        formato = saida.rsplit('.', 1)[-1].lower() if '.' in saida else 'dot'
+
+    processo = None
+    if formato == 'dot':
+        destino = open(saida, 'w', encoding='utf-8', buffering=1 << 20)
+    else:
+        processo = subprocess.Popen(['dot', f'-T{formato}', '-o', saida],
+                                    stdin=subprocess.PIPE, text=True,
+                                    encoding='utf-8')
+        destino = processo.stdin
+
+    adaptador = _adaptador(tree)
+    rng = random.Random(semente)
+    expandidos = resumos = 0
+    contador = 0
+
+    try:
+        destino.write('digraph {\n  rankdir=TB;\n'
+                      '  node [style=filled fontsize=10 fontname="Arial"];\n')
+
+        if adaptador.raiz is None:
+            destino.write('  empty [label="Árvore Vazia" shape=plaintext];\n')
+        else:
+            # fila: (nó, profundidade, id do nó no DOT)
+            fila = deque([(adaptador.raiz, 0, 'n0')])
+            while fila:
+                node, profundidade, node_id = fila.popleft()
+                colapsar = ((max_profundidade is not None and profundidade > max_profundidade)
+                            or (max_nos is not None and expandidos >= max_nos))
+                if colapsar:
+                    resumo = _resumir(adaptador, node, limite_resumo)
+                    destino.write(_linha_no(node_id, _rotulo_resumo(resumo),
+                                            {'shape': 'folder', 'fillcolor': 'lightgray',
+                                             'fontcolor': 'black'}))
+                    resumos += 1
+                    continue
+
+                destino.write(_linha_no(node_id, adaptador.rotulo(node),
+                                        adaptador.atributos(node)))
+                expandidos += 1
+
+                filhos = adaptador.filhos(node)
+                if amostra < 1.0 and filhos:
+                    escolhidos = {i for i in range(len(filhos)) if rng.random() < amostra}
+                else:
+                    escolhidos = None
+
+                for i, filho in enumerate(filhos):
+                    contador += 1
+                    filho_id = f"n{contador}"
+                    destino.write(f'  {node_id} -> {filho_id};\n')
+                    if escolhidos is not None and i not in escolhidos:
+                        resumo = _resumir(adaptador, filho, limite_resumo)
+                        destino.write(_linha_no(filho_id, _rotulo_resumo(resumo),
+                                                {'shape': 'folder', 'fillcolor': 'lightgray',
+                                                 'fontcolor': 'black'}))
+                        resumos += 1
+                    else:
+                        fila.append((filho, profundidade + 1, filho_id))
+
+        destino.write('}\n')
+    finally:
+        destino.close()
+        if processo is not None and processo.wait() != 0:
+            raise RuntimeError(f"Falha ao executar o Graphviz (código {processo.returncode})")
+
+    return {'expandidos': expandidos, 'resumos': resumos}
@@ -0,0 +1,188 @@
+"""
+Renderização assíncrona das visualizações das sessões interativas.
+
+As sessões copiam só a estrutura da árvore (tree.dot_snapshot()) e
+entregam ao BackgroundRenderer uma função que gera o código DOT a partir da
+cópia. Montar o Digraph e chamar o graphviz acontecem nas threads de fundo,
+então a operação na árvore retorna imediatamente, por mais lento que seja
+o executável `dot`.
+
+- submit() retorna uma Renderizacao (Future): result() aguarda o arquivo
+- Fila limitada (max_pendentes): se encher, o pedido mais antigo é
+  descartado e sua Renderizacao é cancelada
+- Coalescência: um novo pedido para o mesmo arquivo substitui o pendente;
+  a Renderizacao antiga termina junto com a nova
+- Um arquivo é renderizado por no máximo uma thread de cada vez: o pedido
+  feito durante a renderização espera na fila e só roda depois dela, então
+  uma versão antiga nunca sobrescreve a nova
+- descartar(): cancela o pedido pendente de um arquivo e faz a
+  renderização em andamento apagar o que gerar, sem esperar por ela
+- flush(): aguarda todas as renderizações pendentes (usar ao fim da sessão)
+
+Exemplo de uso:
+    renderer = BackgroundRenderer()
+    pedido = renderer.submit(tree.dot_snapshot(), 'files/estado')
+    pedido.caminho          # 'files/estado.png' (ainda pode não existir)
+    pedido.result()         # aguarda o arquivo ser gerado
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
+from typing import Callable, List, Optional, Set, Tuple, Union
+
+# código DOT pronto ou função que o gera (chamada na thread de fundo)
+Fonte = Union[str, Callable[[], str]]
+
+
+class Renderizacao(Future):
+    """Future de uma renderização; o resultado é o caminho do arquivo gerado."""
+
+    def __init__(self, caminho: str) -> None:
+        super().__init__()
+        # caminho final do arquivo (com extensão), conhecido desde o submit
+        self.caminho = caminho
+
+
+class BackgroundRenderer:
+    """Pool de threads que renderiza código DOT em PNG em segundo plano."""
+
+    def __init__(self, workers: int = 2, max_pendentes: int = 64,
+                 formato: str = 'png') -> None:
+        self.formato = formato
+        self.max_pendentes = max_pendentes
+        self.renderizados = 0
+        self.coalescidos = 0
+        self.descartados = 0
+        self.erros: List[str] = []
+
+        # caminho de saída -> (fonte ainda não renderizada, Renderizacoes à espera)
+        self._pendentes: "OrderedDict[str, Tuple[Fonte, List[Renderizacao]]]" = OrderedDict()
+        self._em_andamento = 0
+        # arquivos sendo renderizados agora e, entre eles, os descartados
+        self._renderizando: Set[str] = set()
+        self._descartados_em_andamento: Set[str] = set()
+        self._fechado = False
+        self._cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._trabalhar, name=f"render-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, source: Fonte, output_path: str) -> Renderizacao:
+        """Agenda a renderização e retorna a Renderizacao correspondente.
+
+        source é o código DOT ou uma função sem argumentos que o gera (como
+        a retornada por tree.dot_snapshot()), chamada na thread de fundo.
+        output_path é o caminho sem extensão (como em graphviz.render).
+        Nunca bloqueia esperando o graphviz.
+        """
+        pedido = Renderizacao(f"{output_path}.{self.formato}")
+        descartados: List[Renderizacao] = []
+        with self._cond:
+            if self._fechado:
+                raise RuntimeError("BackgroundRenderer já foi encerrado")
+            esperando = [pedido]
+            if output_path in self._pendentes:
+                self.coalescidos += 1
+                _, anteriores = self._pendentes.pop(output_path)
+                esperando = anteriores + esperando
+            elif len(self._pendentes) >= self.max_pendentes:
+                _, (_, descartados) = self._pendentes.popitem(last=False)
+                self.descartados += 1
+            self._pendentes[output_path] = (source, esperando)
+            self._cond.notify()
+        for antigo in descartados:
+            antigo.cancel()
+        return pedido
+
+    def descartar(self, output_path: str) -> None:
+        """Cancela a renderização pendente de output_path (sem extensão).
+
+        Se o arquivo estiver sendo renderizado, a thread apaga o resultado
+        ao terminar e as Renderizacoes dela terminam canceladas. Não bloqueia.
+        """
+        with self._cond:
+            _, descartados = self._pendentes.pop(output_path, (None, []))
+            if output_path in self._renderizando:
+                self._descartados_em_andamento.add(output_path)
+        for antigo in descartados:
+            antigo.cancel()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda a fila esvaziar. Retorna False se o timeout expirar."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pendentes and self._em_andamento == 0, timeout)
+
+    def close(self) -> None:
+        """Renderiza o que estiver pendente e encerra as threads."""
+        self.flush()
+        with self._cond:
+            self._fechado = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _proximo(self) -> Optional[str]:
+        """Pedido pendente mais antigo cujo arquivo não está sendo renderizado."""
+        for output_path in self._pendentes:
+            if output_path not in self._renderizando:
+                return output_path
+        return None
+
+    def _trabalhar(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._proximo() is not None
+                                    or (self._fechado and not self._pendentes))
+                output_path = self._proximo()
+                if output_path is None:
+                    return
+                source, esperando = self._pendentes.pop(output_path)
+                self._renderizando.add(output_path)
+                self._em_andamento += 1
+
+            # pedidos cancelados por quem os fez não esperam mais o arquivo
+            esperando = [p for p in esperando if p.set_running_or_notify_cancel()]
+            try:
+                if esperando:
+                    if callable(source):
+                        source = source()
+                    self._render(source, output_path)
+                    with self._cond:
+                        self.renderizados += 1
+                        descartado = output_path in self._descartados_em_andamento
+                    if descartado:
+                        self._apagar(output_path)
+                        for pedido in esperando:
+                            pedido.set_exception(CancelledError())
+                    else:
+                        for pedido in esperando:
+                            pedido.set_result(pedido.caminho)
+            except Exception as e:
+                with self._cond:
+                    self.erros.append(f"{output_path}: {e}")
+                for pedido in esperando:
+                    pedido.set_exception(e)
+            finally:
+                with self._cond:
+                    self._renderizando.discard(output_path)
+                    self._descartados_em_andamento.discard(output_path)
+                    self._em_andamento -= 1
+                    self._cond.notify_all()
+
+    def _apagar(self, output_path: str) -> None:
+        try:
+            os.remove(f"{output_path}.{self.formato}")
+        except FileNotFoundError:
+            pass
+
+    def _render(self, source: str, output_path: str) -> None:
+        from graphviz import Source
+        Source(source).render(output_path, format=self.formato, cleanup=True)
@@ -0,0 +1,241 @@
+"""
+Modo batch/replay para as árvores, sem menus, visualização ou log.
+
+Lê um fluxo de operações de um arquivo (ou stdin, com '-') e aplica tudo
+na árvore escolhida na velocidade máxima, reportando vazão e estatísticas
+finais. Serve para reproduzir traces capturados em produção.
+
+Formato texto (uma operação por linha, '#' inicia comentário):
+    insert 10          (ou: i 10)
+    delete 10          (ou: d 10)
+    search 10          (ou: s 10)
+    insert 1.5 2.0     (k-D tree: k coordenadas)
+
+Formato binário compacto (little-endian):
+    cabeçalho: b'TRC1' + uint8 dim  (dim=0: chaves inteiras int64)
+    registros: uint8 opcode (0=insert, 1=delete, 2=search)
+               + int64 (dim=0) ou dim * float64
+
+Exemplo de uso:
+    python -m tools.replay --arvore rb trace.txt
+    python -m tools.replay --arvore kd trace.bin --stats
+    cat trace.txt | python -m tools.replay --arvore 234 -
+    python -m tools.replay --arvore 234 trace.txt --converter trace.bin
+    python -m tools.replay --arvore rb trace.bin --dot final.svg --max-profundidade 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import struct
+import sys
+from time import perf_counter
+from typing import Iterator, List, Tuple, Any
+
+MAGIC = b'TRC1'
+OPERACOES = ('insert', 'delete', 'search')
+_ALIASES = {'i': 'insert', 'd': 'delete', 's': 'search',
+            'insert': 'insert', 'delete': 'delete', 'search': 'search'}
+
+Operacao = Tuple[str, Any]
+
+
+def ler_texto(linhas, dim: int) -> Iterator[Operacao]:
+    """Converte linhas do formato texto em tuplas (operacao, chave)."""
+    for num, linha in enumerate(linhas, 1):
+        linha = linha.split('#', 1)[0].strip()
+        if not linha:
+            continue
+        partes = linha.split()
+        try:
+            operacao = _ALIASES[partes[0].lower()]
+        except KeyError:
+            raise ValueError(f"Linha {num}: operação desconhecida '{partes[0]}'")
+        valores = partes[1:]
+        if dim == 0:
+            if len(valores) != 1:
+                raise ValueError(f"Linha {num}: esperado 1 valor, recebido {len(valores)}")
+            yield operacao, int(valores[0])
+        else:
+            if len(valores) != dim:
+                raise ValueError(f"Linha {num}: esperadas {dim} coordenadas, recebidas {len(valores)}")
+            yield operacao, [float(c) for c in valores]
+
+
+def ler_binario(dados: bytes) -> Tuple[int, List[Operacao]]:
+    """Decodifica um trace binário inteiro. Retorna (dim, operações)."""
+    if dados[:4] != MAGIC:
+        raise ValueError("Trace binário inválido (cabeçalho ausente)")
+    dim = dados[4]
+    corpo = memoryview(dados)[5:]
+    if dim == 0:
+        registro = struct.Struct('<Bq')
+        ops = [(OPERACOES[op], chave) for op, chave in registro.iter_unpack(corpo)]
+    else:
+        registro = struct.Struct(f'<B{dim}d')
+        ops = [(OPERACOES[r[0]], list(r[1:])) for r in registro.iter_unpack(corpo)]
+    return dim, ops
+
+
+def escrever_binario(ops, dim: int, fp) -> int:
+    """Grava as operações no formato binário. Retorna o número de registros."""
+    codigo = {nome: i for i, nome in enumerate(OPERACOES)}
+    registro = struct.Struct('<Bq' if dim == 0 else f'<B{dim}d')
+    buffer = bytearray(MAGIC)
+    buffer.append(dim)
+    total = 0
+    for operacao, chave in ops:
+        if dim == 0:
+            buffer += registro.pack(codigo[operacao], chave)
+        else:
+            buffer += registro.pack(codigo[operacao], *chave)
+        total += 1
+    fp.write(buffer)
+    return total
+
+
+def criar_arvore(nome: str, dim: int):
+    """Instancia a árvore escolhida (importando apenas o módulo necessário)."""
+    if nome == 'rb':
+        from red_black_tree.red_black_tree import RedBlackTree
+        return RedBlackTree()
+    if nome == '234':
+        return importlib.import_module('2-3-4').BTree234()
+    if nome == 'kd':
+        from k_d_tree import KDTree
+        return KDTree(k=dim)
+    raise ValueError(f"Árvore desconhecida: {nome}")
+
+
+def _achou(nome: str, resultado) -> bool:
+    # search devolve None (rb/kd) ou (None, None) (234) quando não encontra
+    if nome == '234':
+        return resultado[0] is not None
+    return resultado is not None
+
+
+def aplicar(tree, nome: str, ops) -> dict:
+    """Aplica as operações na árvore e retorna contagens e tempo gasto."""
+    contagem = dict.fromkeys(OPERACOES, 0)
+    encontrados = 0
+    insert, delete, search = tree.insert, tree.delete, tree.search
+
+    inicio = perf_counter()
+    for operacao, chave in ops:
+        contagem[operacao] += 1
+        if operacao == 'insert':
+            insert(chave)
+        elif operacao == 'delete':
+            delete(chave)
+        elif _achou(nome, search(chave)):
+            encontrados += 1
+    duracao = perf_counter() - inicio
+
+    total = sum(contagem.values())
+    return {
+        'operacoes': total,
+        'por_tipo': contagem,
+        'buscas_encontradas': encontrados,
+        'segundos': duracao,
+        'ops_por_segundo': total / duracao if duracao > 0 else float('inf'),
+    }
+
+
+def info_final(tree, nome: str) -> dict:
+    """Estatísticas da árvore ao fim do replay.
+
+    RB e 2-3-4 mantêm os contadores incrementalmente; a k-D tree só guarda
+    o tamanho, então sua altura é obtida com um único percurso.
+    """
+    if nome == 'kd':
+        altura = 0
+        stack = [(tree.root, 1)] if tree.root else []
+        while stack:
+            node, nivel = stack.pop()
+            altura = max(altura, nivel)
+            for filho in (node.left, node.right):
+                if filho:
+                    stack.append((filho, nivel + 1))
+        return {'pontos': tree.size, 'altura': altura}
+
+    if nome == 'rb':
+        return {'nos': tree.size, 'valores': tree.total,
+                'altura_preta': tree.black_height}
+    return {'nos': tree.node_count, 'chaves': tree.size, 'altura': tree.height}
+
+
+def _carregar(caminho: str, dim: int) -> Tuple[int, List[Operacao]]:
+    if caminho == '-':
+        dados = sys.stdin.buffer.read()
+    else:
+        with open(caminho, 'rb') as f:
+            dados = f.read()
+    if dados[:4] == MAGIC:
+        return ler_binario(dados)
+    texto = dados.decode('utf-8').splitlines()
+    return dim, list(ler_texto(texto, dim))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay de traces de operações nas árvores")
+    parser.add_argument('trace', help="arquivo de trace (texto ou binário) ou '-' para stdin")
+    parser.add_argument('--arvore', choices=('rb', '234', 'kd'), required=True)
+    parser.add_argument('-k', type=int, default=2, help="dimensões da k-D tree (trace texto)")
+    parser.add_argument('--stats', action='store_true',
+                        help="liga os contadores estruturais da árvore (custo extra)")
+    parser.add_argument('--converter', metavar='SAIDA',
+                        help="apenas converte o trace para o formato binário")
+    parser.add_argument('--dot', metavar='SAIDA',
+                        help="grava a árvore final (.dot, .svg ou .png) com nível de detalhe")
+    parser.add_argument('--max-profundidade', type=int, default=8,
+                        help="profundidade máxima expandida em --dot")
+    parser.add_argument('--max-nos', type=int, default=2000,
+                        help="máximo de nós expandidos em --dot")
+    parser.add_argument('--amostra', type=float, default=1.0,
+                        help="fração dos filhos expandidos em cada nó em --dot")
+    parser.add_argument('--limite-resumo', type=int, default=1000,
+                        help="máximo de nós percorridos por nó-resumo em --dot "
+                             "(padrão: 1000; 0 = exato, percorre a subárvore inteira)")
+    args = parser.parse_args(argv)
+
+    dim = args.k if args.arvore == 'kd' else 0
+    dim, ops = _carregar(args.trace, dim)
+    if (args.arvore == 'kd') != (dim > 0):
+        parser.error("trace incompatível com a árvore escolhida")
+
+    if args.converter:
+        with open(args.converter, 'wb') as f:
+            total = escrever_binario(ops, dim, f)
+        print(f"{total} operações gravadas em {args.converter}")
+        return 0
+
+    tree = criar_arvore(args.arvore, dim)
+    if args.stats:
+        tree.enable_stats()
+
+    resultado = aplicar(tree, args.arvore, ops)
+
+    print(f"Operações: {resultado['operacoes']} "
+          f"(insert={resultado['por_tipo']['insert']}, "
+          f"delete={resultado['por_tipo']['delete']}, "
+          f"search={resultado['por_tipo']['search']})")
+    print(f"Buscas encontradas: {resultado['buscas_encontradas']}")
+    print(f"Tempo: {resultado['segundos']:.3f}s")
+    print(f"Vazão: {resultado['ops_por_segundo']:,.0f} ops/s")
+    print(f"Árvore final: {info_final(tree, args.arvore)}")
+    if args.stats:
+        print(f"Contadores: {tree.stats()}")
+    if args.dot:
+        from tools.dot_stream import escrever_dot
+        inicio = perf_counter()
+        resumo = escrever_dot(tree, args.dot, max_profundidade=args.max_profundidade,
+                              max_nos=args.max_nos, amostra=args.amostra,
+                              limite_resumo=args.limite_resumo or None)
+        print(f"Visualização gravada em {args.dot} ({resumo['expandidos']} nós, "
+              f"{resumo['resumos']} resumos, {perf_counter() - inicio:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
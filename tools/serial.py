@@ -0,0 +1,104 @@
+"""
+Vetores do formato de dump/load compartilhado pelas árvores.
+
+Cada árvore grava seu cabeçalho e seus vetores de estrutura (bytes por
+nó); as listas de chaves, coordenadas e cargas passam por gravar_valores,
+que escolhe a representação mais compacta:
+    tag (1 byte) + uint64 n + uint64 tamanho + dados
+    n: todos None (sem dados)
+    q: int64 crus (array('q'))
+    d: float64 crus (array('d'))
+    p: pickle da lista (qualquer outro caso, inclusive ints grandes)
+
+Este módulo só é importado dentro de dump/load, então array, pickle,
+struct e gc não pesam no import das árvores.
+
+Exemplo de uso:
+    from tools.serial import gravar_valores, ler_valores
+    gravar_valores(fp, [1, 2, 3])
+    ler_valores(fp)
+"""
+
+from __future__ import annotations
+
+import gc
+import struct
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+# tag + quantidade de valores + tamanho dos dados
+_PREFIXO = struct.Struct('<cQQ')
+
+
+def gravar_valores(fp, valores: list) -> None:
+    """Grava uma lista: inteiros/floats como bytes de array, o resto via pickle."""
+    if all(v is None for v in valores):
+        tag, dados = b'n', b''
+    elif all(type(v) is int for v in valores):
+        try:
+            tag, dados = b'q', array('q', valores).tobytes()
+        except OverflowError:
+            tag, dados = b'p', None
+    elif all(type(v) is float for v in valores):
+        tag, dados = b'd', array('d', valores).tobytes()
+    else:
+        tag, dados = b'p', None
+    if dados is None:
+        import pickle
+        dados = pickle.dumps(valores, protocol=pickle.HIGHEST_PROTOCOL)
+    fp.write(_PREFIXO.pack(tag, len(valores), len(dados)))
+    fp.write(dados)
+
+
+def ler_valores(fp) -> list:
+    """Lê uma lista gravada por gravar_valores."""
+    tag, n, tamanho = _PREFIXO.unpack(fp.read(_PREFIXO.size))
+    if tag == b'n':
+        return [None] * n
+    dados = fp.read(tamanho)
+    if tag == b'p':
+        import pickle
+        return pickle.loads(dados)
+    if tag not in (b'q', b'd'):
+        raise ValueError(f"Vetor com tag desconhecida: {tag!r}")
+    valores = array(tag.decode())
+    valores.frombytes(dados)
+    return valores.tolist()
+
+
+def gravar_cabecalho(fp, magic: bytes, formato: str, *campos) -> None:
+    """Grava magic seguido dos campos empacotados em formato (struct)."""
+    fp.write(magic)
+    fp.write(struct.pack(formato, *campos))
+
+
+def ler_cabecalho(fp, magic: bytes, formato: str, nome: str) -> tuple:
+    """Confere magic e lê os campos do cabeçalho (ValueError se não for um nome)."""
+    if fp.read(len(magic)) != magic:
+        raise ValueError(f"Arquivo não contém uma {nome}")
+    return struct.unpack(formato, fp.read(struct.calcsize(formato)))
+
+
+def ler_inteiros(fp, n: int) -> array:
+    """Lê n int64 crus (vetor auxiliar gravado com array('q').tobytes())."""
+    valores = array('q')
+    valores.frombytes(fp.read(8 * n))
+    return valores
+
+
+def gravar_inteiros(fp, valores: list) -> None:
+    """Grava inteiros como int64 crus, sem prefixo (o leitor sabe quantos são)."""
+    fp.write(array('q', valores).tobytes())
+
+
+@contextmanager
+def coletor_pausado() -> Iterator[None]:
+    """Desliga o coletor cíclico durante a criação de milhões de nós."""
+    ligado = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ligado:
+            gc.enable()
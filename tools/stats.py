@@ -0,0 +1,68 @@
+"""
+Instrumentação opcional compartilhada pelas árvores (contadores e tempos).
+
+StatsMixin fornece enable_stats/disable_stats/stats. A árvore declara
+STATS_KEYS e, nos pontos contados, incrementa self._stats[...] só quando
+self._stats is not None; desligada, a instrumentação custa esse teste.
+
+Exemplo de uso:
+    class Arvore(StatsMixin):
+        STATS_KEYS = ('comparisons',)
+
+    tree.enable_stats(on_timing=lambda op, s: print(op, s))
+    tree.stats()
+"""
+
+from __future__ import annotations
+
+# sem typing: os núcleos das árvores importam este módulo, e só typing
+# custa ~9 ms (ver a guarda de benchmarks/import_time.py)
+from collections.abc import Callable
+from time import perf_counter
+
+
+def _cronometrar(metodo, operacao: str, on_timing):
+    """Envolve uma operação pública para reportar sua duração a on_timing."""
+    def medido(*args, **kwargs):
+        inicio = perf_counter()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            on_timing(operacao, perf_counter() - inicio)
+    return medido
+
+
+class StatsMixin:
+    """Contadores estruturais opcionais e callbacks de tempo por operação."""
+
+    # contadores expostos por stats() quando a instrumentação está ativa
+    STATS_KEYS: tuple[str, ...] = ()
+    # operações envolvidas pelo callback de tempo
+    TIMED_OPERATIONS: tuple[str, ...] = ('insert', 'delete', 'search')
+    # None = instrumentação desligada
+    _stats: dict | None = None
+
+    def enable_stats(self, on_timing: Callable[[str, float], None] | None = None) -> None:
+        """Liga os contadores (zerados).
+
+        Se on_timing for informado, on_timing(operacao, segundos) é chamado
+        após cada operação de TIMED_OPERATIONS desta instância.
+        """
+        self._stats = dict.fromkeys(self.STATS_KEYS, 0)
+        for operacao in self.TIMED_OPERATIONS:
+            self.__dict__.pop(operacao, None)
+            if on_timing is not None:
+                metodo = getattr(self, operacao)
+                setattr(self, operacao, _cronometrar(metodo, operacao, on_timing))
+
+    def disable_stats(self) -> None:
+        """Desliga os contadores e remove os callbacks de tempo."""
+        self._stats = None
+        for operacao in self.TIMED_OPERATIONS:
+            self.__dict__.pop(operacao, None)
+
+    def stats(self) -> dict:
+        """Retorna uma cópia dos contadores (vazia se desligados)."""
+        if self._stats is None:
+            return {}
+        return dict(self._stats)
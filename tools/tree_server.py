@@ -0,0 +1,381 @@
+"""
+Servidor local (asyncio) que hospeda árvores nomeadas para vários processos.
+
+Em vez de cada processo manter sua própria cópia de uma RedBlackTree,
+BTree234 ou KDTree, todos falam com um único servidor por socket Unix ou
+TCP em localhost.
+
+Protocolo: uma requisição JSON por linha e uma resposta por requisição,
+na mesma ordem em que chegaram pela conexão:
+    {"id": 1, "arvore": "idx", "op": "insert", "args": [10]}
+    {"id": 1, "ok": true, "resultado": true}
+    {"id": 2, "ok": false, "erro": "Árvore desconhecida: foo"}
+
+Operações (args):
+- create (tipo 'rb' | '234' | 'kd', k)  -> cria a árvore com esse nome
+- insert (chave) ou, na kd, (ponto, carga)  -> True se a chave é nova
+- delete (chave) -> bool;  search (chave) -> chave ou None
+- range (lo, hi) -> chaves em [lo, hi] em ordem (kd: pontos na caixa)
+- knn (ponto, n) -> [[distância, ponto], ...] (só kd);  size () -> int
+
+Pipelining e lotes: o cliente pode enviar várias requisições sem esperar
+as respostas. As requisições de todas as conexões entram numa fila única,
+drenada uma vez por volta do event loop; inserções consecutivas na mesma
+árvore viram uma chamada em lote (na KDTree, insert_many) e as respostas
+de cada conexão saem numa única escrita.
+
+Exemplo de uso:
+    python -m tools.tree_server --socket /tmp/arvores.sock
+    python -m tools.tree_server --porta 7070
+
+    cliente = await TreeClient.connect(path='/tmp/arvores.sock')
+    await cliente.create('idx', 'rb')
+    await asyncio.gather(*(cliente.insert('idx', x) for x in range(1000)))
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# bytes de respostas pendentes numa conexão antes de parar de ler dela
+LIMITE_SAIDA = 1 << 20
+# op das linhas que não são JSON válido (nenhuma string do cliente é igual)
+_INVALIDA = object()
+
+
+def _intervalo_rb(tree, lo, hi) -> List[Any]:
+    """Chaves da RedBlackTree em [lo, hi], em ordem (sem recursão)."""
+    nil = tree.NIL
+    resultado = []
+    stack = []
+    node = tree.root
+    while stack or node != nil:
+        while node != nil:
+            stack.append(node)
+            # subárvore esquerda só tem chaves menores que node.data
+            node = node.left if lo < node.data else nil
+        node = stack.pop()
+        if node.data > hi:
+            break
+        if node.data >= lo:
+            resultado.append(node.data)
+        node = node.right
+    return resultado
+
+
+def _intervalo_234(tree, lo, hi) -> List[Any]:
+    resultado = []
+    for chave in tree.iter_from(lo):
+        if chave > hi:
+            break
+        resultado.append(chave)
+    return resultado
+
+
+def _criar(tipo: str, k: int = 2):
+    from tools.replay import criar_arvore
+    return criar_arvore(tipo, k)
+
+
+def _executar(tipo: str, tree, op: str, args: List[Any]) -> Any:
+    """Aplica uma operação (que não seja insert) e devolve o resultado em JSON."""
+    if op == 'size':
+        return tree.size
+    if op == 'delete':
+        return bool(tree.delete(*args))
+    if op == 'search':
+        if tipo == 'rb':
+            node = tree.search(*args)
+            return None if node is None else node.data
+        if tipo == '234':
+            node, i = tree.search(*args)
+            return None if node is None else node.keys[i]
+        return tree.search(*args)
+    if op == 'range':
+        if tipo == 'rb':
+            return _intervalo_rb(tree, *args)
+        if tipo == '234':
+            return _intervalo_234(tree, *args)
+        return tree.range_search(*args)
+    if op == 'knn' and tipo == 'kd':
+        return [[d, p] for d, p in tree.nearest(*args)]
+    raise ValueError(f"Operação não suportada em {tipo}: {op}")
+
+
+def _inserir(tipo: str, tree, args: List[Any]) -> bool:
+    if tipo == 'rb':
+        # RedBlackTree.insert não diz se a chave é nova (repetições contam)
+        antes = tree.size
+        tree.insert(*args)
+        return tree.size > antes
+    return tree.insert(*args)
+
+
+def _ponto_invalido(k: int, args: List[Any]) -> Optional[str]:
+    """Erro de uma inserção kd malformada, ou None se args = (ponto[, carga])."""
+    if not 1 <= len(args) <= 2:
+        return f"TypeError: insert espera (ponto, carga), recebeu {len(args)} argumento(s)"
+    ponto = args[0]
+    if (not isinstance(ponto, list) or len(ponto) != k
+            or not all(type(c) in (int, float) for c in ponto)):
+        return f"ValueError: Ponto {ponto!r} deve ter {k} coordenadas numéricas"
+    return None
+
+
+def _erro(erro: Exception) -> str:
+    mensagem = erro.args[0] if isinstance(erro, KeyError) and erro.args else str(erro)
+    return f"{type(erro).__name__}: {mensagem}"
+
+
+class _Conexao:
+    """Respostas pendentes de um cliente, escritas de uma vez por volta do loop."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.saida: List[bytes] = []
+
+    def responder(self, resposta: Dict[str, Any]) -> None:
+        self.saida.append(json.dumps(resposta).encode() + b'\n')
+
+    def enviar(self) -> None:
+        if self.saida and not self.writer.is_closing():
+            self.writer.write(b''.join(self.saida))
+        self.saida.clear()
+
+
+class TreeServer:
+    """Hospeda árvores nomeadas e atende requisições em lotes por volta do loop.
+
+    Atributos:
+      - arvores: nome -> (tipo, árvore)
+      - lotes / operacoes: drenagens da fila e requisições atendidas
+    """
+
+    def __init__(self) -> None:
+        self.arvores: Dict[str, Tuple[str, Any]] = {}
+        self.lotes = 0
+        self.operacoes = 0
+        # (conexão, id, árvore, op, args) na ordem de chegada
+        self._fila: List[Tuple[_Conexao, Any, str, str, List[Any]]] = []
+        self._agendado = False
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        if path is not None:
+            return await asyncio.start_unix_server(self._atender, path=path)
+        return await asyncio.start_server(self._atender, host, port)
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conexao = _Conexao(writer)
+        try:
+            while True:
+                # com requisições já no buffer, readline retorna sem ceder o
+                # loop: tudo o que chegou entra na mesma drenagem
+                linha = await reader.readline()
+                if not linha:
+                    break
+                try:
+                    req = json.loads(linha)
+                    self._fila.append((conexao, req.get('id'), req.get('arvore'),
+                                       req.get('op'), req.get('args') or []))
+                except (ValueError, AttributeError):
+                    # o erro também passa pela fila: sai depois das respostas
+                    # das requisições anteriores desta conexão
+                    self._fila.append((conexao, None, None, _INVALIDA, []))
+                if not self._agendado:
+                    self._agendado = True
+                    asyncio.get_running_loop().call_soon(self._drenar)
+                if writer.transport.get_write_buffer_size() > LIMITE_SAIDA:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _drenar(self) -> None:
+        """Atende toda a fila, agrupando inserções consecutivas na mesma árvore."""
+        self._agendado = False
+        fila, self._fila = self._fila, []
+        self.lotes += 1
+        self.operacoes += len(fila)
+        conexoes = {}
+        i = 0
+        while i < len(fila):
+            _, _, nome, op, _ = fila[i]
+            j = i + 1
+            if op == 'insert':
+                while j < len(fila) and fila[j][3] == 'insert' and fila[j][2] == nome:
+                    j += 1
+            lote = fila[i:j]
+            for (conexao, id_, _, _, _), (ok, valor) in zip(lote, self._aplicar(nome, op, lote)):
+                conexoes[id(conexao)] = conexao
+                if ok:
+                    conexao.responder({'id': id_, 'ok': True, 'resultado': valor})
+                else:
+                    conexao.responder({'id': id_, 'ok': False, 'erro': valor})
+            i = j
+        for conexao in conexoes.values():
+            conexao.enviar()
+
+    def _aplicar(self, nome: str, op: str, lote) -> List[Tuple[bool, Any]]:
+        """Executa um grupo de requisições; cada uma recebe (ok, resultado ou erro)."""
+        if op is _INVALIDA:
+            return [(False, "Requisição inválida")] * len(lote)
+        if op == 'create':
+            return [self._criar(nome, args) for *_, args in lote]
+        if nome not in self.arvores:
+            return [(False, f"Árvore desconhecida: {nome}")] * len(lote)
+        tipo, tree = self.arvores[nome]
+        if op == 'insert' and tipo == 'kd':
+            return self._inserir_kd(tree, lote)
+        resultados = []
+        for *_, args in lote:
+            try:
+                if op == 'insert':
+                    resultados.append((True, _inserir(tipo, tree, args)))
+                else:
+                    resultados.append((True, _executar(tipo, tree, op, args)))
+            except Exception as erro:  # o erro volta ao cliente; o servidor segue
+                resultados.append((False, _erro(erro)))
+        return resultados
+
+    def _inserir_kd(self, tree, lote) -> List[Tuple[bool, Any]]:
+        """Inserções na KDTree: as malformadas são recusadas uma a uma, antes
+        de tocar a árvore; as demais entram num único insert_many."""
+        from k_d_tree.k_d_tree import _SEM_VALOR
+        resultados: List[Optional[Tuple[bool, Any]]] = [None] * len(lote)
+        posicoes, pontos, valores = [], [], []
+        for i, (*_, args) in enumerate(lote):
+            erro = _ponto_invalido(tree.k, args)
+            if erro is not None:
+                resultados[i] = (False, erro)
+                continue
+            posicoes.append(i)
+            pontos.append(args[0])
+            # sem carga na requisição: um ponto já presente mantém a sua
+            valores.append(args[1] if len(args) > 1 else _SEM_VALOR)
+        if pontos:
+            for i, novo in zip(posicoes, tree.insert_many(pontos, valores)):
+                resultados[i] = (True, novo)
+        return resultados
+
+    def _criar(self, nome: str, args: List[Any]) -> Tuple[bool, Any]:
+        try:
+            self.arvores[nome] = (args[0], _criar(*args))
+            return True, True
+        except Exception as erro:
+            return False, _erro(erro)
+
+
+class TreeClient:
+    """Cliente assíncrono com pipelining: cada chamada envia a requisição
+    imediatamente e aguarda só a própria resposta."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pendentes: Dict[int, asyncio.Future] = {}
+        self._leitor = asyncio.get_running_loop().create_task(self._ler())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: Optional[int] = None,
+                      path: Optional[str] = None) -> "TreeClient":
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _ler(self) -> None:
+        try:
+            while True:
+                linha = await self._reader.readline()
+                if not linha:
+                    break
+                resposta = json.loads(linha)
+                futuro = self._pendentes.pop(resposta['id'], None)
+                if futuro is None or futuro.done():
+                    continue
+                if resposta['ok']:
+                    futuro.set_result(resposta['resultado'])
+                else:
+                    futuro.set_exception(RuntimeError(resposta['erro']))
+        finally:
+            for futuro in self._pendentes.values():
+                if not futuro.done():
+                    futuro.set_exception(ConnectionError("Conexão com o servidor encerrada"))
+            self._pendentes.clear()
+
+    def call(self, arvore: str, op: str, *args: Any) -> asyncio.Future:
+        """Envia a requisição e retorna o futuro da resposta."""
+        id_ = next(self._ids)
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendentes[id_] = futuro
+        self._writer.write(json.dumps({'id': id_, 'arvore': arvore, 'op': op,
+                                       'args': list(args)}).encode() + b'\n')
+        return futuro
+
+    def create(self, arvore: str, tipo: str, k: int = 2) -> asyncio.Future:
+        return self.call(arvore, 'create', tipo, k)
+
+    def insert(self, arvore: str, *args: Any) -> asyncio.Future:
+        return self.call(arvore, 'insert', *args)
+
+    def delete(self, arvore: str, chave: Any) -> asyncio.Future:
+        return self.call(arvore, 'delete', chave)
+
+    def search(self, arvore: str, chave: Any) -> asyncio.Future:
+        return self.call(arvore, 'search', chave)
+
+    def range(self, arvore: str, lo: Any, hi: Any) -> asyncio.Future:
+        return self.call(arvore, 'range', lo, hi)
+
+    def knn(self, arvore: str, ponto: List[float], n: int = 1) -> asyncio.Future:
+        return self.call(arvore, 'knn', ponto, n)
+
+    def size(self, arvore: str) -> asyncio.Future:
+        return self.call(arvore, 'size')
+
+    async def drain(self) -> None:
+        """Espera o buffer de envio esvaziar (controle de fluxo)."""
+        await self._writer.drain()
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._leitor
+
+
+async def _servir(host: str, port: int, path: Optional[str]) -> None:
+    servidor = TreeServer()
+    server = await servidor.start(host, port, path)
+    endereco = path or '%s:%d' % server.sockets[0].getsockname()[:2]
+    print(f"Servidor de árvores ouvindo em {endereco}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Servidor local de árvores (asyncio)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=7070)
+    parser.add_argument('--socket', metavar='CAMINHO', help="socket Unix (em vez de TCP)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_servir(args.host, args.porta, args.socket))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())